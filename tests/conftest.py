@@ -0,0 +1,20 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SAMPLE_SAVES = ROOT / "saved_games"
+
+
+@pytest.fixture
+def save_dir(tmp_path):
+    """Copy of the sample saves in saved_games/, safe to modify."""
+    target = tmp_path / "saved_games"
+    target.mkdir()
+    for filepath in SAMPLE_SAVES.glob("wizard_game_*"):
+        shutil.copy2(filepath, target / filepath.name)
+    return target
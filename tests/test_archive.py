@@ -0,0 +1,142 @@
+from wizard_storage import (
+    PACK_NAME, FileStorage, SaveArchive, SqliteStorage, is_finished_save, main, pack_saves, read_save, save_paths,
+)
+
+UNFINISHED = "wizard_game_Charlotte_Chris_Kayley_20251231_190228.txt"
+
+
+def test_unfinished_legacy_save_is_not_finished(save_dir):
+    # Round 15 has tricks of 0 but no bids: only 14 rounds were played
+    assert not is_finished_save(read_save(save_dir / UNFINISHED))
+
+
+def test_pack_saves_leaves_unfinished_games_loose(save_dir):
+    loaded = {filepath.name: read_save(filepath) for filepath in save_paths(save_dir)}
+    packed, skipped = pack_saves(save_dir)
+
+    archive = SaveArchive(save_dir / PACK_NAME)
+    assert (packed, skipped) == (len(loaded) - 1, [])
+    assert UNFINISHED not in archive
+    assert [filepath.name for filepath in save_paths(save_dir)] == [UNFINISHED]
+    for name in archive.names():
+        # Packed games are stored in the binary format, which always carries the flag
+        assert archive.load(name) == {"game_finished": False, **loaded[name]}
+
+
+BROKEN = "wizard_game_A_B_C_20250101_000000.txt"
+
+
+def test_unreadable_saves_are_reported_not_printed(save_dir, capsys):
+    (save_dir / BROKEN).write_text("not a save")
+
+    packed, skipped = pack_saves(save_dir)
+    assert packed == 2
+    assert [name for name, _ in skipped] == [BROKEN]
+
+    storage = SqliteStorage(save_dir)
+    imported, skipped = storage.import_saves(save_dir)
+    storage.close()
+    assert imported == 3
+    assert [name for name, _ in skipped] == [BROKEN]
+    assert capsys.readouterr().out == ""
+
+
+def test_pack_command_prints_skipped_saves(save_dir, capsys):
+    (save_dir / BROKEN).write_text("not a save")
+    main(["pack", str(save_dir)])
+    out = capsys.readouterr().out
+    assert f"Skipped {BROKEN}:" in out
+    assert "Packed 2 finished saves" in out
+    assert "1 skipped" in out
+
+
+def _packed_storage(save_dir):
+    pack_saves(save_dir)
+    storage = FileStorage(save_dir)
+    name = next(iter(storage.index.archive.names()))
+    return storage, name
+
+
+def test_packed_edits_leave_the_pack_alone(save_dir):
+    storage, name = _packed_storage(save_dir)
+    archive = storage.index.archive
+    size = archive.path.stat().st_size
+    old_name = archive.load(name)["players"][0]
+
+    storage.update_title(name, "Edited")
+    storage.rename_player(name, old_name, "Zed")
+
+    assert archive.path.stat().st_size == size
+    save_data = storage.load(name)
+    assert save_data["title"] == "Edited"
+    assert save_data["players"][0] == "Zed"
+    assert all("Zed" in round_data for round_data in save_data["game_data"].values() if round_data)
+    entry = storage.get(name)
+    assert entry["title"] == "Edited" and entry["players"].startswith("Zed")
+    # A fresh reader of the same files sees the edits too
+    assert SaveArchive(archive.path).load(name) == save_data
+
+
+def test_packed_delete_leaves_the_pack_alone(save_dir):
+    storage, name = _packed_storage(save_dir)
+    archive = storage.index.archive
+    size = archive.path.stat().st_size
+
+    storage.delete(name)
+
+    assert archive.path.stat().st_size == size
+    assert name not in archive and name not in storage.keys()
+    assert storage.get(name) is None
+    assert all(entry["filename"] != name for entry in storage.recent(10)[0])
+
+
+def test_compact_folds_edits_into_the_pack(save_dir):
+    storage, name = _packed_storage(save_dir)
+    archive = storage.index.archive
+    deleted = [n for n in archive.names() if n != name][0]
+    storage.update_title(name, "Folded")
+    storage.delete(deleted)
+    expected = {n: archive.load(n) for n in archive.names()}
+
+    archive.compact()
+
+    assert not archive.edits_path.exists()
+    assert {n: archive.load(n) for n in archive.names()} == expected
+    assert deleted not in archive
+
+
+def test_edit_log_survives_a_torn_line_and_replaced_records(save_dir):
+    storage, name = _packed_storage(save_dir)
+    archive = storage.index.archive
+    original = archive.load(name)
+    with open(archive.edits_path, "a") as f:
+        f.write('{"name": "torn')
+    archive.edit(name, [{"op": "patch", "fields": {"title": "After torn"}}])
+    assert SaveArchive(archive.path).load(name)["title"] == "After torn"
+
+    # Re-adding the game starts from its new record, without the old edits
+    archive.put(name, original)
+    assert archive.load(name)["title"] == original["title"]
+
+
+def test_packed_edits_keep_the_recent_order(save_dir):
+    storage, name = _packed_storage(save_dir)
+    order = [entry["filename"] for entry in storage.recent(10)[0]]
+    version = storage.index.archive.version(name)
+
+    storage.update_title(name, "Edited")
+
+    assert [entry["filename"] for entry in storage.recent(10)[0]] == order
+    new_version = storage.index.archive.version(name)
+    assert new_version[0] - version[0] == 1000 and new_version[1] > version[1]
+
+
+def test_compact_keeps_versions(save_dir):
+    storage, name = _packed_storage(save_dir)
+    archive = storage.index.archive
+    storage.update_title(name, "Folded")
+    mtime_ns = archive.version(name)[0]
+
+    archive.compact()
+
+    assert archive.version(name)[0] == mtime_ns
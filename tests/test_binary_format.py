@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from wizard_storage import (
+    BINARY_SUFFIX, decode_binary_save, edit_save_metadata, encode_binary_save, read_save, save_paths, store_save,
+)
+
+from conftest import SAMPLE_SAVES
+
+SAMPLES = sorted(save_paths(SAMPLE_SAVES))
+
+
+def _round_trip(save_data):
+    return decode_binary_save(encode_binary_save(save_data))
+
+
+def _sample(filepath):
+    # The binary format always stores the finished flag; older text saves leave it out
+    return {"game_finished": False, **read_save(filepath)}
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda p: p.name)
+def test_sample_saves_round_trip(sample):
+    save_data = _sample(sample)
+    assert _round_trip(save_data) == save_data
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda p: p.name)
+def test_missing_bids_and_tricks_round_trip(sample):
+    save_data = _sample(sample)
+    rounds = sorted(save_data["game_data"], key=int)
+    first, last = save_data["players"][0], save_data["players"][-1]
+    # Bids in but no tricks yet, and a round with nothing entered
+    save_data["game_data"][rounds[-2]][first]["tricks"] = None
+    save_data["game_data"][rounds[-2]][last]["bid"] = None
+    for data in save_data["game_data"][rounds[-1]].values():
+        data.update(bid=None, tricks=None)
+    assert _round_trip(save_data) == save_data
+
+
+def test_renamed_players_and_titles_round_trip():
+    save_data = _sample(SAMPLES[0])
+    old = save_data["players"][0]
+    new = "Zoë 🧙"
+    save_data["players"][0] = new
+    save_data["player_colors"][new] = save_data["player_colors"].pop(old)
+    save_data["total_scores"][new] = save_data["total_scores"].pop(old)
+    for round_data in save_data["game_data"].values():
+        round_data[new] = round_data.pop(old)
+
+    for title in ["", "Ünïcode — title ✨", "x" * 1000]:
+        save_data["title"] = title
+        assert _round_trip(save_data) == save_data
+
+
+def test_negative_scores_and_flags_round_trip():
+    save_data = _sample(SAMPLES[0])
+    save_data["total_scores"] = {p: -10 * i for i, p in enumerate(save_data["players"])}
+    save_data.update(game_started=True, game_finished=True, starting_dealer_index=len(save_data["players"]) - 1)
+    assert _round_trip(save_data) == save_data
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda p: p.name)
+def test_binary_file_edits_match_the_text_save(tmp_path, sample):
+    save_data = _sample(sample)
+    filepath = tmp_path / sample.with_suffix(BINARY_SUFFIX).name
+    store_save(filepath, save_data)
+    assert read_save(filepath) == save_data
+
+    old = save_data["players"][1]
+    edit_save_metadata(filepath, title="Renamed", renames={old: "Quinn"})
+
+    expected = json.loads(json.dumps(save_data))
+    expected["title"] = "Renamed"
+    expected["players"][1] = "Quinn"
+    expected["player_colors"]["Quinn"] = expected["player_colors"].pop(old)
+    expected["total_scores"]["Quinn"] = expected["total_scores"].pop(old)
+    for round_data in expected["game_data"].values():
+        round_data["Quinn"] = round_data.pop(old)
+    assert read_save(filepath) == expected
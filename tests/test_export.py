@@ -0,0 +1,33 @@
+import csv
+
+from wizard_export import CSV_NAME, export_history, main
+from wizard_storage import save_paths
+
+BROKEN = "wizard_game_A_B_C_20250101_000000.txt"
+
+
+def test_unreadable_saves_are_reported_not_dropped(save_dir, tmp_path, capsys):
+    (save_dir / BROKEN).write_text("not a save")
+    output = tmp_path / "exports"
+
+    count, path, skipped = export_history(save_dir, output, file_format="csv")
+
+    assert count == len(save_paths(save_dir)) - 1
+    assert path == output / CSV_NAME
+    assert [name for name, _ in skipped] == [BROKEN]
+    with open(path, newline='') as f:
+        assert BROKEN not in {row["game"] for row in csv.DictReader(f)}
+    assert capsys.readouterr().out == ""
+
+    # Still unreadable, so reported again while nothing else is new
+    count, path, skipped = export_history(save_dir, output, file_format="csv")
+    assert (count, path) == (0, None)
+    assert [name for name, _ in skipped] == [BROKEN]
+
+
+def test_export_command_prints_skipped_saves(save_dir, tmp_path, capsys):
+    (save_dir / BROKEN).write_text("not a save")
+    main([str(save_dir), "--output", str(tmp_path / "exports"), "--format", "csv"])
+    out = capsys.readouterr().out
+    assert f"Skipped {BROKEN}:" in out
+    assert "1 skipped" in out
@@ -0,0 +1,204 @@
+import json
+
+import pytest
+
+import wizard_storage
+from wizard_storage import (
+    BINARY_SUFFIX, JOURNAL_HEADER, append_save, edit_save_metadata, parse_save_text, read_save, read_save_header,
+    replay_journal, save_paths, store_save,
+)
+
+from conftest import SAMPLE_SAVES
+
+SAMPLES = sorted(save_paths(SAMPLE_SAVES))
+
+
+def _legacy(filepath):
+    """Payload of a sample save as the JSON loader reads it."""
+    return parse_save_text(filepath.read_text())
+
+
+def _replayed(filepath):
+    """Payload replayed from a journal's text, bypassing the in-process cache."""
+    content = filepath.read_text()
+    assert content.startswith(JOURNAL_HEADER)
+    save_data, _, clean = replay_journal(content)
+    assert clean
+    return save_data
+
+
+def _states(save_data):
+    """The payloads a game passes through: one more round each, then an undo of the last round."""
+    rounds = sorted(save_data["game_data"], key=int)
+    states = []
+    for n in range(1, len(rounds) + 1):
+        state = json.loads(json.dumps(save_data))
+        state["game_data"] = {r: state["game_data"][r] for r in rounds[:n]}
+        state["current_round"] = n
+        state["saved_at"] = f"2025-01-01T00:00:{n:02d}"
+        states.append(state)
+    return states + [states[-2]]
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda p: p.name)
+def test_appended_journal_replays_every_state(tmp_path, sample):
+    filepath = tmp_path / sample.name
+    for state in _states(_legacy(sample)):
+        append_save(filepath, state)
+        assert _replayed(filepath) == state
+        assert read_save(filepath) == state
+    # Only the first write is a snapshot; every later save is an appended delta
+    assert filepath.read_text().count('"op":"snapshot"') == 1
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda p: p.name)
+def test_legacy_save_becomes_a_journal_on_save(tmp_path, sample):
+    filepath = tmp_path / sample.name
+    filepath.write_text(sample.read_text())
+    save_data = read_save(filepath)
+    assert save_data == _legacy(sample)
+
+    save_data["title"] = "Resumed"
+    append_save(filepath, save_data)
+    assert _replayed(filepath) == save_data
+
+
+def test_rename_and_retitle_append_to_the_journal(tmp_path):
+    sample = SAMPLES[0]
+    filepath = tmp_path / sample.name
+    save_data = _legacy(sample)
+    append_save(filepath, save_data)
+    size = filepath.stat().st_size
+    old = save_data["players"][0]
+
+    edit_save_metadata(filepath, title="Renamed", renames={old: "Zed"})
+
+    expected = _legacy(sample)
+    expected["title"] = "Renamed"
+    expected["players"][0] = "Zed"
+    expected["player_colors"]["Zed"] = expected["player_colors"].pop(old)
+    expected["total_scores"]["Zed"] = expected["total_scores"].pop(old)
+    for round_data in expected["game_data"].values():
+        round_data["Zed"] = round_data.pop(old)
+    assert _replayed(filepath) == expected
+    assert read_save(filepath) == expected
+    # The rounds were not rewritten, only two records appended
+    assert len(filepath.read_text().encode()) - size < 200
+
+    # A later save continues from the renamed state
+    expected["current_round"] = 1
+    append_save(filepath, expected)
+    assert _replayed(filepath) == expected
+
+
+def test_torn_tail_is_dropped_and_repaired_on_the_next_save(tmp_path):
+    sample = SAMPLES[0]
+    filepath = tmp_path / sample.name
+    states = _states(_legacy(sample))
+    append_save(filepath, states[0])
+    append_save(filepath, states[1])
+    # A crash mid-append leaves half a record behind
+    with open(filepath, 'a') as f:
+        f.write('{"op":"patch","rounds":{"3":')
+
+    _, count, clean = replay_journal(filepath.read_text())
+    assert (count, clean) == (2, False)
+    assert read_save(filepath) == states[1]
+
+    append_save(filepath, states[2])
+    assert _replayed(filepath) == states[2]
+    assert read_save(filepath) == states[2]
+
+
+def test_torn_tail_is_repaired_by_a_metadata_edit(tmp_path):
+    sample = SAMPLES[0]
+    filepath = tmp_path / sample.name
+    save_data = _legacy(sample)
+    append_save(filepath, save_data)
+    with open(filepath, 'a') as f:
+        f.write('{"op":"pat')
+
+    edit_save_metadata(filepath, title="After the crash")
+
+    save_data["title"] = "After the crash"
+    assert _replayed(filepath) == save_data
+
+
+def _listing(filepath):
+    """What the sidebar should list for a save, from its full payload."""
+    return wizard_storage._listing_from_data(filepath.name, read_save(filepath))
+
+
+def _no_full_reads(monkeypatch):
+    def fail(*args):
+        raise AssertionError("listing read the whole save")
+    monkeypatch.setattr(wizard_storage, "replay_journal", fail)
+    monkeypatch.setattr(wizard_storage, "decode_binary_save", fail)
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda p: p.name)
+def test_listing_reads_only_the_header(tmp_path, monkeypatch, sample):
+    journal = tmp_path / sample.name
+    binary = journal.with_suffix(BINARY_SUFFIX)
+    states = _states(_legacy(sample))
+    for filepath in (journal, binary):
+        for state in states:
+            store_save(filepath, state)
+    edit_save_metadata(journal, title="Renamed", renames={states[0]["players"][0]: "Zed"})
+    expected = {filepath: _listing(filepath) for filepath in (journal, binary)}
+    assert expected[journal]["title"] == "Renamed" and expected[journal]["players"].startswith("Zed")
+
+    _no_full_reads(monkeypatch)
+    for filepath, listing in expected.items():
+        assert read_save_header(filepath) == listing
+
+
+def test_stale_listing_line_falls_back_to_replay(tmp_path):
+    sample = SAMPLES[0]
+    filepath = tmp_path / sample.name
+    states = _states(_legacy(sample))
+    append_save(filepath, states[0])
+    # An append whose listing rewrite was lost in a crash
+    with open(filepath, 'a') as f:
+        f.write(json.dumps({"op": "patch", "fields": {"title": "Appended"}}) + "\n")
+    assert read_save_header(filepath)["title"] == "Appended"
+    # So is a listing line torn mid-rewrite
+    content = filepath.read_bytes()
+    start = content.index(b"\n") + 1
+    filepath.write_bytes(content[:start + 20] + b"#" * 10 + content[start + 30:])
+    assert read_save_header(filepath)["title"] == "Appended"
+    assert read_save(filepath)["title"] == "Appended"
+
+
+def test_long_title_outgrows_the_listing_line(tmp_path, monkeypatch):
+    sample = SAMPLES[0]
+    filepath = tmp_path / sample.name
+    save_data = _legacy(sample)
+    append_save(filepath, save_data)
+
+    edit_save_metadata(filepath, title="x" * 1000)
+    save_data["title"] = "x" * 1000
+    assert _replayed(filepath) == save_data
+    save_data["current_round"] = 1
+    append_save(filepath, save_data)
+    assert _replayed(filepath) == save_data
+
+    expected = _listing(filepath)
+    _no_full_reads(monkeypatch)
+    assert read_save_header(filepath) == expected
+
+
+def test_journal_without_a_listing_line_gets_one(tmp_path, monkeypatch):
+    sample = SAMPLES[0]
+    filepath = tmp_path / sample.name
+    save_data = _legacy(sample)
+    # A journal written before listing lines
+    filepath.write_text(JOURNAL_HEADER + "\n" + json.dumps({"op": "snapshot", "data": save_data}) + "\n")
+    assert read_save_header(filepath) == _listing(filepath)
+
+    save_data["title"] = "Saved again"
+    append_save(filepath, save_data)
+    assert _replayed(filepath) == save_data
+    expected = _listing(filepath)
+    _no_full_reads(monkeypatch)
+    assert read_save_header(filepath) == expected
@@ -0,0 +1,54 @@
+import logging
+import os
+from datetime import datetime
+
+from wizard_storage import FileStorage, SaveIndex, SaveWriter, convert_to_binary, read_save, save_paths
+
+
+def test_failing_after_save_callback_is_logged_not_a_failed_save(tmp_path, caplog):
+    writer = SaveWriter(delay=0)
+    filepath = tmp_path / "wizard_game_A_B_20250101_000000.txt"
+    save_data = {"title": "T", "players": ["A", "B"], "game_data": {}, "current_round": 1, "max_rounds": 30}
+
+    def fail():
+        raise RuntimeError("index is gone")
+
+    with caplog.at_level(logging.ERROR, logger="wizard_storage"):
+        writer.submit(filepath, save_data, on_saved=fail)
+        writer.flush()
+
+    assert read_save(filepath)["title"] == "T"
+    assert writer.status(filepath)["error"] is None
+    assert "index is gone" in caplog.text
+
+
+def _date_saves(save_dir):
+    """Give each save the mtime of its saved_at (a checkout doesn't) and return their names, newest first."""
+    by_date = sorted(save_paths(save_dir), key=lambda p: read_save(p)["saved_at"], reverse=True)
+    for filepath in by_date:
+        mtime = datetime.fromisoformat(read_save(filepath)["saved_at"]).timestamp()
+        os.utime(filepath, (mtime, mtime))
+    return [filepath.name for filepath in by_date]
+
+
+def test_edits_keep_the_recent_order(save_dir):
+    order = _date_saves(save_dir)
+    # One binary save, whose same-length retitle doesn't change its size
+    mtime_ns = (save_dir / order[1]).stat().st_mtime_ns
+    binary = convert_to_binary(save_dir / order[1]).name
+    os.utime(save_dir / binary, ns=(mtime_ns, mtime_ns))
+    order[1] = binary
+    storage = FileStorage(save_dir)
+    assert [entry["filename"] for entry in storage.recent(10)[0]] == order
+
+    oldest = order[-1]
+    storage.update_title(oldest, "Retitled")
+    storage.rename_player(oldest, read_save(save_dir / oldest)["players"][0], "Zed")
+    storage.update_title(binary, "X" * len(read_save(save_dir / binary)["title"]))
+
+    assert [entry["filename"] for entry in storage.recent(10)[0]] == order
+    # A fresh index (another process) still notices the edits
+    fresh = {entry["filename"]: entry for entry in SaveIndex(save_dir, path=save_dir / "fresh.sqlite3").recent(10)[0]}
+    assert list(fresh) == order
+    assert fresh[oldest]["title"] == "Retitled" and fresh[oldest]["players"].startswith("Zed")
+    assert fresh[binary]["title"].startswith("XXX")
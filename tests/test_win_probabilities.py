@@ -0,0 +1,40 @@
+import pytest
+
+from wizard_analytics import BidIndex, win_probabilities
+from wizard_engine import GameEngine
+from wizard_storage import read_save, save_paths
+
+
+def test_probabilities_sum_to_one():
+    history = (((1, 1), (0, 0), (1, 0)),) * 3
+    assert sum(win_probabilities(history, (60, 60, -30), 4, 20)) == pytest.approx(1.0)
+
+
+def test_one_round_of_luck_barely_moves_the_estimate():
+    # Same hit, one bid higher: 10 points ahead with 19 rounds to go
+    bolder = win_probabilities((((1, 1), (0, 0), (0, 0)),), (30, 20, 20), 2, 20)
+    assert 0.3 < bolder[0] < 0.5
+    # Missed round 1 by one trick: far from out of it
+    missed = win_probabilities((((1, 0), (0, 0), (0, 0)),), (-10, 20, 20), 2, 20)
+    assert 0.2 < missed[0] < 0.34
+
+
+def test_big_lead_near_the_end_is_likely_to_hold():
+    history = (((1, 1), (1, 0), (0, 1)),) * 18
+    assert win_probabilities(history, (300, 200, 150), 19, 20)[0] > 0.6
+
+
+def test_pooled_priors_from_indexed_games(tmp_path, save_dir):
+    bid_index = BidIndex(tmp_path / "bids.sqlite3")
+    for copy in range(3):
+        for filepath in save_paths(save_dir):
+            engine = GameEngine.from_save_data(read_save(filepath))
+            bid_index.index_game(f"{copy}_{filepath.name}", engine.players, engine.round_history(engine.played_rounds()))
+
+    priors = bid_index.pooled_priors(15)
+    assert priors
+    for cards, hit_rate, bid_ratio, misses in priors:
+        assert 0 <= hit_rate <= 1 and 0 <= bid_ratio <= 1
+        assert len(misses) == cards + 1 and misses[0] == 0
+    history = (((1, 1), (0, 0), (1, 0), (0, 1)),) * 3
+    assert sum(win_probabilities(history, (60, 60, -30, -30), 4, 15, priors)) == pytest.approx(1.0)
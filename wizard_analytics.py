@@ -0,0 +1,409 @@
+"""Analytics over Wizard games: archive-wide career statistics, live win
+probabilities and the bid-outcome index behind the bid assistant.
+
+Run as a script to print per-player career statistics for every save in
+saved_games/ (or another directory):
+
+    python wizard_analytics.py [SAVE_DIR] [--workers N] [--json]
+"""
+
+import argparse
+import json
+import math
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from wizard_engine import GameEngine, analyze_games, calculate_score
+from wizard_storage import PACK_NAME, SAVE_DIR, SaveArchive, read_save, save_paths
+
+# Saves handed to each worker task; large enough to amortize the process round trip
+CHUNK_SIZE = 500
+
+# Simulated finishes per win-probability estimate
+SIMULATIONS = 100_000
+# Rounds of typical play each player's own record is weighed against in the win model
+PRIOR_ROUNDS = 20
+# Counted rounds before win probabilities say more than noise and are shown
+MIN_WIN_ROUNDS = 3
+# Pooled outcomes of a card count needed before they replace the default priors
+MIN_PRIOR_SAMPLES = 20
+# Resolution of the inverse-CDF lookup table used to draw simulated finishes
+SAMPLE_TABLE_SIZE = 1 << 16
+
+# Persisted (player, cards, bid) -> tricks won index for the bid assistant
+BID_INDEX_FILE = SAVE_DIR / ".bid_index.sqlite3"
+# Below this many samples a player's own history falls back to everyone's
+MIN_BID_SAMPLES = 3
+
+
+def _empty_career():
+    """Fresh per-player career counters."""
+    return {
+        'games': 0, 'completed_games': 0, 'wins': 0, 'rounds': 0, 'correct_bids': 0,
+        'points': 0, 'rank_sum': 0, 'best_game_score': None,
+        'best_hot_streak': 0, 'worst_cold_streak': 0,
+    }
+
+
+def _add_game(careers, players, analysis, completed):
+    """Fold one analysed game into per-player career counters."""
+    top_score = max(analysis[p]['final_score'] for p in players)
+    for p in players:
+        a = analysis[p]
+        career = careers.setdefault(p, _empty_career())
+        career['games'] += 1
+        career['rounds'] += a['total_rounds']
+        career['correct_bids'] += a['correct_bids']
+        career['points'] += a['final_score']
+        career['best_hot_streak'] = max(career['best_hot_streak'], a['max_hot_streak'])
+        career['worst_cold_streak'] = max(career['worst_cold_streak'], a['max_cold_streak'])
+        # Wins, ranks and best scores only make sense for games played to the end
+        if completed:
+            career['completed_games'] += 1
+            career['rank_sum'] += a['end_rank']
+            career['wins'] += a['final_score'] == top_score
+            if career['best_game_score'] is None or a['final_score'] > career['best_game_score']:
+                career['best_game_score'] = a['final_score']
+
+
+def merge_careers(careers, other):
+    """Merge the career counters in other into careers (in place) and return careers."""
+    for player, theirs in other.items():
+        ours = careers.setdefault(player, _empty_career())
+        for key in ('games', 'completed_games', 'wins', 'rounds', 'correct_bids', 'points', 'rank_sum'):
+            ours[key] += theirs[key]
+        for key in ('best_hot_streak', 'worst_cold_streak'):
+            ours[key] = max(ours[key], theirs[key])
+        if theirs['best_game_score'] is not None:
+            if ours['best_game_score'] is None or theirs['best_game_score'] > ours['best_game_score']:
+                ours['best_game_score'] = theirs['best_game_score']
+    return careers
+
+
+def load_played_game(save_data):
+    """Return (players, scores, completed) for the played rounds of a save, or None if nothing was played."""
+    engine = GameEngine.from_save_data(save_data)
+    played = engine.played_rounds()
+    if not played or not engine.players:
+        return None
+    return engine.players, engine.score_matrix()[:played], played == engine.max_rounds
+
+
+def _career_chunk(paths, archive_path=None):
+    """Worker: analyse a chunk of saves (files, or names packed in archive_path) and return partial career counters."""
+    load = SaveArchive(archive_path).load if archive_path else read_save
+    games, completed = [], []
+    for path in paths:
+        try:
+            game = load_played_game(load(path))
+        except Exception:
+            continue  # Unreadable or hand-edited save
+        if game is not None:
+            games.append(game[:2])
+            completed.append(game[2])
+
+    careers = {}
+    for (players, _), stats, done in zip(games, analyze_games(games, per_round=False), completed):
+        _add_game(careers, players, stats['analysis'], done)
+    return careers
+
+
+def _finalize(career):
+    """Add derived rates (accuracy, win rate, average rank) to raw career counters."""
+    career = dict(career)
+    rounds, completed = career['rounds'], career['completed_games']
+    career['accuracy'] = round(career['correct_bids'] / rounds * 100, 1) if rounds else 0
+    career['win_rate'] = round(career['wins'] / completed * 100, 1) if completed else 0
+    career['avg_rank'] = round(career['rank_sum'] / completed, 2) if completed else None
+    del career['rank_sum']
+    return career
+
+
+def career_stats(save_dir=SAVE_DIR, workers=None, chunk_size=CHUNK_SIZE):
+    """Compute per-player career totals over every save in save_dir, loose or packed.
+
+    Saves are split into chunks and analysed across a process pool (workers=None
+    uses every CPU core, workers=1 runs in-process); the partial results are then
+    merged into one dict of player -> career stats.
+    """
+    paths = sorted(save_paths(save_dir))
+    archive = SaveArchive(Path(save_dir) / PACK_NAME)
+    packed = sorted(set(archive.names()) - {p.name for p in paths})
+    chunks = [(paths[i:i + chunk_size], None) for i in range(0, len(paths), chunk_size)]
+    chunks += [(packed[i:i + chunk_size], str(archive.path)) for i in range(0, len(packed), chunk_size)]
+
+    careers = {}
+    if workers == 1 or len(chunks) <= 1:
+        for names, archive_path in chunks:
+            merge_careers(careers, _career_chunk(names, archive_path))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(_career_chunk, *zip(*chunks)):
+                merge_careers(careers, partial)
+
+    return {player: _finalize(career) for player, career in sorted(careers.items())}
+
+
+# ----- Live win probability -----
+
+def default_priors(max_cards, num_players):
+    """Per card count (index = cards) behaviour assumed without any history: (hit rate, bid/cards ratio, miss-size weights).
+
+    Exact bids get harder with more cards in hand; misses are mostly by one trick.
+    """
+    return [None] + [
+        (max(0.25, 0.8 - 0.035 * cards), 1 / num_players, np.array([0.0, 1.0, 0.35, 0.12] + [0.04] * max(0, cards - 3))[:cards + 1])
+        for cards in range(1, max_cards + 1)
+    ]
+
+
+def _player_model(history, j, priors):
+    """Player j's hit-rate and bid-ratio factors relative to the priors, and their miss-size counts.
+
+    Each factor compares the player's record with what the priors expect for
+    the same rounds, shrunk towards 1 by PRIOR_ROUNDS rounds of prior
+    behaviour, so a round or two of luck barely moves the estimate.
+    """
+    hits = expected_hits = bid_share = expected_share = 0.0
+    misses = np.zeros(len(priors))  # index = tricks off
+    for cards, round_data in enumerate(history, start=1):
+        bid, tricks = round_data[j]
+        if bid is None or tricks is None:
+            continue
+        hit_rate, bid_ratio, _ = priors[cards]
+        hits += bid == tricks
+        expected_hits += hit_rate
+        bid_share += bid / cards
+        expected_share += bid_ratio
+        misses[abs(bid - tricks)] += 1
+    mean_hit = np.mean([p[0] for p in priors[1:]])
+    mean_ratio = np.mean([p[1] for p in priors[1:]])
+    skill = (hits + PRIOR_ROUNDS * mean_hit) / (expected_hits + PRIOR_ROUNDS * mean_hit)
+    boldness = (bid_share + PRIOR_ROUNDS * mean_ratio) / (expected_share + PRIOR_ROUNDS * mean_ratio)
+    return skill, boldness, misses
+
+
+def _round_pmf(cards, prior, skill, boldness, misses):
+    """Score distribution of one round with the given cards, on a 10-point grid starting at -10 * cards."""
+    hit_rate, bid_ratio, prior_misses = prior
+    hit_rate = min(0.95, max(0.05, hit_rate * skill))
+    bid_ratio = min(0.95, max(0.01, bid_ratio * boldness))
+    pmf = np.zeros(2 * cards + 3)
+    # Hit: bid ~ Binomial(cards, bid_ratio), scoring 20 + 10 * bid
+    bids = np.array([math.comb(cards, b) * bid_ratio ** b * (1 - bid_ratio) ** (cards - b) for b in range(cards + 1)])
+    pmf[cards + 2:] = hit_rate * bids
+    # Miss by k tricks (k <= cards): -10 * k, the player's own misses on top of PRIOR_ROUNDS of prior ones
+    miss = PRIOR_ROUNDS * prior_misses[1:cards + 1] / prior_misses[1:cards + 1].sum() + misses[1:cards + 1]
+    pmf[cards - np.arange(1, len(miss) + 1)] = (1 - hit_rate) * miss / miss.sum()
+    return pmf
+
+
+def win_probabilities(history, totals, next_round, max_rounds, priors=(), simulations=SIMULATIONS, seed=0):
+    """Estimate each player's chance of winning from the current standings.
+
+    history is the (bid, tricks) per player for each counted round (see
+    GameEngine.round_history) and totals the current scores in player order.
+    Each round's hit rate, bid size and miss sizes come from priors per card
+    count: default_priors, overridden by the pooled history of earlier games
+    given as BidIndex.pooled_priors(). Each player's own record only adjusts
+    those (see _player_model). The per-round distributions are convolved
+    into a final-score distribution, from which `simulations` finishes are
+    drawn at once. Ties for first share the win. Returns probabilities in
+    player order.
+    """
+    num_players = len(totals)
+    round_priors = default_priors(max_rounds, num_players)
+    for cards, hit_rate, bid_ratio, misses in priors:
+        if cards <= max_rounds:
+            round_priors[cards] = (hit_rate, bid_ratio, np.array(misses, dtype=float))
+    rng = np.random.default_rng(seed)
+    # Players x simulations keeps every per-player row contiguous for the reductions below
+    finals = np.empty((num_players, simulations), dtype=np.int32)
+
+    for j in range(num_players):
+        skill, boldness, misses = _player_model(history, j, round_priors)
+        pmf = np.ones(1)
+        lowest = 0
+        for cards in range(next_round, max_rounds + 1):
+            pmf = np.convolve(pmf, _round_pmf(cards, round_priors[cards], skill, boldness, misses))
+            lowest += cards
+        # Inverse-CDF sampling through a quantile lookup table (much cheaper than a
+        # binary search per simulation)
+        cdf = np.cumsum(pmf)
+        quantiles = np.searchsorted(cdf, (np.arange(SAMPLE_TABLE_SIZE) + 0.5) / SAMPLE_TABLE_SIZE * cdf[-1])
+        draws = quantiles[rng.integers(0, SAMPLE_TABLE_SIZE, simulations)]
+        finals[j] = totals[j] + 10 * (np.minimum(draws, len(pmf) - 1) - lowest)
+
+    is_top = finals == finals.max(axis=0)
+    shares = 1.0 / is_top.sum(axis=0, dtype=np.int32)
+    return (is_top @ shares / simulations).tolist()
+
+
+# ----- Bid outcome index -----
+
+class BidIndex:
+    """Persisted index of (player, cards in round, bid) -> how many tricks were actually won.
+
+    Outcome counts live in memory for O(1) lookups and in SQLite next to the
+    saves. The rounds each save contributed are stored too, so re-indexing a
+    save after another round (or a correction) only applies the rows that changed.
+    """
+
+    def __init__(self, path=BID_INDEX_FILE):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS outcomes (
+                player TEXT, cards INTEGER, bid INTEGER, tricks INTEGER, count INTEGER,
+                PRIMARY KEY (player, cards, bid, tricks));
+            CREATE TABLE IF NOT EXISTS indexed_rounds (
+                filename TEXT, round INTEGER, player TEXT, bid INTEGER, tricks INTEGER,
+                PRIMARY KEY (filename, round, player));
+        """)
+        # (player, cards, bid) -> {tricks: count}; player None pools everyone
+        self._counts = {}
+        for player, cards, bid, tricks, count in self._db.execute("SELECT * FROM outcomes"):
+            self._bump(player, cards, bid, tricks, count)
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(DISTINCT filename) FROM indexed_rounds").fetchone()[0]
+
+    def _bump(self, player, cards, bid, tricks, delta):
+        """Adjust the in-memory counts of one outcome for the player and the pooled entry."""
+        for key in ((player, cards, bid), (None, cards, bid)):
+            dist = self._counts.setdefault(key, {})
+            dist[tricks] = dist.get(tricks, 0) + delta
+            if not dist[tricks]:
+                del dist[tricks]
+
+    def _apply(self, player, cards, bid, tricks, delta):
+        """Adjust one outcome count in memory and in the database."""
+        self._bump(player, cards, bid, tricks, delta)
+        self._db.execute(
+            "INSERT INTO outcomes VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (player, cards, bid, tricks) DO UPDATE SET count = count + excluded.count",
+            (player, cards, bid, tricks, delta),
+        )
+
+    def index_game(self, filename, players, history):
+        """Bring the index in line with a save's played rounds (history as from GameEngine.round_history)."""
+        rows = {
+            (r, player): (bid, tricks)
+            for r, round_data in enumerate(history, start=1)
+            for player, (bid, tricks) in zip(players, round_data)
+            if bid is not None and tricks is not None
+        }
+        with self._lock, self._db:
+            old = {
+                (r, player): (bid, tricks)
+                for r, player, bid, tricks in self._db.execute(
+                    "SELECT round, player, bid, tricks FROM indexed_rounds WHERE filename = ?", (filename,))
+            }
+            for key in old.keys() | rows.keys():
+                if old.get(key) == rows.get(key):
+                    continue
+                r, player = key
+                if key in old:
+                    self._apply(player, r, *old[key], -1)
+                if key in rows:
+                    self._apply(player, r, *rows[key], 1)
+                    self._db.execute("INSERT OR REPLACE INTO indexed_rounds VALUES (?, ?, ?, ?, ?)",
+                                     (filename, r, player, *rows[key]))
+                else:
+                    self._db.execute("DELETE FROM indexed_rounds WHERE filename = ? AND round = ? AND player = ?",
+                                     (filename, r, player))
+
+    def remove_game(self, filename):
+        """Drop everything a save contributed (e.g. when it is deleted)."""
+        self.index_game(filename, [], [])
+
+    def rename_player(self, filename, old_name, new_name):
+        """Move a save's indexed rounds from one player name to another."""
+        with self._lock, self._db:
+            rows = self._db.execute(
+                "SELECT round, bid, tricks FROM indexed_rounds WHERE filename = ? AND player = ?", (filename, old_name)
+            ).fetchall()
+            for r, bid, tricks in rows:
+                self._apply(old_name, r, bid, tricks, -1)
+                self._apply(new_name, r, bid, tricks, 1)
+            self._db.execute("UPDATE indexed_rounds SET player = ? WHERE filename = ? AND player = ?",
+                             (new_name, filename, old_name))
+
+    def rebuild(self, storage):
+        """Index every game in storage (a wizard_storage backend) not indexed yet and forget games that are gone."""
+        known = {row[0] for row in self._db.execute("SELECT DISTINCT filename FROM indexed_rounds")}
+        keys = storage.keys()
+        for filename in known - set(keys):
+            self.remove_game(filename)
+        for key in keys:
+            if key in known:
+                continue
+            try:
+                engine = GameEngine.from_save_data(storage.load(key))
+            except Exception:
+                continue
+            self.index_game(key, engine.players, engine.round_history(engine.played_rounds()))
+
+    def tricks_distribution(self, player, cards, bid):
+        """{tricks: count} for a bid, from the player's own history or everyone's when that is too thin."""
+        dist = self._counts.get((player, cards, bid), {})
+        if sum(dist.values()) < MIN_BID_SAMPLES:
+            dist = self._counts.get((None, cards, bid), {})
+        return dist
+
+    def pooled_priors(self, max_cards):
+        """((cards, hit rate, bid/cards ratio, miss-size counts), ...) from everyone's rounds, for win_probabilities.
+
+        Card counts with fewer than MIN_PRIOR_SAMPLES rounds are left out.
+        """
+        priors = []
+        for cards in range(1, max_cards + 1):
+            rounds = hits = bid_share = 0
+            misses = [0] * (cards + 1)
+            for bid in range(cards + 1):
+                for tricks, count in self._counts.get((None, cards, bid), {}).items():
+                    rounds += count
+                    bid_share += bid * count
+                    if tricks == bid:
+                        hits += count
+                    elif abs(tricks - bid) <= cards:
+                        misses[abs(tricks - bid)] += count
+            if rounds >= MIN_PRIOR_SAMPLES and sum(misses):
+                priors.append((cards, hits / rounds, bid_share / rounds / cards, tuple(misses)))
+        return tuple(priors)
+
+    def expected_scores(self, player, cards, bids):
+        """Expected calculate_score value for each bid (None where there is no history)."""
+        expected = {}
+        for bid in bids:
+            dist = self.tricks_distribution(player, cards, bid)
+            total = sum(dist.values())
+            expected[bid] = sum(calculate_score(bid, t) * n for t, n in dist.items()) / total if total else None
+        return expected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Career statistics over all saved Wizard games.")
+    parser.add_argument("save_dir", nargs="?", default=str(SAVE_DIR), help="Directory with wizard_game_* saves")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores, 1 = no pool)")
+    parser.add_argument("--json", action="store_true", help="Print the raw stats as JSON")
+    args = parser.parse_args(argv)
+
+    careers = career_stats(args.save_dir, workers=args.workers)
+    if args.json:
+        print(json.dumps(careers, indent=2))
+        return
+
+    print(f"{'Player':<16}{'Games':>7}{'Wins':>6}{'Win %':>7}{'Acc %':>7}{'Avg rank':>10}{'Hot':>5}{'Cold':>6}")
+    for player, c in sorted(careers.items(), key=lambda x: x[1]['accuracy'], reverse=True):
+        avg_rank = f"{c['avg_rank']:.2f}" if c['avg_rank'] is not None else "-"
+        print(f"{player[:15]:<16}{c['games']:>7}{c['wins']:>6}{c['win_rate']:>7}{c['accuracy']:>7}"
+              f"{avg_rank:>10}{c['best_hot_streak']:>5}{c['worst_cold_streak']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Benchmarks for the scoring, stats and persistence hot paths.
+
+Times the headless code behind the app on synthetic games (3-6 players, so
+max_rounds 20 down to 10) and on save directories of 10, 1k and 100k files,
+writes the results as JSON and compares them against a stored baseline:
+
+    python wizard_bench.py [--sizes 10,1000,100000] [--output bench_results.json]
+                           [--baseline bench_baseline.json] [--save-baseline]
+
+Save directories are generated once under --data-dir and reused by later runs.
+With --startup it instead measures the app's cold start: a fresh interpreter
+imports Streamlit and renders the page once in bare mode, and the report lists
+the slowest imports and which heavy optional libraries got loaded.
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from wizard_engine import GameEngine, calculate_score
+from wizard_prompts import build_roast_prompt, build_summary_prompt
+from wizard_storage import SaveArchive, SaveIndex, append_save, read_save, save_paths, write_binary_save, write_save
+
+BASELINE_FILE = Path(__file__).parent / "bench_baseline.json"
+RESULTS_FILE = Path(__file__).parent / "bench_results.json"
+DATA_DIR = Path(tempfile.gettempdir()) / "wizard_bench"
+
+PLAYER_COUNTS = (3, 4, 5, 6)
+DIR_SIZES = (10, 1_000, 100_000)
+# Saves the sidebar lists per page
+SIDEBAR_PAGE_SIZE = 5
+NAMES = ["Chris", "Amin", "Kayley", "Charlotte", "Dana", "Eli"]
+
+# Slowdown factor (current / baseline) reported as a regression
+DEFAULT_THRESHOLD = 1.25
+# Target wall time per timing sample; small calls are looped to reach it
+SAMPLE_SECONDS = 0.2
+
+# Libraries the first page load should not need
+HEAVY_MODULES = ("pandas", "altair", "requests", "google.genai")
+STARTUP_RUNS = 3
+STARTUP_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import streamlit
+t1 = time.perf_counter()
+import wizard_counter
+t2 = time.perf_counter()
+print(json.dumps({{"import_streamlit": t1 - t0, "first_render": t2 - t1,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def synthetic_game(num_players, rng, rounds=None):
+    """Play a random game with tricks that always add up to the round number."""
+    engine = GameEngine(NAMES[:num_players], starting_dealer_index=rng.randrange(num_players))
+    engine.start()
+    rounds = engine.max_rounds if rounds is None else rounds
+    for r in range(1, rounds + 1):
+        engine.init_round_data(r)
+        tricks = [0] * num_players
+        for _ in range(r):
+            tricks[rng.randrange(num_players)] += 1
+        for player, won in zip(engine.players, tricks):
+            engine.set_bid(r, player, rng.randint(0, r))
+            engine.set_tricks(r, player, won)
+        if r < rounds:
+            engine.advance_round()
+    if rounds == engine.max_rounds:
+        engine.finish()
+    return engine
+
+
+def synthetic_save_data(engine, saved_at):
+    """Build the same payload save_game writes."""
+    return {
+        "title": f"Game: {', '.join(engine.players)}",
+        **engine.to_save_data(),
+        "saved_at": saved_at.isoformat(),
+        "total_scores": engine.get_total_scores(),
+    }
+
+
+def populate_save_dir(save_dir, count, seed=0):
+    """Fill save_dir with count synthetic saves, reusing what a previous run left."""
+    save_dir.mkdir(parents=True, exist_ok=True)
+    existing = len(save_paths(save_dir))
+    if existing == count:
+        return
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        num_players = rng.choice(PLAYER_COUNTS)
+        engine = synthetic_game(num_players, rng, rounds=rng.randint(1, 60 // num_players))
+        saved_at = start + timedelta(minutes=i)
+        filename = f"wizard_game_bench_{i:06d}_{saved_at.strftime('%Y%m%d_%H%M%S')}.txt"
+        write_save(save_dir / filename, synthetic_save_data(engine, saved_at))
+
+
+def measure(fn, repeat=5):
+    """Best-of-repeat seconds per call, looping fast calls to SAMPLE_SECONDS."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * SAMPLE_SECONDS / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat, number)) / number
+
+
+def bench_scoring():
+    """Time calculate_score over every (bid, tricks) pair of a 20-round game."""
+    pairs = [(b, t) for b in range(21) for t in range(21)]
+
+    def score_all():
+        for b, t in pairs:
+            calculate_score(b, t)
+
+    return {"calculate_score": measure(score_all) / len(pairs)}
+
+
+def bench_games(tmp_dir):
+    """Time the per-game hot paths for every player count."""
+    results = {}
+    for num_players in PLAYER_COUNTS:
+        rng = random.Random(num_players)
+        engine = synthetic_game(num_players, rng)
+        last = engine.max_rounds
+        stats = engine.analyze_game_stats()
+        save_data = synthetic_save_data(engine, datetime(2024, 1, 1))
+        filepath = tmp_dir / f"wizard_game_roundtrip_{num_players}.txt"
+
+        binary_path = tmp_dir / f"wizard_game_roundtrip_{num_players}.wzb"
+
+        def round_trip():
+            write_save(filepath, save_data)
+            GameEngine.from_save_data(read_save(filepath))
+
+        def binary_round_trip():
+            write_binary_save(binary_path, save_data)
+            GameEngine.from_save_data(read_save(binary_path))
+
+        # Autosave of an in-progress game: one changed round appended to its journal
+        live = synthetic_game(num_players, rng, rounds=last - 1)
+        journal_path = tmp_dir / f"wizard_game_journal_{num_players}.txt"
+        append_save(journal_path, synthetic_save_data(live, datetime(2024, 1, 1)))
+
+        def journal_append():
+            r = live.current_round
+            live.set_bid(r, live.players[0], 1 - (live.get_round(r, live.players[0])['bid'] or 0))
+            append_save(journal_path, synthetic_save_data(live, datetime(2024, 1, 1)))
+
+        tag = f"[{num_players}p]"
+        results["get_total_scores" + tag] = measure(engine.get_total_scores)
+        results["get_shot_players" + tag] = measure(lambda: engine.get_shot_players(last))
+        results["analyze_game_stats" + tag] = measure(engine.analyze_game_stats)
+        results["build_roast_prompt" + tag] = measure(lambda: build_roast_prompt(engine, last))
+        results["build_summary_prompt" + tag] = measure(lambda: build_summary_prompt(engine.players, stats['analysis']))
+        results["save_load_roundtrip" + tag] = measure(round_trip)
+        results["binary_save_load_roundtrip" + tag] = measure(binary_round_trip)
+        results["text_load" + tag] = measure(lambda: GameEngine.from_save_data(read_save(filepath)))
+        results["binary_load" + tag] = measure(lambda: GameEngine.from_save_data(read_save(binary_path)))
+        results["journal_append" + tag] = measure(journal_append)
+        results["journal_load" + tag] = measure(lambda: GameEngine.from_save_data(read_save(journal_path)))
+    return results
+
+
+def bench_save_dirs(data_dir, sizes):
+    """Time the saved-games index (build, full listing, sidebar page) and a packed archive for each directory size."""
+    results = {}
+    for size in sizes:
+        save_dir = data_dir / f"saves_{size}"
+        populate_save_dir(save_dir, size)
+        with tempfile.TemporaryDirectory() as tmp:
+            index_path = Path(tmp) / "save_index.sqlite3"
+            start = timeit.default_timer()
+            index = SaveIndex(save_dir, path=index_path)
+            index.refresh()
+            results[f"save_index_build[{size}]"] = timeit.default_timer() - start
+            results[f"get_saved_games[{size}]"] = measure(index.list, repeat=3)
+            results[f"get_saved_games_page[{size}]"] = measure(lambda: index.recent(SIDEBAR_PAGE_SIZE), repeat=3)
+            index.close()
+
+            archive_path = Path(tmp) / "archive.wzp"
+            names = sorted(p.name for p in save_paths(save_dir))
+            SaveArchive(archive_path).update({p.name: (read_save(p), 0) for p in save_paths(save_dir)})
+            results[f"archive_open[{size}]"] = measure(lambda: len(SaveArchive(archive_path)), repeat=3)
+            archive = SaveArchive(archive_path)
+            results[f"archive_load[{size}]"] = measure(lambda: archive.load(names[len(names) // 2]), repeat=3)
+    return results
+
+
+def run(sizes, data_dir):
+    """Run every benchmark and return {name: seconds per call}."""
+    results = bench_scoring()
+    with tempfile.TemporaryDirectory() as tmp:
+        results.update(bench_games(Path(tmp)))
+    results.update(bench_save_dirs(data_dir, sizes))
+    return results
+
+
+def _slowest_imports(importtime_log, limit=10):
+    """Top-level (module, cumulative seconds) pairs from a -X importtime log."""
+    imports = []
+    for line in importtime_log.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit() and not parts[2].startswith("  "):
+            imports.append((parts[2].strip(), int(parts[1]) / 1e6))
+    return sorted(imports, key=lambda x: x[1], reverse=True)[:limit]
+
+
+def measure_startup(runs=STARTUP_RUNS):
+    """Best-of-runs cold start: Streamlit import and first bare-mode render of the app."""
+    script = STARTUP_SCRIPT.format(root=str(Path(__file__).parent), heavy=HEAVY_MODULES)
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            capture_output=True, text=True, check=True, cwd=tempfile.gettempdir(),
+        )
+        sample = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or sample["first_render"] < best["first_render"]:
+            best = dict(sample, slowest=_slowest_imports(proc.stderr))
+    return best
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return [(name, baseline, current, ratio, regressed)] for benchmarks in both runs."""
+    rows = []
+    for name, current in results.items():
+        if name in baseline:
+            ratio = current / baseline[name] if baseline[name] else float('inf')
+            rows.append((name, baseline[name], current, ratio, ratio > threshold))
+    return rows
+
+
+def _fmt(seconds):
+    """Human-readable duration."""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Wizard scoring, stats and persistence hot paths.")
+    parser.add_argument("--sizes", default=",".join(map(str, DIR_SIZES)), help="Comma-separated save directory sizes")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Where generated save directories are kept")
+    parser.add_argument("--output", default=str(RESULTS_FILE), help="JSON file to write the results to")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Slowdown ratio counted as a regression")
+    parser.add_argument("--startup", action="store_true", help="Measure import and first-render cost of the app instead")
+    args = parser.parse_args(argv)
+
+    baseline_path = Path(args.baseline)
+    baseline_report = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    baseline = baseline_report.get("results", {})
+
+    if args.startup:
+        startup = measure_startup()
+        results = {"startup.import_streamlit": startup["import_streamlit"], "startup.first_render": startup["first_render"]}
+        print("Slowest imports during startup:")
+        for module, seconds in startup["slowest"]:
+            print(f"  {module:<40}{_fmt(seconds):>12}")
+        print(f"Heavy libraries loaded: {', '.join(startup['loaded']) or 'none'}\n")
+    else:
+        sizes = [int(s) for s in args.sizes.split(",") if s]
+        results = run(sizes, Path(args.data_dir))
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "unit": "seconds per call",
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        # Startup and hot-path runs share one baseline file
+        baseline_path.write_text(json.dumps(dict(report, results={**baseline, **results}), indent=2))
+
+    rows = compare(results, baseline, args.threshold)
+    compared = {row[0] for row in rows}
+
+    print(f"{'Benchmark':<32}{'Baseline':>12}{'Current':>12}{'Ratio':>8}")
+    for name, base, current, ratio, regressed in rows:
+        print(f"{name:<32}{_fmt(base):>12}{_fmt(current):>12}{ratio:>7.2f}x{'  REGRESSION' if regressed else ''}")
+    for name in results:
+        if name not in compared:
+            print(f"{name:<32}{'-':>12}{_fmt(results[name]):>12}")
+
+    if any(row[4] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
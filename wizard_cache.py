@@ -0,0 +1,102 @@
+"""On-disk cache of AI completions for the roasts and the end-game summary.
+
+Replies are keyed by (provider, model, prompt hash, temperature, max_tokens),
+so asking the same question about an unchanged game again is answered from
+disk instead of spending a paid or quota-limited API call. The cache is
+bounded in size (least recently used replies are evicted first) and replies
+expire after a TTL.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from wizard_storage import SAVE_DIR
+
+AI_CACHE_FILE = SAVE_DIR / ".ai_cache.sqlite3"
+# Total size of the cached replies before the least recently used are evicted
+AI_CACHE_MAX_BYTES = 2_000_000
+# Seconds a cached reply is served before it is asked for again
+AI_CACHE_TTL = 7 * 24 * 3600
+
+
+def completion_key(provider, model, prompt, temperature, max_tokens):
+    """Cache key of a completion request."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return json.dumps([provider, model, prompt_hash, temperature, max_tokens])
+
+
+class CompletionCache:
+    """Size-bounded LRU cache of completions with a TTL, persisted in SQLite.
+
+    Entries are kept in memory in least to most recently used order, so a hit
+    is a dict lookup; the database only has to keep up with puts and touches.
+    """
+
+    def __init__(self, path=AI_CACHE_FILE, max_bytes=AI_CACHE_MAX_BYTES, ttl=AI_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        # A lost cache only costs API calls again, so skip the fsyncs
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY, text TEXT, created REAL, used REAL)
+        """)
+        # key -> (created, text), least recently used first
+        self._entries = OrderedDict(
+            (key, (created, text))
+            for key, text, created in self._db.execute("SELECT key, text, created FROM completions ORDER BY used")
+        )
+        self._size = sum(len(text.encode("utf-8")) for _, text in self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        self._db.close()
+
+    def _drop(self, key):
+        """Forget an entry in memory; the caller deletes its row."""
+        _, text = self._entries.pop(key)
+        self._size -= len(text.encode("utf-8"))
+
+    def get(self, key):
+        """Cached completion for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock, self._db:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now - entry[0] > self.ttl:
+                self._drop(key)
+                self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                return None
+            self._entries.move_to_end(key)
+            self._db.execute("UPDATE completions SET used = ? WHERE key = ?", (now, key))
+            return entry[1]
+
+    def put(self, key, text):
+        """Cache a completion, evicting the least recently used ones beyond max_bytes."""
+        now = time.time()
+        with self._lock, self._db:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (now, text)
+            self._size += len(text.encode("utf-8"))
+            self._db.execute("INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?)", (key, text, now, now))
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                old_key = next(iter(self._entries))
+                self._drop(old_key)
+                self._db.execute("DELETE FROM completions WHERE key = ?", (old_key,))
+
+    def clear(self):
+        """Forget every cached completion."""
+        with self._lock, self._db:
+            self._entries.clear()
+            self._size = 0
+            self._db.execute("DELETE FROM completions")
@@ -1,16 +1,26 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
+import hashlib
+import importlib.util
 import json
 import re
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-# Google Gemini API
+from wizard_analytics import MIN_WIN_ROUNDS, BidIndex, win_probabilities
+from wizard_cache import CompletionCache, completion_key
+from wizard_engine import GameEngine, calculate_score, max_rounds_for, EMPTY_ROUND_DATA
+from wizard_prompts import build_roast_prompt, build_summary_prompt, parse_roasts
+from wizard_quota import QuotaTracker
+from wizard_storage import SAVE_DIR, FileStorage, open_storage
+
+# pandas/altair (Scoreboard tab), requests and google.genai (AI roasts) are imported
+# where they are used, so the first page load doesn't pay for them.
+# Google Gemini API: only check that the library is installed
 try:
-    from google import genai
-    GEMINI_AVAILABLE = True
+    GEMINI_AVAILABLE = importlib.util.find_spec("google.genai") is not None
 except ImportError:
     GEMINI_AVAILABLE = False
 
@@ -20,11 +30,12 @@ st.set_page_config(page_title="The Grand Fardini", page_icon="🧙", layout="wid
 if 'dark_mode' not in st.session_state:
     st.session_state.dark_mode = True  # Default to dark mode to match system default
 
-# Generate theme-specific CSS based on toggle state
-if st.session_state.dark_mode:
-    # Dark mode CSS
-    theme_css = """
-    <style>
+# Theme CSS: one stylesheet per process holding both themes plus the layout rules.
+# Every rule is scoped to a marker element, so switching theme only swaps the small
+# marker below while the stylesheet bytes stay identical across reruns. Streamlit
+# hashes large identical elements and sends the browser a reference instead of
+# the ~30 KB payload once it has seen it.
+THEME_DARK_CSS = """
         /* ===== DARK MODE THEME ===== */
         :root {
             --text-primary: #fafafa;
@@ -108,12 +119,9 @@ if st.session_state.dark_mode:
         
         .stContainer, [data-testid="stExpander"], [data-testid="stForm"] { background-color: #0e1117 !important; }
         .stAlert { border-color: #444 !important; }
-    </style>
-    """
-else:
-    # Light mode CSS
-    theme_css = """
-    <style>
+"""
+
+THEME_LIGHT_CSS = """
         /* ===== LIGHT MODE THEME ===== */
         :root {
             --text-primary: #262730;
@@ -216,14 +224,10 @@ else:
         .vega-embed .vega-bindings { color: #262730 !important; }
         
         .stContainer, [data-testid="stExpander"], [data-testid="stForm"] { background-color: #ffffff !important; }
-    </style>
-    """
-
-st.markdown(theme_css, unsafe_allow_html=True)
+"""
 
 # Always-applied CSS (layout, sizing, touch targets)
-st.markdown("""
-<style>
+LAYOUT_CSS = """
     /* ===== SIDEBAR COLLAPSE BUTTON ===== */
     [data-testid="collapsedControl"], [data-testid="stSidebarCollapseButton"], button[kind="header"], [data-testid="baseButton-header"],
     [data-testid="stSidebar"] [data-testid="stSidebarCollapseButton"], [data-testid="stSidebarNav"] button, section[data-testid="stSidebar"] > div:first-child button {
@@ -321,11 +325,44 @@ st.markdown("""
     .stButton [data-testid="stMarkdownContainer"], [data-testid="stSidebar"] .stButton [data-testid="stMarkdownContainer"] { width: auto !important; max-width: none !important; min-width: 0 !important; display: flex !important; justify-content: center !important; align-items: center !important; }
     .stButton [data-testid="stMarkdownContainer"] p, [data-testid="stSidebar"] .stButton [data-testid="stMarkdownContainer"] p { width: auto !important; max-width: none !important; margin: 0 !important; text-align: center !important; }
     [data-testid="stSidebar"] [data-testid="column"] .stButton button div[class*="emotion-cache"] { width: auto !important; max-width: none !important; }
-</style>
-""", unsafe_allow_html=True)
+"""
+
+def _scope_css(css, scope):
+    """Prefix every selector of every rule in css with scope."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    
+    def scope_rule(match):
+        selectors = []
+        depth, current = 0, ""
+        for ch in match.group(1):
+            depth += (ch == "(") - (ch == ")")
+            if ch == "," and depth == 0:
+                selectors.append(current)
+                current = ""
+            else:
+                current += ch
+        selectors.append(current)
+        scoped = [scope if sel.strip() == ":root" else f"{scope} {sel.strip()}" for sel in selectors]
+        return ", ".join(scoped) + " {"
+    
+    return re.sub(r"([^{}]+)\{", scope_rule, css)
+
+@st.cache_resource
+def get_stylesheet():
+    """Build the combined theme + layout stylesheet once per process."""
+    return "<style>\n" + "".join([
+        _scope_css(THEME_DARK_CSS, ":root:has(.wizard-theme-dark)"),
+        _scope_css(THEME_LIGHT_CSS, ":root:has(.wizard-theme-light)"),
+        _scope_css(LAYOUT_CSS, ":root:has(.wizard-theme)"),
+    ]) + "</style>"
+
+st.markdown(get_stylesheet(), unsafe_allow_html=True)
+st.markdown(
+    f"<span class='wizard-theme wizard-theme-{'dark' if st.session_state.dark_mode else 'light'}'></span>",
+    unsafe_allow_html=True
+)
 
 # Save directory for game files
-SAVE_DIR = Path(__file__).parent / "saved_games"
 SAVE_DIR.mkdir(exist_ok=True)
 
 # API key config files (stored locally, NOT committed to git)
@@ -371,6 +408,7 @@ DEFAULT_PROVIDER = "Google Gemini (Free)"
 
 # NVIDIA API Configuration
 NVIDIA_API_URL = "https://integrate.api.nvidia.com/v1/chat/completions"
+NVIDIA_MODELS_URL = "https://integrate.api.nvidia.com/v1/models"
 NVIDIA_MODELS = {
     "DeepSeek-R1 (Slower, More Creative)": "deepseek-ai/deepseek-r1",
     "Llama 3.1 70B (Fast)": "meta/llama-3.1-70b-instruct",
@@ -386,26 +424,52 @@ GEMINI_MODELS = {
     "Gemma 3 27B - Unlimited (Lower Quality)": "gemma-3-27b-it",
 }
 DEFAULT_GEMINI_MODEL = "gemini-2.5-flash"
+# Free-tier requests per day; models not listed are not rate limited here
+GEMINI_DAILY_LIMITS = {
+    "gemini-3-flash-preview": 20,
+    "gemini-2.5-flash": 20,
+    "gemini-2.5-flash-lite": 20,
+    "gemma-3-27b-it": 14400,
+}
+# Requests of each daily quota that round roasts leave for the end-game summary
+SUMMARY_RESERVE = 1
+# Seconds the tricks must stay unchanged before a round's roast is started ahead of Next Round
+SPECULATE_AFTER = 1.0
+# No roasts are started ahead of time once a model has this many requests left or fewer
+SPECULATE_RESERVE = 5
+
+# Background AI requests (roasts, summaries, warm-ups) in flight at once, and pooled connections per host
+AI_WORKERS = 4
+# Seconds a pooled connection may sit idle before it is assumed closed and re-warmed
+AI_WARM_IDLE = 60
+# Seconds between redraws of AI text that is still streaming in
+AI_STREAM_REFRESH = 0.5
+# Seconds a successful key check is trusted, by every session, before it is made again
+VERIFY_TTL = 30 * 60
 
 # Default colors for new players
-DEFAULT_COLORS = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEAA7", "#DDA0DD", "#98D8C8", "#F7DC6F"]
+# Saves listed per "Show more" page in the Load Game section
+SAVES_PAGE_SIZE = 5
 
-# Default player round data structure
-EMPTY_ROUND_DATA = {'bid': None, 'tricks': None}
+DEFAULT_COLORS = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEAA7", "#DDA0DD", "#98D8C8", "#F7DC6F"]
 
 # Initialize session state with defaults (dark_mode initialized earlier before CSS)
 SESSION_DEFAULTS = {
-    'players': [], 'current_round': 1, 'game_data': {}, 'game_started': False,
-    'max_rounds': 0, 'current_save_file': None, 'player_colors': {}, 'active_tab': 0,
-    'starting_dealer_index': 0, 'shot_players': [], 'round_roasts': {},
+    'current_save_file': None, 'active_tab': 0,
+    'shot_players': [], 'round_roasts': {},
     'api_provider': DEFAULT_PROVIDER, 'enable_roasts': False, 'api_verified': False,
     'selected_nvidia_model': DEFAULT_NVIDIA_MODEL, 'selected_gemini_model': DEFAULT_GEMINI_MODEL,
-    'game_finished': False, 'show_celebration': False, 'manual_roast': {},
+    'show_celebration': False, 'manual_roast': {},
     'game_summary': None, 'game_stats': None,
+    'saves_shown': SAVES_PAGE_SIZE, 'binary_saves': False,
+    'ai_jobs': {}, 'ai_cache': True, 'model_probe': [], 'speculative_roast': None,
 }
 for key, default in SESSION_DEFAULTS.items():
     if key not in st.session_state:
         st.session_state[key] = default
+# Game state lives in a headless engine; the UI below is a view over it
+if 'engine' not in st.session_state:
+    st.session_state.engine = GameEngine()
 # Load API keys if not already loaded
 if 'nvidia_api_key' not in st.session_state:
     st.session_state.nvidia_api_key = load_saved_api_key("nvidia")
@@ -435,53 +499,89 @@ def get_theme_colors():
             'chart_grid': '#ddd', 'stat_text': '#495057',
         }
 
-def calculate_score(bid, tricks):
-    """Calculate score for a round based on bid and tricks won."""
-    if bid == tricks:
-        return 20 + (10 * tricks)
-    else:
-        return -10 * abs(bid - tricks)
-
 def get_total_scores():
     """Calculate total scores for all players (only completed rounds, not current round unless game is finished)."""
-    totals = {player: 0 for player in st.session_state.players}
-    current_round = st.session_state.get('current_round', 1)
-    game_finished = st.session_state.get('game_finished', False)
-    
-    for round_num, round_data in st.session_state.game_data.items():
-        if round_num < current_round or game_finished:
-            for player, data in round_data.items():
-                if data['bid'] is not None and data['tricks'] is not None:
-                    totals[player] += calculate_score(data['bid'], data['tricks'])
-    return totals
+    return st.session_state.engine.get_total_scores()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_win_probabilities(history, totals, next_round, max_rounds, priors):
+    """Simulated win probabilities, cached on the completed rounds so only a finished round recomputes them."""
+    return win_probabilities(history, totals, next_round, max_rounds, priors)
+
+@st.cache_resource(show_spinner="Indexing saved games...")
+def get_bid_index():
+    """Process-wide bid outcome index, topped up from any saves not indexed yet."""
+    bid_index = BidIndex()
+    bid_index.rebuild(get_storage())
+    return bid_index
 
 def get_shot_players(round_num):
     """Return list of players who need to take a shot (off by 2+ tricks)."""
-    shot_players = []
-    for player in st.session_state.players:
-        data = st.session_state.game_data.get(round_num, {}).get(player, EMPTY_ROUND_DATA)
-        bid, tricks = data.get('bid', 0) or 0, data.get('tricks', 0) or 0
-        if abs(bid - tricks) >= 2:
-            shot_players.append(player)
-    return shot_players
+    return st.session_state.engine.get_shot_players(round_num)
 
 def init_round_data(round_num):
     """Initialize game data for a round if it doesn't exist."""
-    if round_num not in st.session_state.game_data:
-        st.session_state.game_data[round_num] = {
-            player: EMPTY_ROUND_DATA.copy() for player in st.session_state.players
-        }
+    st.session_state.engine.init_round_data(round_num)
+
+def _roast_prompt_hash(round_num):
+    """Hash of a round's roast prompt, which covers its bids and tricks and the game so far."""
+    prompt = build_roast_prompt(st.session_state.engine, round_num)
+    return prompt, hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+def speculate_round_roast(round_num):
+    """Start roasting a round whose tricks add up before Next Round is clicked; True while waiting to.
+    
+    A guess is only sent once the numbers have stayed the same for
+    SPECULATE_AFTER seconds, at most one guess per round is in flight (new
+    numbers wait for it to finish), and none is sent while the model has
+    SPECULATE_RESERVE requests or fewer left.
+    """
+    prompt, digest = _roast_prompt_hash(round_num)
+    guess = st.session_state.speculative_roast
+    if not guess or guess['round'] != round_num or guess['hash'] != digest:
+        # New numbers: wait for them to settle. An older guess still queued is dropped; one already sent can't be
+        in_flight = None
+        if guess and guess['job'] and not guess['job'][0].cancel() and not guess['job'][0].done():
+            in_flight = guess['job'][0]
+        elif guess:
+            in_flight = guess['in_flight']
+        st.session_state.speculative_roast = {'round': round_num, 'hash': digest, 'since': time.monotonic(),
+                                              'job': None, 'in_flight': in_flight}
+        return True
+    if guess['job'] is not None:
+        return False
+    if time.monotonic() - guess['since'] < SPECULATE_AFTER or (guess['in_flight'] and not guess['in_flight'].done()):
+        return True
+    settings = ai_settings()
+    if not get_quota_tracker().has_budget(_selected_model(settings), reserve=SPECULATE_RESERVE):
+        return False
+    stream = TextStream()
+    job = get_ai_executor().submit(_roast_job, list(st.session_state.engine.players), prompt, settings, False, stream)
+    guess.update(job=(job, stream), in_flight=None)
+    return False
+
+@st.fragment(run_every=SPECULATE_AFTER)
+def watch_speculation(round_num):
+    """Re-check a waiting speculative roast until it is sent (no output)."""
+    speculate_round_roast(round_num)
 
 def generate_round_roast(round_num):
-    """Generate roast for a completed round and store it."""
+    """Start generating the roast for a completed round; it lands in round_roasts when ready."""
     if st.session_state.enable_roasts and st.session_state.api_verified:
-        roast = generate_roasts(round_num)
-        st.session_state.round_roasts[round_num] = roast if roast else "[No roast generated - API may have failed]"
+        guess = st.session_state.speculative_roast
+        st.session_state.speculative_roast = None
+        # Reuse the roast started while the tricks were entered if the numbers are still the same
+        if guess and guess['job'] and guess['round'] == round_num and guess['hash'] == _roast_prompt_hash(round_num)[1]:
+            st.session_state.ai_jobs[round_num] = guess['job']
+        else:
+            submit_roasts(round_num, round_num)
     elif st.session_state.enable_roasts:
         st.session_state.round_roasts[round_num] = "[API not verified - please verify your API key]"
 
 def render_roast_popup(round_num, roast_text, theme):
     """Render a roast popup with consistent styling."""
+    if isinstance(roast_text, dict):
+        roast_text = "<br>".join(f"<b>{p}</b>: {roast}" for p, roast in roast_text.items())
     st.markdown(
         f"""<div style='background: {theme['roast_bg']}; 
                      padding: 20px; border-radius: 15px; border: 2px solid #f39c12; 
@@ -494,219 +594,66 @@ def render_roast_popup(round_num, roast_text, theme):
 
 def analyze_game_stats():
     """Analyze the full game and return comprehensive statistics."""
-    max_rounds = st.session_state.max_rounds
-    players = st.session_state.players
-    
-    # Build running totals per round for each player
-    running_totals = {p: [0] for p in players}  # Start at 0
-    round_scores = {p: [] for p in players}
-    round_standings = []  # List of standings after each round
-    
-    for r in range(1, max_rounds + 1):
-        if r in st.session_state.game_data:
-            round_standing = {}
-            for p in players:
-                data = st.session_state.game_data[r].get(p, EMPTY_ROUND_DATA)
-                bid = data['bid']
-                tricks = data['tricks']
-                if bid is not None and tricks is not None:
-                    score = calculate_score(bid, tricks)
-                    round_scores[p].append(score)
-                    running_totals[p].append(running_totals[p][-1] + score)
-                else:
-                    round_scores[p].append(0)
-                    running_totals[p].append(running_totals[p][-1])
-                round_standing[p] = running_totals[p][-1]
-            round_standings.append(sorted(round_standing.items(), key=lambda x: x[1], reverse=True))
-    
-    stats = {
-        'running_totals': running_totals,
-        'round_scores': round_scores,
-        'round_standings': round_standings,
-        'analysis': {}
-    }
-    
-    # Calculate interesting statistics for each player
-    for p in players:
-        scores = round_scores[p]
-        totals = running_totals[p]
-        
-        # Best and worst rounds
-        if scores:
-            best_round_score = max(scores)
-            worst_round_score = min(scores)
-            best_round = scores.index(best_round_score) + 1
-            worst_round = scores.index(worst_round_score) + 1
-        else:
-            best_round_score = worst_round_score = best_round = worst_round = 0
-        
-        # Correct bids count
-        correct_bids = sum(1 for s in scores if s > 0)
-        
-        # Biggest 3-round jump and drop
-        max_3round_jump = 0
-        max_3round_drop = 0
-        jump_rounds = (0, 0)
-        drop_rounds = (0, 0)
-        
-        if len(totals) >= 4:
-            for i in range(len(totals) - 3):
-                change = totals[i+3] - totals[i]
-                if change > max_3round_jump:
-                    max_3round_jump = change
-                    jump_rounds = (i+1, i+3)
-                if change < max_3round_drop:
-                    max_3round_drop = change
-                    drop_rounds = (i+1, i+3)
-        
-        # Lead changes - how many times they took/lost the lead
-        times_in_lead = 0
-        lead_changes_involving = 0
-        was_leading = False
-        
-        for i, standing in enumerate(round_standings):
-            currently_leading = standing[0][0] == p if standing else False
-            if currently_leading:
-                times_in_lead += 1
-            if currently_leading != was_leading:
-                lead_changes_involving += 1
-            was_leading = currently_leading
-        
-        # Comeback or choke stats
-        if len(round_standings) >= 2:
-            first_standing = [x[0] for x in round_standings[0]]
-            last_standing = [x[0] for x in round_standings[-1]]
-            start_rank = first_standing.index(p) + 1 if p in first_standing else len(players)
-            end_rank = last_standing.index(p) + 1 if p in last_standing else len(players)
-            rank_change = start_rank - end_rank  # Positive = improved
-        else:
-            start_rank = end_rank = rank_change = 0
-        
-        # Hot and cold streaks
-        current_streak = 0
-        max_hot_streak = 0
-        max_cold_streak = 0
-        for s in scores:
-            if s > 0:
-                if current_streak >= 0:
-                    current_streak += 1
-                else:
-                    current_streak = 1
-                max_hot_streak = max(max_hot_streak, current_streak)
-            else:
-                if current_streak <= 0:
-                    current_streak -= 1
-                else:
-                    current_streak = -1
-                max_cold_streak = max(max_cold_streak, abs(current_streak))
-        
-        stats['analysis'][p] = {
-            'final_score': totals[-1] if totals else 0,
-            'best_round': best_round,
-            'best_round_score': best_round_score,
-            'worst_round': worst_round,
-            'worst_round_score': worst_round_score,
-            'correct_bids': correct_bids,
-            'total_rounds': len(scores),
-            'accuracy': round(correct_bids / len(scores) * 100, 1) if scores else 0,
-            'max_3round_jump': max_3round_jump,
-            'jump_rounds': jump_rounds,
-            'max_3round_drop': max_3round_drop,
-            'drop_rounds': drop_rounds,
-            'times_in_lead': times_in_lead,
-            'lead_changes': lead_changes_involving,
-            'start_rank': start_rank,
-            'end_rank': end_rank,
-            'rank_change': rank_change,
-            'max_hot_streak': max_hot_streak,
-            'max_cold_streak': max_cold_streak,
-        }
-    
-    return stats
+    return st.session_state.engine.analyze_game_stats()
 
-def generate_game_summary(stats):
-    """Use LLM to generate an engaging end-game summary."""
+def generate_game_summary(stats, bypass_cache=False):
+    """Start generating an engaging end-game summary; it lands in game_summary when ready."""
     if not st.session_state.api_verified:
-        return None
-    
-    players = st.session_state.players
-    analysis = stats['analysis']
-    
-    # Build comprehensive stats summary for LLM
-    player_summaries = []
-    for p in players:
-        a = analysis[p]
-        summary = f"""{p}:
-- Final: #{a['end_rank']} with {a['final_score']} pts
-- Accuracy: {a['correct_bids']}/{a['total_rounds']} correct ({a['accuracy']}%)
-- Best round: R{a['best_round']} (+{a['best_round_score']} pts), Worst: R{a['worst_round']} ({a['worst_round_score']} pts)
-- Biggest 3-round jump: +{a['max_3round_jump']} (R{a['jump_rounds'][0]}-R{a['jump_rounds'][1]})
-- Biggest 3-round drop: {a['max_3round_drop']} (R{a['drop_rounds'][0]}-R{a['drop_rounds'][1]})
-- Times leading: {a['times_in_lead']} rounds, Lead changes: {a['lead_changes']}
-- Started #{a['start_rank']}, Finished #{a['end_rank']} (moved {'+' if a['rank_change'] > 0 else ''}{a['rank_change']} spots)
-- Hot streak: {a['max_hot_streak']} correct in a row, Cold streak: {a['max_cold_streak']} misses in a row"""
-        player_summaries.append(summary)
-    
-    # Find superlatives
-    superlatives = []
-    
-    # Best accuracy
-    best_accuracy = max(players, key=lambda p: analysis[p]['accuracy'])
-    superlatives.append(f"Most Accurate: {best_accuracy} ({analysis[best_accuracy]['accuracy']}%)")
-    
-    # Worst accuracy
-    worst_accuracy = min(players, key=lambda p: analysis[p]['accuracy'])
-    superlatives.append(f"Least Accurate: {worst_accuracy} ({analysis[worst_accuracy]['accuracy']}%)")
-    
-    # Biggest comeback
-    biggest_comeback = max(players, key=lambda p: analysis[p]['rank_change'])
-    if analysis[biggest_comeback]['rank_change'] > 0:
-        superlatives.append(f"Biggest Comeback: {biggest_comeback} (climbed {analysis[biggest_comeback]['rank_change']} spots)")
-    
-    # Biggest choke
-    biggest_choke = min(players, key=lambda p: analysis[p]['rank_change'])
-    if analysis[biggest_choke]['rank_change'] < 0:
-        superlatives.append(f"Biggest Choke: {biggest_choke} (dropped {abs(analysis[biggest_choke]['rank_change'])} spots)")
+        return
     
-    # Hottest streak
-    hottest = max(players, key=lambda p: analysis[p]['max_hot_streak'])
-    superlatives.append(f"Hottest Streak: {hottest} ({analysis[hottest]['max_hot_streak']} correct in a row)")
-    
-    # Coldest streak
-    coldest = max(players, key=lambda p: analysis[p]['max_cold_streak'])
-    superlatives.append(f"Coldest Streak: {coldest} ({analysis[coldest]['max_cold_streak']} misses in a row)")
-    
-    # Best 3-round jump
-    best_jumper = max(players, key=lambda p: analysis[p]['max_3round_jump'])
-    superlatives.append(f"Best 3-Round Run: {best_jumper} (+{analysis[best_jumper]['max_3round_jump']} pts)")
-    
-    # Worst 3-round drop
-    worst_dropper = min(players, key=lambda p: analysis[p]['max_3round_drop'])
-    superlatives.append(f"Worst 3-Round Collapse: {worst_dropper} ({analysis[worst_dropper]['max_3round_drop']} pts)")
-    
-    prompt = f"""You are a sports commentator giving an exciting end-game summary for a Wizard card game tournament.
+    prompt = build_summary_prompt(st.session_state.engine.players, stats['analysis'])
+    submit_ai_job("summary", _summary_job, prompt, ai_settings(), bypass_cache)
 
-FINAL STANDINGS AND PLAYER STATS:
-{chr(10).join(player_summaries)}
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Process-wide requests.Session whose keep-alive connection pool every NVIDIA call shares."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=AI_WORKERS))
+    return session
 
-NOTABLE ACHIEVEMENTS:
-{chr(10).join(superlatives)}
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_gemini_client(api_key):
+    """Process-wide Gemini client per API key, reusing its connections across calls and sessions."""
+    from google import genai
+    return genai.Client(api_key=api_key)
 
-Write an exciting, dramatic game summary (3-4 paragraphs) that:
-1. Celebrates the winner and their journey to victory
-2. Highlights the most dramatic moments (comebacks, chokes, close battles)
-3. Gives funny "awards" to each player based on their unique stats
-4. Ends with a memorable final statement
+@st.cache_resource
+def get_ai_last_used():
+    """Process-wide {(provider, api key): monotonic time of the last request on its pooled connection}."""
+    return {}
 
-Be entertaining, use their names, reference specific stats. Make it feel like a sports broadcast recap!"""
+def _note_ai_request(provider, api_key):
+    """Record that a provider's pooled connection is in use (and so warm)."""
+    get_ai_last_used()[(provider, api_key)] = time.monotonic()
 
-    content, error = generate_ai_content(prompt, max_tokens=800, temperature=0.9, timeout=120)
-    return content
+def _prewarm_job(settings):
+    """Background job: open the connection the next request to the provider will reuse."""
+    try:
+        if settings['api_provider'] == "Google Gemini (Free)":
+            get_gemini_client(settings['gemini_api_key']).models.get(model=settings['selected_gemini_model'])
+        else:
+            get_http_session().head(NVIDIA_API_URL, timeout=10)
+    except Exception:
+        pass  # Only a warm-up; the real request reports any error
+
+def prewarm_ai_connection():
+    """Re-open the provider connection in the background if it sat idle long enough to be closed."""
+    settings = ai_settings()
+    provider = settings['api_provider']
+    api_key = settings['gemini_api_key'] if provider == "Google Gemini (Free)" else settings['nvidia_api_key']
+    last_used = get_ai_last_used().get((provider, api_key))
+    if last_used is None or time.monotonic() - last_used > AI_WARM_IDLE:
+        _note_ai_request(provider, api_key)
+        get_ai_executor().submit(_prewarm_job, settings)
 
-def verify_nvidia_api(api_key):
-    """Verify that the NVIDIA API key is working."""
+def verify_nvidia_api(api_key, model):
+    """Verify that the NVIDIA API key is working with a model (this also opens the pooled connection)."""
+    import requests
     try:
-        response = requests.post(
+        _note_ai_request("NVIDIA", api_key)
+        response = get_http_session().post(
             NVIDIA_API_URL,
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -714,7 +661,7 @@ def verify_nvidia_api(api_key):
                 "Accept": "application/json"
             },
             json={
-                "model": st.session_state.selected_nvidia_model,
+                "model": model,
                 "messages": [{"role": "user", "content": "Say 'API working' in exactly 2 words."}],
                 "max_tokens": 50,
                 "temperature": 0.5,
@@ -730,7 +677,9 @@ def verify_nvidia_api(api_key):
         elif response.status_code == 403:
             return False, "Access denied. Check your API key permissions."
         elif response.status_code == 404:
-            return False, f"Model not found. Check model name: {st.session_state.selected_nvidia_model}"
+            return False, f"Model not found. Check model name: {model}"
+        elif response.status_code == 429:
+            return False, "API quota exceeded. Try another model in the dropdown below."
         else:
             return False, f"API error: {response.status_code} - {response.text[:200]}"
     except requests.exceptions.Timeout:
@@ -738,15 +687,16 @@ def verify_nvidia_api(api_key):
     except Exception as e:
         return False, f"Connection error: {str(e)[:100]}"
 
-def verify_gemini_api(api_key):
-    """Verify that the Google Gemini API key is working."""
+def verify_gemini_api(api_key, model):
+    """Verify that the Google Gemini API key is working with a model (this also opens the pooled connection)."""
     if not GEMINI_AVAILABLE:
         return False, "Google Gemini library not installed. Run: pip install google-genai"
     
     try:
-        client = genai.Client(api_key=api_key)
+        _note_ai_request("Google Gemini (Free)", api_key)
+        client = get_gemini_client(api_key)
         response = client.models.generate_content(
-            model=st.session_state.selected_gemini_model,
+            model=model,
             contents="Say 'API working' in exactly 2 words."
         )
         if response and response.text:
@@ -762,363 +712,476 @@ def verify_gemini_api(api_key):
         else:
             return False, f"Connection error: {error_msg[:100]}"
 
-def generate_ai_content(prompt, max_tokens=500, temperature=0.9, timeout=60):
-    """Generate content using the selected AI provider (Gemini or NVIDIA)."""
-    provider = st.session_state.api_provider
+def ping_nvidia_model(api_key, model):
+    """Check that NVIDIA serves a model to an API key by listing the models (no completion is spent)."""
+    import requests
+    try:
+        _note_ai_request("NVIDIA", api_key)
+        response = get_http_session().get(
+            NVIDIA_MODELS_URL,
+            headers={"Authorization": f"Bearer {api_key}", "Accept": "application/json"},
+            timeout=10
+        )
+        if response.status_code == 200:
+            if any(entry.get("id") == model for entry in response.json().get("data", [])):
+                return True, "Model available."
+            return False, f"Model not found. Check model name: {model}"
+        elif response.status_code == 401:
+            return False, "Invalid API key. Please check your key."
+        elif response.status_code == 403:
+            return False, "Access denied. Check your API key permissions."
+        else:
+            return False, f"API error: {response.status_code} - {response.text[:200]}"
+    except requests.exceptions.Timeout:
+        return False, "Request timed out. Please try again."
+    except Exception as e:
+        return False, f"Connection error: {str(e)[:100]}"
+
+def ping_gemini_model(api_key, model):
+    """Check that Gemini serves a model to an API key by fetching its metadata (no completion is spent)."""
+    if not GEMINI_AVAILABLE:
+        return False, "Google Gemini library not installed. Run: pip install google-genai"
+    try:
+        _note_ai_request("Google Gemini (Free)", api_key)
+        get_gemini_client(api_key).models.get(model=model)
+        return True, "Model available."
+    except Exception as e:
+        error_msg = str(e)
+        if "API_KEY_INVALID" in error_msg or "invalid" in error_msg.lower():
+            return False, "Invalid API key. Please check your key."
+        return False, f"Connection error: {error_msg[:100]}"
+
+@st.cache_resource(show_spinner=False)
+def get_verify_results():
+    """Process-wide (provider, key hash, model) -> (checked_at, success, message, seconds) of recent key checks."""
+    return {}
+
+@st.cache_resource(show_spinner=False)
+def get_probe_results():
+    """Process-wide (provider, key hash, model) -> (checked_at, success, message, seconds) of recent model probes."""
+    return {}
+
+def _verify_key(provider, api_key, model):
+    """Key of a check in get_verify_results(); API keys are only kept hashed."""
+    return provider, hashlib.sha256(api_key.encode("utf-8")).hexdigest(), model
+
+def check_model(provider, api_key, model):
+    """Test an API key against one model with a small completion, and record the outcome."""
+    verify = verify_gemini_api if provider == "Google Gemini (Free)" else verify_nvidia_api
+    quota = get_quota_tracker()
+    if not quota.has_budget(model):
+        return False, "API quota used up for today. Try another model in the dropdown below."
+    quota.take(model)
+    start = time.monotonic()
+    success, message = verify(api_key, model)
+    if not success and _is_quota_error(message):
+        quota.exhaust(model)
+    get_verify_results()[_verify_key(provider, api_key, model)] = (time.time(), success, message, time.monotonic() - start)
+    return success, message
+
+def probe_model(provider, api_key, model):
+    """Test that a model is available to an API key with a metadata call, and record the outcome and latency."""
+    ping = ping_gemini_model if provider == "Google Gemini (Free)" else ping_nvidia_model
+    start = time.monotonic()
+    success, message = ping(api_key, model)
+    get_probe_results()[_verify_key(provider, api_key, model)] = (time.time(), success, message, time.monotonic() - start)
+    return success, message
+
+def _recent(results, provider, api_key, model):
+    """Result recorded for a key and model within VERIFY_TTL, or None."""
+    result = results.get(_verify_key(provider, api_key, model))
+    if result is None or time.time() - result[0] > VERIFY_TTL:
+        return None
+    return result
+
+def recent_check(provider, api_key, model):
+    """(checked_at, success, message, seconds) of the last check of a key and model within VERIFY_TTL, or None."""
+    return _recent(get_verify_results(), provider, api_key, model)
+
+def verify_api(provider, api_key, model):
+    """Verify an API key and model, trusting a success any session recorded within VERIFY_TTL."""
+    result = recent_check(provider, api_key, model)
+    if result and result[1]:
+        return True, result[2]
+    return check_model(provider, api_key, model)
+
+def probe_models(provider, api_key):
+    """Probe every model of the provider concurrently in the background, skipping those whose quota is used up."""
+    models = GEMINI_MODELS if provider == "Google Gemini (Free)" else NVIDIA_MODELS
+    quota = get_quota_tracker()
+    executor = get_ai_executor()
+    st.session_state.model_probe = [executor.submit(probe_model, provider, api_key, model)
+                                    for model in models.values() if quota.has_budget(model)]
+
+def model_status(provider, api_key, model):
+    """Quota state of a model from the quota tracker, else its latency from the latest probe or check, for the model selectbox."""
+    if not get_quota_tracker().has_budget(model):
+        return "  ·  ⛔ quota used up"
+    results = [result for result in (_recent(get_probe_results(), provider, api_key, model),
+                                     recent_check(provider, api_key, model)) if result]
+    if not results:
+        return ""
+    _, success, _, seconds = max(results, key=lambda result: result[0])
+    if success:
+        return f"  ·  ✅ {seconds:.1f}s"
+    return "  ·  ❌ unavailable"
+
+@st.fragment(run_every=1)
+def watch_model_probe():
+    """Show that the models are being checked; rerun the app once every check is done."""
+    if all(job.done() for job in st.session_state.model_probe):
+        st.session_state.model_probe = []
+        st.rerun(scope="app")
+    st.caption("📡 Checking models...")
+
+def ai_settings():
+    """Snapshot of the AI provider, keys and models, for calls made off the script thread."""
+    return {key: st.session_state[key] for key in (
+        'api_provider', 'gemini_api_key', 'nvidia_api_key', 'selected_gemini_model', 'selected_nvidia_model', 'ai_cache'
+    )}
+
+@st.cache_resource(show_spinner=False)
+def get_ai_cache():
+    """Process-wide on-disk cache of AI completions."""
+    return CompletionCache()
+
+@st.cache_resource(show_spinner=False)
+def get_quota_tracker():
+    """Process-wide tracker of the requests left in each rate-limited model's daily quota."""
+    return QuotaTracker(GEMINI_DAILY_LIMITS)
+
+def quota_caption(provider):
+    """Requests left today of the provider's rate-limited models, for the sidebar; None if it has none."""
+    if provider != "Google Gemini (Free)":
+        return None
+    quota = get_quota_tracker()
+    budgets = [
+        f"{name.split(' - ')[0]}: {quota.left(model)}/{GEMINI_DAILY_LIMITS[model]}"
+        for name, model in GEMINI_MODELS.items() if model in GEMINI_DAILY_LIMITS
+    ]
+    return "📊 Requests left today · " + " · ".join(budgets)
+
+class AIError(Exception):
+    """An AI request failed; the message is short enough to show to the user."""
+
+def _is_quota_error(message):
+    """Whether an AI error message says the model's quota or rate limit is used up."""
+    return "quota" in message.lower() or "429" in message or "RESOURCE_EXHAUSTED" in message
+
+def _selected_model(settings):
+    """The model of the provider in settings."""
+    return settings['selected_gemini_model'] if settings['api_provider'] == "Google Gemini (Free)" else settings['selected_nvidia_model']
+
+def ai_routes(settings):
+    """Settings to try in turn: the selected model, then the other Gemini models best first (ending with Gemma) and NVIDIA."""
+    routes = [settings]
+    if settings['api_provider'] == "Google Gemini (Free)":
+        routes += [dict(settings, selected_gemini_model=model)
+                   for model in GEMINI_MODELS.values() if model != settings['selected_gemini_model']]
+        if settings['nvidia_api_key']:
+            routes.append(dict(settings, api_provider="NVIDIA"))
+    return routes
+
+def generate_ai_stream(prompt, max_tokens=500, temperature=0.9, timeout=60, settings=None, bypass_cache=False, reserve=0):
+    """Yield the reply of the selected AI provider (Gemini or NVIDIA) piece by piece as it arrives.
+    
+    Raises AIError when the request fails or the reply is empty. Background
+    jobs pass settings from ai_settings(), since they can't read session state.
+    With the completion cache on, a cached reply is yielded whole instead;
+    bypass_cache asks the provider anyway and caches the fresh reply.
+    
+    Once the selected model's daily quota is used up, requests fall back
+    along ai_routes(); reserve keeps that many requests of every budget for
+    more important calls.
+    """
+    settings = settings or ai_settings()
+    cache = get_ai_cache() if settings['ai_cache'] else None
+    quota = get_quota_tracker()
+    for route in ai_routes(settings):
+        model = _selected_model(route)
+        key = completion_key(route['api_provider'], model, prompt, temperature, max_tokens)
+        cached = cache.get(key) if cache and not bypass_cache else None
+        if cached is not None:
+            yield cached
+            return
+        if not quota.has_budget(model, reserve):
+            continue
+        
+        quota.take(model)
+        parts = []
+        try:
+            for text in _provider_stream(prompt, max_tokens, temperature, timeout, route):
+                parts.append(text)
+                yield text
+        except AIError as e:
+            if parts or not _is_quota_error(str(e)):
+                raise
+            # The provider's count wins over ours: mark the model used up and try the next one
+            quota.exhaust(model)
+            continue
+        if cache:
+            cache.put(key, "".join(parts))
+        return
+    raise AIError("Daily AI quota used up")
+
+def _provider_stream(prompt, max_tokens, temperature, timeout, settings):
+    """Yield the reply of the provider in settings as it arrives; see generate_ai_stream."""
+    provider = settings['api_provider']
     
     if provider == "Google Gemini (Free)":
         if not GEMINI_AVAILABLE:
-            return None, "Google Gemini library not installed"
-        if not st.session_state.gemini_api_key:
-            return None, "No Gemini API key configured"
+            raise AIError("Google Gemini library not installed")
+        if not settings['gemini_api_key']:
+            raise AIError("No Gemini API key configured")
         
+        received = False
         try:
-            client = genai.Client(api_key=st.session_state.gemini_api_key)
-            response = client.models.generate_content(
-                model=st.session_state.selected_gemini_model,
+            _note_ai_request(provider, settings['gemini_api_key'])
+            client = get_gemini_client(settings['gemini_api_key'])
+            for chunk in client.models.generate_content_stream(
+                model=settings['selected_gemini_model'],
                 contents=prompt
-            )
-            if response and response.text:
-                return response.text, None
-            else:
-                return None, "Empty response from Gemini"
+            ):
+                if chunk.text:
+                    received = True
+                    yield chunk.text
         except Exception as e:
-            return None, f"Gemini error: {str(e)[:100]}"
+            raise AIError(f"Gemini error: {str(e)[:100]}")
+        if not received:
+            raise AIError("Empty response from Gemini")
     
     else:  # NVIDIA
-        if not st.session_state.nvidia_api_key:
-            return None, "No NVIDIA API key configured"
+        if not settings['nvidia_api_key']:
+            raise AIError("No NVIDIA API key configured")
         
+        import requests
+        received, reasoning = False, []
         try:
-            response = requests.post(
+            _note_ai_request(provider, settings['nvidia_api_key'])
+            response = get_http_session().post(
                 NVIDIA_API_URL,
                 headers={
-                    "Authorization": f"Bearer {st.session_state.nvidia_api_key}",
+                    "Authorization": f"Bearer {settings['nvidia_api_key']}",
                     "Content-Type": "application/json",
-                    "Accept": "application/json"
+                    "Accept": "text/event-stream"
                 },
                 json={
-                    "model": st.session_state.selected_nvidia_model,
+                    "model": settings['selected_nvidia_model'],
                     "messages": [{"role": "user", "content": prompt}],
                     "max_tokens": max_tokens,
                     "temperature": temperature,
-                    "stream": False
+                    "stream": True
                 },
-                timeout=timeout
+                timeout=timeout,
+                stream=True
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                message = result.get("choices", [{}])[0].get("message", {})
-                content = message.get("content") or message.get("reasoning_content") or ""
-                if content:
-                    return content, None
-                else:
-                    return None, "Empty response from NVIDIA"
-            else:
-                return None, f"NVIDIA API error: {response.status_code}"
+            with response:
+                if response.status_code != 200:
+                    raise AIError(f"NVIDIA API error: {response.status_code}")
+                # Server-sent events: one "data: {json chunk}" line per delta, then "data: [DONE]"
+                response.encoding = "utf-8"
+                for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    delta = (json.loads(data).get("choices") or [{}])[0].get("delta", {})
+                    if delta.get("content"):
+                        received = True
+                        yield delta["content"]
+                    elif delta.get("reasoning_content"):
+                        reasoning.append(delta["reasoning_content"])
+        except AIError:
+            raise
         except requests.exceptions.Timeout:
-            return None, "Request timed out"
+            raise AIError("Request timed out")
         except Exception as e:
-            return None, f"NVIDIA error: {str(e)[:100]}"
+            raise AIError(f"NVIDIA error: {str(e)[:100]}")
+        if not received:
+            # Reasoning models may only fill reasoning_content; fall back to it like the full reply did
+            if not reasoning:
+                raise AIError("Empty response from NVIDIA")
+            yield "".join(reasoning)
 
-def generate_roasts(round_num):
-    """Generate roasts for players based on their full game history using AI."""
-    if not st.session_state.enable_roasts or not st.session_state.api_verified:
-        return None
-    
-    # Build comprehensive game history for each player
-    player_histories = []
-    totals = get_total_scores()
-    sorted_by_score = sorted(totals.items(), key=lambda x: x[1], reverse=True)
-    
-    for player in st.session_state.players:
-        # Current standing
-        rank = [i+1 for i, (p, s) in enumerate(sorted_by_score) if p == player][0]
-        total_score = totals[player]
-        
-        # Round-by-round history
-        round_details = []
-        total_correct = 0
-        total_over = 0
-        total_under = 0
-        biggest_fail = 0
-        
-        for r in range(1, round_num + 1):
-            if r in st.session_state.game_data and player in st.session_state.game_data[r]:
-                data = st.session_state.game_data[r].get(player, EMPTY_ROUND_DATA)
-                bid = data['bid']
-                tricks = data['tricks']
-                if bid is not None and tricks is not None:
-                    diff = tricks - bid
-                    score = calculate_score(bid, tricks)
-                    round_details.append(f"R{r}: bid {bid}, got {tricks}, {'✓' if diff == 0 else f'off by {abs(diff)}'} ({score:+d} pts)")
-                    
-                    if diff == 0:
-                        total_correct += 1
-                    elif diff > 0:
-                        total_over += 1
-                    else:
-                        total_under += 1
-                    
-                    if abs(diff) > biggest_fail:
-                        biggest_fail = abs(diff)
-        
-        # Build player summary
-        history = f"""{player} (Rank #{rank}, {total_score} pts total):
-  - Correct bids: {total_correct}/{round_num} rounds
-  - Overbid: {total_under}x, Underbid: {total_over}x
-  - Biggest miss: {biggest_fail} tricks off
-  - Round history: {'; '.join(round_details[-5:])}"""  # Last 5 rounds for context
-        
-        player_histories.append(history)
+def generate_ai_content(prompt, max_tokens=500, temperature=0.9, timeout=60, settings=None):
+    """Generate content using the selected AI provider; returns (content, error)."""
+    try:
+        return "".join(generate_ai_stream(prompt, max_tokens, temperature, timeout, settings)), None
+    except AIError as e:
+        return None, str(e)
+
+class TextStream:
+    """Text a background job writes piece by piece while the UI reads it."""
     
-    # Current round performance
-    current_performances = []
-    for player in st.session_state.players:
-        data = st.session_state.game_data[round_num].get(player, EMPTY_ROUND_DATA)
-        bid = data['bid'] or 0
-        tricks = data['tricks'] or 0
-        diff = tricks - bid
-        
-        if diff == 0:
-            status = f"{player} nailed their bid of {bid} (smug success)"
-        elif diff > 0:
-            status = f"{player} bid {bid} but got {tricks} (overachiever by {diff})"
-        else:
-            status = f"{player} bid {bid} but only got {tricks} (failed by {abs(diff)})"
-        current_performances.append(status)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._parts = []
     
-    # Standings summary
-    standings = ", ".join([f"#{i+1} {p} ({s} pts)" for i, (p, s) in enumerate(sorted_by_score)])
+    def write(self, text):
+        with self._lock:
+            self._parts.append(text)
     
-    prompt = f"""You are a witty, sarcastic commentator for a Wizard card game. Round {round_num} of {st.session_state.max_rounds} just ended.
+    def text(self):
+        with self._lock:
+            return "".join(self._parts)
 
-CURRENT STANDINGS: {standings}
+@st.cache_resource
+def get_ai_executor():
+    """Process-wide pool that runs roast and summary requests off the script thread."""
+    return ThreadPoolExecutor(max_workers=AI_WORKERS, thread_name_prefix="wizard-ai")
 
-FULL PLAYER HISTORIES:
-{chr(10).join(player_histories)}
+def _roast_job(players, prompt, settings, bypass_cache, stream):
+    """Background job: stream roasts from the LLM into stream, then split them per player."""
+    try:
+        for text in generate_ai_stream(prompt, max_tokens=500, temperature=0.9, timeout=60,
+                                       settings=settings, bypass_cache=bypass_cache, reserve=SUMMARY_RESERVE):
+            stream.write(text)
+    except AIError as e:
+        return {p: f"[Error]: {e}" for p in players}
+    
+    return parse_roasts(players, stream.text())
 
-THIS ROUND'S PERFORMANCES:
-{chr(10).join(current_performances)}
+def _summary_job(prompt, settings, bypass_cache, stream):
+    """Background job: stream the end-game summary from the LLM into stream."""
+    try:
+        for text in generate_ai_stream(prompt, max_tokens=800, temperature=0.9, timeout=120,
+                                       settings=settings, bypass_cache=bypass_cache):
+            stream.write(text)
+    except AIError:
+        return None
+    return stream.text()
 
-Write a brief, savage roast for EACH player individually (1-2 sentences each). Use their FULL GAME HISTORY to make it personal - reference their patterns, streaks, choking moments, or consistent failures. Format as:
-PLAYER_NAME: [roast]
+def submit_ai_job(key, job, *args):
+    """Run job(*args, stream) on the AI executor as ai_jobs[key], its text streaming into a TextStream."""
+    stream = TextStream()
+    st.session_state.ai_jobs[key] = (get_ai_executor().submit(job, *args, stream), stream)
 
-Be savage but friendly. Reference specific stats, patterns, or memorable moments from their history. Keep each roast short and punchy."""
+def submit_roasts(key, round_num, bypass_cache=False):
+    """Start generating roasts for players based on their full game history, as ai_jobs[key]."""
+    engine = st.session_state.engine
+    prompt = build_roast_prompt(engine, round_num)
+    submit_ai_job(key, _roast_job, list(engine.players), prompt, ai_settings(), bypass_cache)
 
-    raw_content, error = generate_ai_content(prompt, max_tokens=500, temperature=0.9, timeout=60)
-    
-    if error or not raw_content:
-        return {p: f"[Error]: {error or 'Empty response'}" for p in st.session_state.players}
-    
-    # Parse individual roasts from response
-    roasts = {}
-    for player in st.session_state.players:
-        # Look for "PLAYER_NAME:" pattern
-        pattern = rf"{re.escape(player)}[:\s]+(.+?)(?=\n[A-Z]|$)"
-        match = re.search(pattern, raw_content, re.IGNORECASE | re.DOTALL)
-        if match:
-            roast_text = match.group(1).strip()
-            # Clean up the roast text
-            roast_text = roast_text.strip('"').strip()
-            roasts[player] = roast_text
+def collect_ai_jobs():
+    """Move finished background roasts and summaries into session state."""
+    jobs = st.session_state.ai_jobs
+    for key, (job, _) in list(jobs.items()):
+        if not job.done():
+            continue
+        del jobs[key]
+        try:
+            result = job.result()
+        except Exception:
+            result = None
+        if key == "manual":
+            st.session_state.manual_roast = result or {p: "The AI is speechless..." for p in st.session_state.engine.players}
+        elif key == "summary":
+            st.session_state.game_summary = result or "The commentator lost their notes... but what a game that was!"
         else:
-            roasts[player] = "Even the AI couldn't find words for this performance..."
-    
-    return roasts
+            st.session_state.round_roasts[key] = result or "[No roast generated - API may have failed]"
+
+@st.fragment(run_every=AI_STREAM_REFRESH)
+def show_ai_stream(key, render):
+    """Render the text of a pending AI job with render(text) as it streams in; rerun the app once it's done."""
+    job = st.session_state.ai_jobs.get(key)
+    if job is None or job[0].done():
+        st.rerun(scope="app")
+    text = job[1].text()
+    render(f"{text} ▌" if text else "⏳ ...")
 
-def save_game(title=None, filename=None):
-    """Save the current game state to a text file."""
+@st.cache_resource
+def get_storage():
+    """Process-wide game storage (save files, or SQLite with WIZARD_STORAGE=sqlite)."""
+    return open_storage(save_dir=SAVE_DIR)
+
+def save_game(title=None, filename=None, wait=True):
+    """Save the current game state through the storage backend.
+    
+    The write happens on the background writer; with wait=False (autosave) the
+    UI doesn't wait for it and rapid saves of the same game are coalesced.
+    """
+    engine = st.session_state.engine
+    storage = get_storage()
     if filename is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        players_str = "_".join(st.session_state.players[:3])
-        filename = f"wizard_game_{players_str}_{timestamp}.txt"
+        filename = storage.new_key(engine.players, binary=st.session_state.binary_saves)
     
     if title is None:
-        title = f"Game: {', '.join(st.session_state.players)}"
+        title = f"Game: {', '.join(engine.players)}"
     
-    game_data_serializable = {
-        str(k): v for k, v in st.session_state.game_data.items()
-    }
-    
-    total_scores = get_total_scores()
     save_data = {
         "title": title,
-        "players": st.session_state.players,
-        "player_colors": st.session_state.player_colors,
-        "starting_dealer_index": st.session_state.starting_dealer_index,
-        "current_round": st.session_state.current_round,
-        "game_data": game_data_serializable,
-        "max_rounds": st.session_state.max_rounds,
-        "game_started": st.session_state.game_started,
+        **engine.to_save_data(),
         "saved_at": datetime.now().isoformat(),
-        "total_scores": total_scores
+        "total_scores": get_total_scores()
     }
-    
-    filepath = SAVE_DIR / filename
-    with open(filepath, 'w') as f:
-        f.write("=== WIZARD CARD GAME SAVE FILE ===\n")
-        f.write(f"Title: {title}\n")
-        f.write(f"Saved: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Players: {', '.join(st.session_state.players)}\n")
-        f.write(f"Round: {st.session_state.current_round} / {st.session_state.max_rounds}\n")
-        f.write(f"Scores: {total_scores}\n")
-        f.write("=" * 35 + "\n\n")
-        f.write("--- JSON DATA (DO NOT EDIT BELOW) ---\n")
-        f.write(json.dumps(save_data, indent=2))
+    players = list(engine.players)
+    history = engine.round_history(engine.played_rounds())
+    bid_index = get_bid_index()
+    storage.save(filename, save_data, on_saved=lambda: bid_index.index_game(filename, players, history), wait=wait)
     
     st.session_state.current_save_file = filename
     return filename
 
 def load_game(filename):
-    """Load a game state from a text file."""
-    filepath = SAVE_DIR / filename
-    with open(filepath, 'r') as f:
-        content = f.read()
-    
-    json_marker = "--- JSON DATA (DO NOT EDIT BELOW) ---\n"
-    json_start = content.find(json_marker) + len(json_marker)
-    json_data = content[json_start:]
-    
-    save_data = json.loads(json_data)
-    
-    st.session_state.players = save_data["players"]
-    st.session_state.player_colors = save_data.get("player_colors", {})
-    st.session_state.starting_dealer_index = save_data.get("starting_dealer_index", 0)
-    st.session_state.current_round = save_data["current_round"]
-    st.session_state.game_data = {
-        int(k): v for k, v in save_data["game_data"].items()
-    }
-    st.session_state.max_rounds = save_data["max_rounds"]
-    st.session_state.game_started = save_data["game_started"]
+    """Load a saved game state."""
+    save_data = get_storage().load(filename)
+    st.session_state.engine = GameEngine.from_save_data(save_data)
     st.session_state.current_save_file = filename
 
-def get_saved_games():
-    """Get list of saved game files."""
-    saved_games = []
-    for filepath in SAVE_DIR.glob("wizard_game_*.txt"):
-        try:
-            with open(filepath, 'r') as f:
-                content = f.read()
-            
-            # Parse JSON data for title
-            json_marker = "--- JSON DATA (DO NOT EDIT BELOW) ---\n"
-            json_start = content.find(json_marker) + len(json_marker)
-            json_data = content[json_start:]
-            save_data = json.loads(json_data)
-            title = save_data.get("title", "Untitled Game")
-            
-            # Parse header lines
-            lines = content.split("\n")
-            saved_at = lines[2].replace("Saved: ", "").strip() if len(lines) > 2 else "Unknown"
-            players = lines[3].replace("Players: ", "").strip() if len(lines) > 3 else "Unknown"
-            round_info = lines[4].replace("Round: ", "").strip() if len(lines) > 4 else "Unknown"
-            
-            saved_games.append({
-                "filename": filepath.name,
-                "title": title,
-                "saved_at": saved_at,
-                "players": players,
-                "round": round_info
-            })
-        except Exception:
-            pass
-    saved_games.sort(key=lambda x: x["saved_at"], reverse=True)
-    return saved_games
+def get_saved_games(limit=SAVES_PAGE_SIZE):
+    """Get the most recently saved games and how many saves exist in total."""
+    return get_storage().recent(limit)
 
 def update_save_title(filename, new_title):
     """Update the title of a saved game."""
-    filepath = SAVE_DIR / filename
-    with open(filepath, 'r') as f:
-        content = f.read()
-    
-    # Extract JSON data
-    json_marker = "--- JSON DATA (DO NOT EDIT BELOW) ---\n"
-    json_start = content.find(json_marker) + len(json_marker)
-    json_data = content[json_start:]
-    save_data = json.loads(json_data)
-    
-    # Update title
-    save_data["title"] = new_title
-    
-    # Rewrite file with new title
-    with open(filepath, 'w') as f:
-        f.write("=== WIZARD CARD GAME SAVE FILE ===\n")
-        f.write(f"Title: {new_title}\n")
-        f.write(f"Saved: {save_data['saved_at'].replace('T', ' ')[:19]}\n")
-        f.write(f"Players: {', '.join(save_data['players'])}\n")
-        f.write(f"Round: {save_data['current_round']} / {save_data['max_rounds']}\n")
-        f.write(f"Scores: {save_data['total_scores']}\n")
-        f.write("=" * 35 + "\n\n")
-        f.write("--- JSON DATA (DO NOT EDIT BELOW) ---\n")
-        f.write(json.dumps(save_data, indent=2))
+    get_storage().update_title(filename, new_title)
+
+def rename_saved_player(filename, old_name, new_name):
+    """Rename a player in a saved game (and in the running game if it is that save)."""
+    get_storage().rename_player(filename, old_name, new_name)
+    get_bid_index().rename_player(filename, old_name, new_name)
+    if filename == st.session_state.current_save_file:
+        st.session_state.engine.rename_player(old_name, new_name)
 
 def delete_save(filename):
-    """Delete a save file."""
-    filepath = SAVE_DIR / filename
-    if filepath.exists():
-        filepath.unlink()
+    """Delete a saved game."""
+    get_storage().delete(filename)
+    get_bid_index().remove_game(filename)
 
 def _clear_game_state():
     """Clear game-specific state (used by reset and replay)."""
-    st.session_state.current_round = 1
-    st.session_state.game_data = {}
+    st.session_state.engine.clear()
     st.session_state.current_save_file = None
-    st.session_state.game_finished = False
     st.session_state.shot_players = []
     st.session_state.round_roasts = {}
     st.session_state.manual_roast = {}
     st.session_state.game_summary = None
     st.session_state.game_stats = None
+    st.session_state.ai_jobs = {}
+    st.session_state.speculative_roast = None
     st.session_state.active_tab = 0
 
 def reset_game():
     """Reset the game to initial state."""
     _clear_game_state()
-    st.session_state.players = []
-    st.session_state.player_colors = {}
-    st.session_state.starting_dealer_index = 0
-    st.session_state.game_started = False
-    st.session_state.max_rounds = 0
+    st.session_state.engine.reset()
 
 def replay_game_with_same_players():
     """Start a new game with the same players."""
-    players = st.session_state.players.copy()
-    colors = st.session_state.player_colors.copy()
-    starting_dealer = st.session_state.starting_dealer_index
-    
     _clear_game_state()
-    st.session_state.players = players
-    st.session_state.player_colors = colors
-    st.session_state.starting_dealer_index = starting_dealer
     _start_game()
 
 def _start_game():
     """Common logic to start a new game."""
-    st.session_state.game_started = True
-    st.session_state.max_rounds = 60 // len(st.session_state.players)
-    init_round_data(1)
+    st.session_state.engine.start()
 
 def rename_player(old_name, new_name):
     """Rename a player and update all references."""
-    if old_name == new_name or new_name in st.session_state.players:
-        return False
-    
-    # Update players list
-    idx = st.session_state.players.index(old_name)
-    st.session_state.players[idx] = new_name
-    
-    # Update player colors
-    if old_name in st.session_state.player_colors:
-        st.session_state.player_colors[new_name] = st.session_state.player_colors.pop(old_name)
-    
-    # Update game data
-    for round_num in st.session_state.game_data:
-        if old_name in st.session_state.game_data[round_num]:
-            st.session_state.game_data[round_num][new_name] = st.session_state.game_data[round_num].pop(old_name)
-    
-    return True
+    return st.session_state.engine.rename_player(old_name, new_name)
+
+engine = st.session_state.engine
+collect_ai_jobs()
 
 # Sidebar for game setup
 with st.sidebar:
@@ -1126,14 +1189,12 @@ with st.sidebar:
     st.caption("v0.5")
     
     # Theme toggle
-    dark_mode = st.toggle("🌙", value=st.session_state.dark_mode, help="Dark Mode")
-    if dark_mode != st.session_state.dark_mode:
-        st.session_state.dark_mode = dark_mode
-        st.rerun()
+    # Bound to session state, so the new value is already set when the script reruns
+    st.toggle("🌙", key="dark_mode", help="Dark Mode")
     
     st.markdown("---")
     
-    if not st.session_state.game_started:
+    if not engine.game_started:
         st.subheader("Add Players")
         
         # Use a form so Enter key submits
@@ -1141,18 +1202,17 @@ with st.sidebar:
             new_player = st.text_input("Player Name")
             submit = st.form_submit_button("Add Player", type="primary")
             if submit and new_player:
-                if new_player not in st.session_state.players:
-                    st.session_state.players.append(new_player)
+                if engine.add_player(new_player):
                     st.rerun()
                 else:
                     st.warning("Player already exists!")
         
-        if st.session_state.players:
+        if engine.players:
             st.write("**Current Players:**")
-            for i, player in enumerate(st.session_state.players):
+            for i, player in enumerate(engine.players):
                 # Assign default color if not set
-                if player not in st.session_state.player_colors:
-                    st.session_state.player_colors[player] = DEFAULT_COLORS[i % len(DEFAULT_COLORS)]
+                if player not in engine.player_colors:
+                    engine.player_colors[player] = DEFAULT_COLORS[i % len(DEFAULT_COLORS)]
                 
                 col1, col2, col3, col4, col5 = st.columns([2.5, 0.8, 0.8, 0.8, 0.8])
                 
@@ -1160,7 +1220,7 @@ with st.sidebar:
                 with col1:
                     new_name = st.text_input(f"Name {i+1}", value=player, key=f"edit_name_{i}", label_visibility="collapsed")
                     if new_name and new_name != player:
-                        if new_name not in st.session_state.players:
+                        if new_name not in engine.players:
                             rename_player(player, new_name)
                             st.rerun()
                         else:
@@ -1168,52 +1228,48 @@ with st.sidebar:
                 
                 # Color picker
                 with col2:
-                    new_color = st.color_picker("", st.session_state.player_colors[player], key=f"color_{player}", label_visibility="collapsed")
-                    if new_color != st.session_state.player_colors[player]:
-                        st.session_state.player_colors[player] = new_color
+                    new_color = st.color_picker("", engine.player_colors[player], key=f"color_{player}", label_visibility="collapsed")
+                    if new_color != engine.player_colors[player]:
+                        engine.player_colors[player] = new_color
                 
                 # Move up button
                 with col3:
                     if i > 0:
                         if st.button("▲", key=f"up_{player}"):
-                            st.session_state.players[i], st.session_state.players[i-1] = \
-                                st.session_state.players[i-1], st.session_state.players[i]
+                            engine.move_player(i, i - 1)
                             st.rerun()
                 
                 # Move down button
                 with col4:
-                    if i < len(st.session_state.players) - 1:
+                    if i < len(engine.players) - 1:
                         if st.button("▼", key=f"down_{player}"):
-                            st.session_state.players[i], st.session_state.players[i+1] = \
-                                st.session_state.players[i+1], st.session_state.players[i]
+                            engine.move_player(i, i + 1)
                             st.rerun()
                 
                 # Remove button
                 with col5:
                     if st.button("✕", key=f"remove_{player}"):
-                        st.session_state.players.remove(player)
-                        if player in st.session_state.player_colors:
-                            del st.session_state.player_colors[player]
+                        engine.remove_player(player)
                         st.rerun()
         
         st.markdown("---")
         
-        if len(st.session_state.players) >= 3:
+        if len(engine.players) >= 3:
             # Calculate max rounds based on number of players
-            num_players = len(st.session_state.players)
-            calculated_max_rounds = 60 // num_players
+            num_players = len(engine.players)
+            calculated_max_rounds = max_rounds_for(num_players)
             st.info(f"With {num_players} players, max rounds = {calculated_max_rounds}")
             
             # Select starting dealer
             st.markdown("**Select First Dealer:**")
-            dealer_options = st.session_state.players
+            dealer_options = engine.players
             selected_dealer = st.selectbox(
                 "First dealer", 
                 dealer_options, 
-                index=st.session_state.starting_dealer_index,
+                index=engine.starting_dealer_index,
                 label_visibility="collapsed"
             )
-            st.session_state.starting_dealer_index = dealer_options.index(selected_dealer)
+            engine.starting_dealer_index = dealer_options.index(selected_dealer)
             
             if st.button("🎮 Start Game", type="primary"):
                 _clear_game_state()
@@ -1224,43 +1280,43 @@ with st.sidebar:
     
     else:
         st.success(f"Game in progress!")
-        st.write(f"**Current Round:** {st.session_state.current_round} / {st.session_state.max_rounds}")
+        st.write(f"**Current Round:** {engine.current_round} / {engine.max_rounds}")
         
         # Player management during game
         st.markdown("---")
         with st.expander("👥 Edit Players & Colors", expanded=False):
-            for i, player in enumerate(st.session_state.players):
+            for i, player in enumerate(engine.players):
                 col1, col2 = st.columns([3, 1])
                 with col1:
                     new_name = st.text_input(f"Player {i+1}", value=player, key=f"game_edit_name_{i}", label_visibility="collapsed")
                     if new_name and new_name != player:
-                        if new_name not in st.session_state.players:
+                        if new_name not in engine.players:
                             rename_player(player, new_name)
                             st.rerun()
                         else:
                             st.toast("Player name already exists!")
                 with col2:
-                    new_color = st.color_picker("", st.session_state.player_colors.get(player, "#808080"), key=f"game_color_{i}", label_visibility="collapsed")
-                    if new_color != st.session_state.player_colors.get(player):
-                        st.session_state.player_colors[player] = new_color
+                    new_color = st.color_picker("", engine.player_colors.get(player, "#808080"), key=f"game_color_{i}", label_visibility="collapsed")
+                    if new_color != engine.player_colors.get(player):
+                        engine.player_colors[player] = new_color
         
         st.markdown("---")
         st.subheader("💾 Save Game")
         
         # Get current title from existing save or use default
-        default_title = f"Game: {', '.join(st.session_state.players)}"
+        default_title = f"Game: {', '.join(engine.players)}"
         if st.session_state.current_save_file:
             # Try to get existing title from save file
             try:
-                saved_games = get_saved_games()
-                for game in saved_games:
-                    if game['filename'] == st.session_state.current_save_file:
-                        default_title = game.get('title', default_title)
-                        break
+                game = get_storage().get(st.session_state.current_save_file)
+                if game:
+                    default_title = game.get('title', default_title)
             except:
                 pass
         
         save_title = st.text_input("Game Title", value=default_title, key="save_title_input")
+        if isinstance(get_storage(), FileStorage):
+            st.checkbox("📦 Compact binary file", key="binary_saves", help="New save files use the compact .wzb format")
         
         col1, col2 = st.columns(2)
         with col1:
@@ -1277,7 +1333,16 @@ with st.sidebar:
                 st.success(f"Saved as new file!")
         
         if st.session_state.current_save_file:
-            st.caption(f"Current file: {st.session_state.current_save_file}")
+            save_status = get_storage().status(st.session_state.current_save_file)
+            if save_status['pending']:
+                status_text = "⏳ saving..."
+            elif save_status['error']:
+                status_text = f"⚠️ save failed: {save_status['error']}"
+            elif save_status['saved_at']:
+                status_text = f"✅ saved {save_status['saved_at'].strftime('%H:%M:%S')}"
+            else:
+                status_text = ""
+            st.caption(f"Current file: {st.session_state.current_save_file} {status_text}".rstrip())
         
         st.markdown("---")
         col_new, col_cancel = st.columns(2)
@@ -1289,8 +1354,8 @@ with st.sidebar:
             if st.button("❌ Cancel Game", type="primary", use_container_width=True):
                 # Save the current game first
                 filename = st.session_state.current_save_file if st.session_state.current_save_file else None
-                title = f"Game: {', '.join(st.session_state.players)}"
-                save_game(title=title, filename=filename)
+                title = f"Game: {', '.join(engine.players)}"
+                save_game(title=title, filename=filename, wait=False)
                 st.toast("Game saved!")
                 # Reset to fresh state
                 reset_game()
@@ -1343,11 +1408,16 @@ with st.sidebar:
                                 st.toast("API key saved!")
                     
                     if api_key:
+                        # Verified recently, in this session or another: no need for another test call
+                        if not st.session_state.api_verified:
+                            result = recent_check("Google Gemini (Free)", api_key, st.session_state.selected_gemini_model)
+                            st.session_state.api_verified = bool(result and result[1])
+                        
                         col1, col2 = st.columns([2, 1])
                         with col1:
                             if st.button("🔌 Verify API Key"):
                                 with st.spinner("Verifying..."):
-                                    success, message = verify_gemini_api(api_key)
+                                    success, message = verify_api("Google Gemini (Free)", api_key, st.session_state.selected_gemini_model)
                                     if success:
                                         st.session_state.api_verified = True
                                         st.success(message)
@@ -1369,8 +1439,15 @@ with st.sidebar:
                             "AI Model",
                             model_names,
                             index=current_index,
+                            format_func=lambda model_name: model_name + model_status("Google Gemini (Free)", api_key, GEMINI_MODELS[model_name]),
                             help="Gemini 2.5 Flash is fast and free"
                         )
+                        if st.session_state.model_probe:
+                            watch_model_probe()
+                        elif st.button("📡 Check All Models", key="probe_gemini_models",
+                                       help="Check which models answer your key and how fast, without spending any quota"):
+                            probe_models("Google Gemini (Free)", api_key)
+                            st.rerun()
                         if GEMINI_MODELS[selected_name] != st.session_state.selected_gemini_model:
                             st.session_state.selected_gemini_model = GEMINI_MODELS[selected_name]
                             st.session_state.api_verified = False
@@ -1404,11 +1481,16 @@ with st.sidebar:
                             st.toast("API key saved!")
                 
                 if api_key:
+                    # Verified recently, in this session or another: no need for another test call
+                    if not st.session_state.api_verified:
+                        result = recent_check("NVIDIA", api_key, st.session_state.selected_nvidia_model)
+                        st.session_state.api_verified = bool(result and result[1])
+                    
                     col1, col2 = st.columns([2, 1])
                     with col1:
                         if st.button("🔌 Verify API Key"):
                             with st.spinner("Verifying..."):
-                                success, message = verify_nvidia_api(api_key)
+                                success, message = verify_api("NVIDIA", api_key, st.session_state.selected_nvidia_model)
                                 if success:
                                     st.session_state.api_verified = True
                                     st.success(message)
@@ -1430,8 +1512,15 @@ with st.sidebar:
                         "AI Model",
                         model_names,
                         index=current_index,
+                        format_func=lambda model_name: model_name + model_status("NVIDIA", api_key, NVIDIA_MODELS[model_name]),
                         help="Llama models are faster, DeepSeek-R1 is more creative but slower"
                     )
+                    if st.session_state.model_probe:
+                        watch_model_probe()
+                    elif st.button("📡 Check All Models", key="probe_nvidia_models",
+                                   help="Check which models answer your key and how fast, without spending any quota"):
+                        probe_models("NVIDIA", api_key)
+                        st.rerun()
                     if NVIDIA_MODELS[selected_name] != st.session_state.selected_nvidia_model:
                         st.session_state.selected_nvidia_model = NVIDIA_MODELS[selected_name]
                         st.session_state.api_verified = False
@@ -1439,13 +1528,22 @@ with st.sidebar:
                 else:
                     st.caption("⚠️ Enter your NVIDIA API key")
                     st.caption("Get one at: build.nvidia.com")
-    
+
+            st.session_state.ai_cache = st.toggle(
+                "Reuse earlier replies", value=st.session_state.ai_cache,
+                help="Answer repeated roast and summary requests for an unchanged game from a local cache, saving API quota. The regenerate buttons always ask the AI again."
+            )
+            # Local estimate; once a model runs out, requests fall back to the next one with budget left
+            budget = quota_caption(st.session_state.api_provider)
+            if budget:
+                st.caption(budget)
+
     # Load game section (always visible in sidebar)
     st.markdown("---")
     st.subheader("📂 Load Game")
-    saved_games = get_saved_games()
+    saved_games, total_saves = get_saved_games(st.session_state.saves_shown)
     if saved_games:
-        for game in saved_games[:5]:  # Show last 5 saves
+        for game in saved_games:
             with st.expander(f"📁 {game.get('title', 'Untitled')[:25]}"):
                 st.write(f"**Title:** {game.get('title', 'Untitled')}")
                 st.write(f"**Saved:** {game['saved_at']}")
@@ -1459,6 +1557,20 @@ with st.sidebar:
                         update_save_title(game['filename'], new_title)
                         st.rerun()
                 
+                # Rename a player
+                game_players = game['players'].split(", ")
+                col_from, col_to = st.columns(2)
+                rename_from = col_from.selectbox("Rename Player", game_players, key=f"rename_from_{game['filename']}")
+                rename_to = col_to.text_input("New Name", key=f"rename_to_{game['filename']}").strip()
+                if rename_to and rename_to != rename_from:
+                    if st.button("✏️ Rename", key=f"rename_{game['filename']}"):
+                        if rename_to in game_players:
+                            st.toast("Player name already exists!")
+                        else:
+                            rename_saved_player(game['filename'], rename_from, rename_to)
+                            del st.session_state[f"rename_to_{game['filename']}"]
+                            st.rerun()
+                
                 col1, col2 = st.columns(2)
                 if col1.button("Load", key=f"load_{game['filename']}"):
                     load_game(game['filename'])
@@ -1466,11 +1578,16 @@ with st.sidebar:
                 if col2.button("🗑️", key=f"del_{game['filename']}"):
                     delete_save(game['filename'])
                     st.rerun()
+        
+        if total_saves > len(saved_games):
+            if st.button(f"Show more ({total_saves - len(saved_games)} older)", key="show_more_saves", use_container_width=True):
+                st.session_state.saves_shown += SAVES_PAGE_SIZE
+                st.rerun()
     else:
         st.caption("No saved games found.")
 
 # Main game area
-if not st.session_state.game_started:
+if not engine.game_started:
     st.info("👈 Add players and start the game using the sidebar!")
     
     # Show game rules
@@ -1499,15 +1616,13 @@ if not st.session_state.game_started:
 
 else:
     # Current round input
-    st.header(f"📍 Round {st.session_state.current_round} of {st.session_state.max_rounds}")
+    st.header(f"📍 Round {engine.current_round} of {engine.max_rounds}")
     
     # Calculate current dealer (rotates each round)
-    num_players = len(st.session_state.players)
-    current_dealer_index = (st.session_state.starting_dealer_index + st.session_state.current_round - 1) % num_players
-    current_dealer = st.session_state.players[current_dealer_index]
-    dealer_color = st.session_state.player_colors.get(current_dealer, "#808080")
+    current_dealer = engine.dealer()
+    dealer_color = engine.player_colors.get(current_dealer, "#808080")
     
-    st.markdown(f"*Each player has {st.session_state.current_round} card(s)* &nbsp;&nbsp;|&nbsp;&nbsp; "
+    st.markdown(f"*Each player has {engine.current_round} card(s)* &nbsp;&nbsp;|&nbsp;&nbsp; "
                 f"🃏 **Dealer:** <span style='color:{dealer_color}; font-weight:bold;'>{current_dealer}</span>", 
                 unsafe_allow_html=True)
     
@@ -1515,17 +1630,18 @@ else:
     if st.session_state.enable_roasts and st.session_state.api_verified:
         roast_col1, roast_col2 = st.columns([3, 1])
         with roast_col2:
-            if st.button("🔥 ROAST! 🔥", type="primary", use_container_width=True):
-                with st.spinner("Generating roasts..."):
-                    roasts = generate_roasts(st.session_state.current_round)
-                    if roasts:
-                        st.session_state.manual_roast = roasts
-                    else:
-                        st.session_state.manual_roast = {p: "The AI is speechless..." for p in st.session_state.players}
+            roasting = "manual" in st.session_state.ai_jobs
+            if st.button("🔥 ROAST! 🔥", type="primary", use_container_width=True, disabled=roasting):
+                submit_roasts("manual", engine.current_round)
                 st.rerun()
         
+        # Roasts still streaming in, shown as the raw reply until they're split per player
+        if roasting:
+            st.markdown("#### 🔥🎤 THE ROASTS 🎤🔥")
+            show_ai_stream("manual", st.markdown)
+        
         # Always show the roast box if there are roasts to display
-        if st.session_state.manual_roast:
+        elif st.session_state.manual_roast:
             st.markdown(
                 """
                 <div style='background: linear-gradient(135deg, #8B0000 0%, #FF4500 50%, #FFD700 100%); 
@@ -1542,10 +1658,10 @@ else:
             )
             
             # Display individual roasts in columns
-            roast_cols = st.columns(len(st.session_state.players))
+            roast_cols = st.columns(len(engine.players))
             theme = get_theme_colors()
-            for i, player in enumerate(st.session_state.players):
-                player_color = st.session_state.player_colors.get(player, "#FF6B6B")
+            for i, player in enumerate(engine.players):
+                player_color = engine.player_colors.get(player, "#FF6B6B")
                 roast_text = st.session_state.manual_roast.get(player, "No roast available")
                 with roast_cols[i]:
                     st.markdown(
@@ -1568,24 +1684,42 @@ else:
                         unsafe_allow_html=True
                     )
             
+            clear_col, again_col = st.columns(2)
             # Button to clear the roast
-            if st.button("❌ Clear Roasts", type="secondary"):
-                st.session_state.manual_roast = {}
-                st.rerun()
+            with clear_col:
+                if st.button("❌ Clear Roasts", type="secondary"):
+                    st.session_state.manual_roast = {}
+                    st.rerun()
+            # Fresh roasts for the same round, skipping the completion cache
+            with again_col:
+                if st.button("🔄 Regenerate Roasts", type="secondary"):
+                    st.session_state.manual_roast = {}
+                    submit_roasts("manual", engine.current_round, bypass_cache=True)
+                    st.rerun()
     
     # Always show current standings at top
     st.markdown("---")
     totals = get_total_scores()
     sorted_players = sorted(totals.items(), key=lambda x: x[1], reverse=True)
     
+    # Estimated chance of winning, once enough rounds are in the books for it to mean something
+    win_chances = {}
+    if not engine.game_finished and engine.counted_rounds() >= MIN_WIN_ROUNDS:
+        probabilities = get_win_probabilities(
+            engine.round_history(), tuple(totals[p] for p in engine.players),
+            engine.current_round, engine.max_rounds, get_bid_index().pooled_priors(engine.max_rounds)
+        )
+        win_chances = dict(zip(engine.players, probabilities))
+    
     cols = st.columns(len(sorted_players))
     medals = ["🥇", "🥈", "🥉"] + [""] * 10
     
     for i, (player, score) in enumerate(sorted_players):
-        player_color = st.session_state.player_colors.get(player, "#808080")
+        player_color = engine.player_colors.get(player, "#808080")
+        win_html = f"<br><span style='font-size:0.85em; opacity:0.8;'>🎲 {win_chances[player]:.0%} to win</span>" if player in win_chances else ""
         with cols[i]:
             st.markdown(f"<div style='text-align:center; padding:5px; border-radius:5px; border: 2px solid {player_color};'>"
-                       f"<b>{medals[i]} {player}</b><br><span style='font-size:1.2em;'>{score} pts</span></div>", 
+                       f"<b>{medals[i]} {player}</b><br><span style='font-size:1.2em;'>{score} pts</span>{win_html}</div>", 
                        unsafe_allow_html=True)
     st.markdown("---")
     
@@ -1615,21 +1749,17 @@ else:
     
     if st.session_state.active_tab == 0:  # Bids tab
         st.subheader("Enter Bids")
-        current_round = st.session_state.current_round
+        current_round = engine.current_round
         
         # Ensure current round exists in game data
-        if current_round not in st.session_state.game_data:
-            st.session_state.game_data[current_round] = {
-                player: EMPTY_ROUND_DATA.copy() 
-                for player in st.session_state.players
-            }
-        
-        cols = st.columns(len(st.session_state.players))
-        for i, player in enumerate(st.session_state.players):
+        init_round_data(current_round)
+        
+        cols = st.columns(len(engine.players))
+        for i, player in enumerate(engine.players):
             with cols[i]:
-                player_color = st.session_state.player_colors.get(player, "#808080")
+                player_color = engine.player_colors.get(player, "#808080")
                 st.markdown(f"<b>{player}</b>", unsafe_allow_html=True)
-                current_bid = st.session_state.game_data[current_round][player]['bid']
+                current_bid = engine.game_data[current_round][player]['bid']
                 bid = st.number_input(
                     f"Bid for {player}",
                     min_value=0,
@@ -1639,25 +1769,37 @@ else:
                     key=f"bid_{player}_{current_round}",
                     label_visibility="collapsed"
                 )
-                st.session_state.game_data[current_round][player]['bid'] = bid
+                engine.set_bid(current_round, player, bid)
         
         # Show total bids
-        total_bids = sum(
-            st.session_state.game_data[current_round][p]['bid'] or 0 
-            for p in st.session_state.players
-        )
+        total_bids = engine.total_bids(current_round)
         
         # Calculate what the dealer can't say
         cant_say = current_round - total_bids
-        num_players = len(st.session_state.players)
-        current_dealer_index = (st.session_state.starting_dealer_index + current_round - 1) % num_players
-        current_dealer = st.session_state.players[current_dealer_index]
-        dealer_color = st.session_state.player_colors.get(current_dealer, "#808080")
+        current_dealer = engine.dealer(current_round)
+        dealer_color = engine.player_colors.get(current_dealer, "#808080")
+        
+        # Bid assistant: expected score of each legal bid, from everyone's saved games
+        bid_index = get_bid_index()
+        dealer_bid = engine.get_round(current_round, current_dealer)['bid'] or 0
+        dealer_forbidden = current_round - (total_bids - dealer_bid)
+        hint_cols = st.columns(len(engine.players))
+        for i, player in enumerate(engine.players):
+            legal_bids = [b for b in range(current_round + 1) if player != current_dealer or b != dealer_forbidden]
+            expected = {b: v for b, v in bid_index.expected_scores(player, current_round, legal_bids).items() if v is not None}
+            with hint_cols[i]:
+                if expected:
+                    best = max(expected, key=expected.get)
+                    st.caption("📈 Expected: " + " · ".join(
+                        f"**{b}: {v:+.0f}**" if b == best else f"{b}: {v:+.0f}" for b, v in expected.items()
+                    ))
+                else:
+                    st.caption("📈 No bid history yet")
         
         # Check if all bids are entered (not None)
         all_bids_entered = all(
-            st.session_state.game_data[current_round][p]['bid'] is not None 
-            for p in st.session_state.players
+            engine.game_data[current_round][p]['bid'] is not None 
+            for p in engine.players
         )
         
         if total_bids == current_round:
@@ -1678,15 +1820,15 @@ else:
         st.markdown("---")
         nav_col1, nav_col2 = st.columns([1, 1])
         with nav_col1:
-            if st.session_state.current_round > 1:
+            if engine.current_round > 1:
                 if st.button("⬅️ Previous Round", key="prev_round_bids"):
-                    st.session_state.current_round -= 1
+                    engine.previous_round()
                     st.rerun()
         with nav_col2:
             # Check if any bids have been entered (at least one bid > 0, or it's round 1 where all 0s could be valid)
             any_nonzero_bid = any(
-                (st.session_state.game_data[current_round][p]['bid'] or 0) > 0
-                for p in st.session_state.players
+                (engine.game_data[current_round][p]['bid'] or 0) > 0
+                for p in engine.players
             )
             # For round 1, allow all zeros as valid bids; for other rounds require at least one non-zero
             bids_entered = any_nonzero_bid or current_round == 1
@@ -1704,19 +1846,23 @@ else:
                     st.caption("⚠️ Total bids cannot equal tricks available")
     
     elif st.session_state.active_tab == 1:  # Tricks tab
+        # The round's roast request follows this tab: make sure its connection is open
+        if st.session_state.enable_roasts and st.session_state.api_verified:
+            prewarm_ai_connection()
+        
         st.subheader("Enter Tricks Won")
-        current_round = st.session_state.current_round
+        current_round = engine.current_round
         
-        cols = st.columns(len(st.session_state.players))
-        for i, player in enumerate(st.session_state.players):
+        cols = st.columns(len(engine.players))
+        for i, player in enumerate(engine.players):
             with cols[i]:
                 # Show player's bid next to their name
-                player_bid = st.session_state.game_data[current_round][player]['bid'] or 0
-                player_color = st.session_state.player_colors.get(player, "#808080")
+                player_bid = engine.game_data[current_round][player]['bid'] or 0
+                player_color = engine.player_colors.get(player, "#808080")
                 st.markdown(f"<b>{player}</b> <span style='color:{player_color}; font-size:0.9em;'>(Bid: {player_bid})</span>", 
                            unsafe_allow_html=True)
                 
-                current_tricks = st.session_state.game_data[current_round][player]['tricks']
+                current_tricks = engine.game_data[current_round][player]['tricks']
                 tricks = st.number_input(
                     f"Tricks for {player}",
                     min_value=0,
@@ -1726,17 +1872,18 @@ else:
                     step=1,
                     key=f"tricks_{player}_{current_round}"
                 )
-                st.session_state.game_data[current_round][player]['tricks'] = tricks
+                engine.set_tricks(current_round, player, tricks)
         
         # Show total tricks
-        total_tricks = sum(
-            st.session_state.game_data[current_round][p]['tricks'] or 0 
-            for p in st.session_state.players
-        )
+        total_tricks = engine.total_tricks(current_round)
         if total_tricks != current_round:
             st.error(f"❌ Total tricks ({total_tricks}) ≠ tricks available ({current_round})")
         else:
             st.success(f"✅ Total tricks: {total_tricks} / {current_round}")
+            # Start the roast now so it's mostly done by the time Next Round (or Finish Game) is clicked
+            if st.session_state.enable_roasts and st.session_state.api_verified and not engine.game_finished:
+                if speculate_round_roast(current_round):
+                    watch_speculation(current_round)
         
         st.markdown("---")
         
@@ -1744,31 +1891,29 @@ else:
         col1, col2, col3 = st.columns([1, 2, 1])
         
         with col1:
-            if st.session_state.current_round > 1:
+            if engine.current_round > 1:
                 if st.button("⬅️ Previous Round", key="prev_round_tricks"):
-                    st.session_state.current_round -= 1
+                    engine.previous_round()
                     st.rerun()
         
         with col3:
-            if st.session_state.current_round < st.session_state.max_rounds:
+            if engine.current_round < engine.max_rounds:
                 # Only allow next round if all tricks are accounted for
                 tricks_valid = total_tricks == current_round
                 if tricks_valid:
                     if st.button("Next Round ➡️", type="primary", key="next_round_btn"):
-                        current_round_num = st.session_state.current_round
+                        current_round_num = engine.current_round
                         st.session_state.shot_players = get_shot_players(current_round_num)
                         
-                        # Generate roast for this round before moving on
+                        # Roast this round in the background while the next one starts
                         if st.session_state.enable_roasts:
-                            with st.spinner("🔥 Generating roasts... (this may take up to 90 seconds)"):
-                                generate_round_roast(current_round_num)
+                            generate_round_roast(current_round_num)
                         
-                        st.session_state.current_round += 1
+                        engine.advance_round()
                         st.session_state.pending_tab = 0
-                        init_round_data(st.session_state.current_round)
                         
                         # Auto-save game after each round
-                        save_game(filename=st.session_state.current_save_file) if st.session_state.current_save_file else save_game()
+                        save_game(filename=st.session_state.current_save_file, wait=False)
                         st.rerun()
                 else:
                     st.button("Next Round ➡️", type="primary", disabled=True, key="next_round_btn_disabled")
@@ -1776,35 +1921,41 @@ else:
             else:
                 # Final round - add Finish Game button
                 all_tricks_entered = all(
-                    st.session_state.game_data[st.session_state.current_round][p]['tricks'] is not None
-                    for p in st.session_state.players
+                    engine.game_data[engine.current_round][p]['tricks'] is not None
+                    for p in engine.players
                 )
                 all_bids_entered = all(
-                    st.session_state.game_data[st.session_state.current_round][p]['bid'] is not None
-                    for p in st.session_state.players
+                    engine.game_data[engine.current_round][p]['bid'] is not None
+                    for p in engine.players
                 )
                 
-                if all_tricks_entered and all_bids_entered and not st.session_state.get('game_finished', False):
+                if all_tricks_entered and all_bids_entered and not engine.game_finished:
                     if st.button("🏆 Finish Game", type="primary"):
-                        current_round = st.session_state.current_round
+                        current_round = engine.current_round
                         st.session_state.shot_players = get_shot_players(current_round)
                         
-                        # Generate roast for final round
+                        # Roast the final round in the background
                         if st.session_state.enable_roasts:
-                            with st.spinner("🔥 Generating final roasts... (this may take up to 90 seconds)"):
-                                generate_round_roast(current_round)
+                            generate_round_roast(current_round)
                         
-                        st.session_state.game_finished = True
+                        engine.finish()
+                        
+                        # Auto-save the finished game (compacts its journal)
+                        save_game(filename=st.session_state.current_save_file, wait=False)
                         st.session_state.show_celebration = True
                         st.session_state.pending_tab = 2
                         st.rerun()
-                elif st.session_state.get('game_finished', False):
+                elif engine.game_finished:
                     st.success("🏆 Game Complete! View results in Scoreboard tab.")
                 else:
                     st.info("Final Round! Enter all bids and tricks, then click Finish Game.")
     
+    # Round roasts still being generated, rendered as they stream in
+    for key in [k for k in st.session_state.ai_jobs if isinstance(k, int)]:
+        show_ai_stream(key, lambda text, key=key: render_roast_popup(key, text, get_theme_colors()))
+    
     # Handle shot popup and roast display
-    prev_round = st.session_state.current_round - 1
+    prev_round = engine.current_round - 1
     has_roast = prev_round in st.session_state.round_roasts
     
     if st.session_state.shot_players:
@@ -1814,7 +1965,7 @@ else:
             render_roast_popup(prev_round, st.session_state.round_roasts[prev_round], theme)
         
         shot_html = "".join(
-            f"<h2 style='color:{st.session_state.player_colors.get(p, '#FF0000')}; text-align:center;'>🍺 {p.upper()} NEEDS TO TAKE A SHOT! 🍺</h2>"
+            f"<h2 style='color:{engine.player_colors.get(p, '#FF0000')}; text-align:center;'>🍺 {p.upper()} NEEDS TO TAKE A SHOT! 🍺</h2>"
             for p in st.session_state.shot_players
         )
         
@@ -1844,37 +1995,35 @@ else:
         
         # Build scoreboard dataframe
         scoreboard_data = []
-        running_totals = {player: 0 for player in st.session_state.players}
         
         # Only show completed rounds (not current round unless game is finished)
-        game_finished = st.session_state.get('game_finished', False)
-        max_round_to_show = st.session_state.current_round if game_finished else st.session_state.current_round - 1
+        max_round_to_show = engine.counted_rounds()
+        running_totals = engine.running_totals(max_round_to_show)
         
         for round_num in range(1, max_round_to_show + 1):
-            if round_num in st.session_state.game_data:
+            if round_num in engine.game_data:
                 row = {'Round': round_num}
-                for player in st.session_state.players:
-                    data = st.session_state.game_data[round_num].get(player, EMPTY_ROUND_DATA)
+                for player in engine.players:
+                    data = engine.game_data[round_num].get(player, EMPTY_ROUND_DATA)
                     bid = data['bid']
                     tricks = data['tricks']
                     
                     if bid is not None and tricks is not None:
                         score = calculate_score(bid, tricks)
-                        running_totals[player] += score
                         hit = "✓" if bid == tricks else "✗"
                         row[f"{player} Bid"] = bid
                         row[f"{player} Tricks"] = tricks
                         row[f"{player} Score"] = f"{score:+d} {hit}"
-                        row[f"{player} Total"] = running_totals[player]
                     else:
                         row[f"{player} Bid"] = "-"
                         row[f"{player} Tricks"] = "-"
                         row[f"{player} Score"] = "-"
-                        row[f"{player} Total"] = running_totals[player]
+                    row[f"{player} Total"] = running_totals[player][round_num]
                 
                 scoreboard_data.append(row)
         
         if scoreboard_data:
+            import pandas as pd
             df = pd.DataFrame(scoreboard_data)
             # Use st.table for better theme compatibility (renders as HTML table)
             st.table(df)
@@ -1885,41 +2034,31 @@ else:
         st.markdown("---")
         st.subheader("📈 Score Progression")
         
-        # Build chart data - cumulative scores per round
+        # Build chart data - cumulative scores per round (same running totals as the table)
         chart_data = {"Round": [0]}  # Start at round 0 with 0 points
-        for player in st.session_state.players:
+        for player in engine.players:
             chart_data[player] = [0]
         
-        running_totals_chart = {player: 0 for player in st.session_state.players}
         for round_num in range(1, max_round_to_show + 1):
-            if round_num in st.session_state.game_data:
+            if round_num in engine.game_data:
                 # Check if this round is complete (all players have bid and tricks)
-                round_complete = all(
-                    st.session_state.game_data[round_num].get(player, {}).get('bid') is not None and
-                    st.session_state.game_data[round_num].get(player, {}).get('tricks') is not None
-                    for player in st.session_state.players
-                )
-                
-                if not round_complete:
+                if not engine.is_round_complete(round_num):
                     continue  # Skip incomplete rounds
                 
                 chart_data["Round"].append(round_num)
-                for player in st.session_state.players:
-                    data = st.session_state.game_data[round_num].get(player, EMPTY_ROUND_DATA)
-                    bid = data['bid']
-                    tricks = data['tricks']
-                    if bid is not None and tricks is not None:
-                        running_totals_chart[player] += calculate_score(bid, tricks)
-                    chart_data[player].append(running_totals_chart[player])
+                for player in engine.players:
+                    chart_data[player].append(running_totals[player][round_num])
         
         if len(chart_data["Round"]) > 1:
+            import altair as alt
+            import pandas as pd
             chart_df = pd.DataFrame(chart_data)
             chart_melted = chart_df.melt(id_vars=["Round"], var_name="Player", value_name="Score")
             
             color_scale = alt.Scale(
-                domain=st.session_state.players,
-                range=[st.session_state.player_colors.get(p, DEFAULT_COLORS[i % len(DEFAULT_COLORS)]) 
-                       for i, p in enumerate(st.session_state.players)]
+                domain=engine.players,
+                range=[engine.player_colors.get(p, DEFAULT_COLORS[i % len(DEFAULT_COLORS)]) 
+                       for i, p in enumerate(engine.players)]
             )
             
             theme = get_theme_colors()
@@ -1935,7 +2074,7 @@ else:
             st.info("Complete at least one round to see the score progression chart.")
         
         # Final results - only show when game is properly finished
-        if st.session_state.get('game_finished', False):
+        if engine.game_finished:
             if st.session_state.get('show_celebration', False):
                 st.balloons()
                 st.snow()
@@ -1949,12 +2088,12 @@ else:
             theme = get_theme_colors()
             
             winner = sorted_players[0][0]
-            winner_color = st.session_state.player_colors.get(winner, "#FFD700")
+            winner_color = engine.player_colors.get(winner, "#FFD700")
             medals = ["🥇", "🥈", "🥉"] + [""] * 10
             
             results_html = "".join(
-                f"<h1 style='color:{st.session_state.player_colors.get(p, '#FFFFFF')}; text-align:center; margin:10px 0;'>{medals[i]} {p} - {s} pts{' 👑' if i == 0 else ''}</h1>" if i == 0
-                else f"<h3 style='color:{st.session_state.player_colors.get(p, '#FFFFFF')}; text-align:center; margin:5px 0;'>{medals[i]} {p} - {s} pts</h3>"
+                f"<h1 style='color:{engine.player_colors.get(p, '#FFFFFF')}; text-align:center; margin:10px 0;'>{medals[i]} {p} - {s} pts{' 👑' if i == 0 else ''}</h1>" if i == 0
+                else f"<h3 style='color:{engine.player_colors.get(p, '#FFFFFF')}; text-align:center; margin:5px 0;'>{medals[i]} {p} - {s} pts</h3>"
                 for i, (p, s) in enumerate(sorted_players)
             )
             
@@ -1989,9 +2128,9 @@ else:
             st.subheader("📊 Game Statistics & Awards")
             
             # Player stat cards
-            stat_cols = st.columns(len(st.session_state.players))
+            stat_cols = st.columns(len(engine.players))
             for i, (player, score) in enumerate(sorted_players):
-                player_color = st.session_state.player_colors.get(player, "#808080")
+                player_color = engine.player_colors.get(player, "#808080")
                 a = analysis[player]
                 with stat_cols[i]:
                     st.markdown(
@@ -2037,14 +2176,14 @@ else:
             award_cols = st.columns(4)
             
             # Calculate awards
-            best_accuracy = max(st.session_state.players, key=lambda p: analysis[p]['accuracy'])
-            worst_accuracy = min(st.session_state.players, key=lambda p: analysis[p]['accuracy'])
-            biggest_comeback = max(st.session_state.players, key=lambda p: analysis[p]['rank_change'])
-            biggest_choke = min(st.session_state.players, key=lambda p: analysis[p]['rank_change'])
-            hottest_streak = max(st.session_state.players, key=lambda p: analysis[p]['max_hot_streak'])
-            coldest_streak = max(st.session_state.players, key=lambda p: analysis[p]['max_cold_streak'])
-            best_jumper = max(st.session_state.players, key=lambda p: analysis[p]['max_3round_jump'])
-            worst_dropper = min(st.session_state.players, key=lambda p: analysis[p]['max_3round_drop'])
+            best_accuracy = max(engine.players, key=lambda p: analysis[p]['accuracy'])
+            worst_accuracy = min(engine.players, key=lambda p: analysis[p]['accuracy'])
+            biggest_comeback = max(engine.players, key=lambda p: analysis[p]['rank_change'])
+            biggest_choke = min(engine.players, key=lambda p: analysis[p]['rank_change'])
+            hottest_streak = max(engine.players, key=lambda p: analysis[p]['max_hot_streak'])
+            coldest_streak = max(engine.players, key=lambda p: analysis[p]['max_cold_streak'])
+            best_jumper = max(engine.players, key=lambda p: analysis[p]['max_3round_jump'])
+            worst_dropper = min(engine.players, key=lambda p: analysis[p]['max_3round_drop'])
             
             awards = [
                 ("🎯 Sharpshooter", best_accuracy, f"{analysis[best_accuracy]['accuracy']}% accuracy"),
@@ -2060,7 +2199,7 @@ else:
             # Filter out None awards and display
             awards = [a for a in awards if a is not None]
             for i, (title, player, stat) in enumerate(awards):
-                player_color = st.session_state.player_colors.get(player, "#FFD700")
+                player_color = engine.player_colors.get(player, "#FFD700")
                 with award_cols[i % 4]:
                     st.markdown(
                         f"""
@@ -2081,20 +2220,19 @@ else:
                 st.markdown("---")
                 st.subheader("🎙️ The Commentator's Recap")
                 
-                if st.session_state.game_summary is None:
+                if "summary" in st.session_state.ai_jobs:
+                    st.info("🎙️ **The Commentator Says:**")
+                    show_ai_stream("summary", st.write)
+                elif st.session_state.game_summary is None:
                     if st.button("🎤 Generate Game Summary", type="primary", use_container_width=True):
-                        with st.spinner("The commentator is reviewing the footage..."):
-                            summary = generate_game_summary(stats)
-                            if summary:
-                                st.session_state.game_summary = summary
-                            else:
-                                st.session_state.game_summary = "The commentator lost their notes... but what a game that was!"
+                        generate_game_summary(stats)
                         st.rerun()
                 else:
                     st.info("🎙️ **The Commentator Says:**")
                     st.write(st.session_state.game_summary)
                     if st.button("🔄 Regenerate Summary"):
                         st.session_state.game_summary = None
+                        generate_game_summary(stats, bypass_cache=True)
                         st.rerun()
             
             # Play Again button
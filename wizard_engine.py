@@ -0,0 +1,454 @@
+"""Headless Wizard game engine.
+
+Holds the game state (players, bids/tricks per round, dealer rotation) and all
+scoring logic without depending on Streamlit, so it can be driven from tests,
+benchmarks and batch jobs as well as from the UI in wizard_counter.py.
+"""
+
+import numpy as np
+
+# Default player round data structure
+EMPTY_ROUND_DATA = {'bid': None, 'tricks': None}
+
+# Total cards in a Wizard deck (max rounds = DECK_SIZE // number of players)
+DECK_SIZE = 60
+
+
+def calculate_score(bid, tricks):
+    """Calculate score for a round based on bid and tricks won."""
+    if bid == tricks:
+        return 20 + (10 * tricks)
+    else:
+        return -10 * abs(bid - tricks)
+
+
+def max_rounds_for(num_players):
+    """Return the number of rounds played with the given number of players."""
+    return DECK_SIZE // num_players if num_players else 0
+
+
+def dealer_index_for(starting_dealer_index, round_num, num_players):
+    """Return the index of the dealer for a round (the deal rotates each round)."""
+    return (starting_dealer_index + round_num - 1) % num_players
+
+
+def _cell_score(data):
+    """Score of one {'bid', 'tricks'} entry, 0 while either value is missing."""
+    if data['bid'] is not None and data['tricks'] is not None:
+        return calculate_score(data['bid'], data['tricks'])
+    return 0
+
+
+class GameEngine:
+    """Game state for one Wizard game: players, a rounds x players bids/tricks matrix and scores.
+
+    Bids and tricks must be written through set_bid/set_tricks so the per-player
+    running totals (prefix sums over rounds) stay in sync with game_data.
+    """
+
+    def __init__(self, players=None, player_colors=None, starting_dealer_index=0):
+        self.players = list(players or [])
+        self.player_colors = dict(player_colors or {})
+        self.starting_dealer_index = starting_dealer_index
+        self.current_round = 1
+        self.max_rounds = 0
+        self.game_data = {}
+        self.game_started = False
+        self.game_finished = False
+        self._running = {}  # player -> [0, total after R1, total after R2, ...]
+        self._rebuild_totals()
+
+    # ----- Players -----
+
+    def add_player(self, name):
+        """Add a player; returns False if the name is already taken."""
+        if name in self.players:
+            return False
+        self.players.append(name)
+        self._rebuild_totals()
+        return True
+
+    def remove_player(self, name):
+        """Remove a player and their color."""
+        self.players.remove(name)
+        self.player_colors.pop(name, None)
+        self._rebuild_totals()
+
+    def move_player(self, index, new_index):
+        """Swap the player at index with the one at new_index (seating order)."""
+        self.players[index], self.players[new_index] = self.players[new_index], self.players[index]
+
+    def rename_player(self, old_name, new_name):
+        """Rename a player and update all references."""
+        if old_name == new_name or new_name in self.players:
+            return False
+
+        # Update players list
+        idx = self.players.index(old_name)
+        self.players[idx] = new_name
+
+        # Update player colors
+        if old_name in self.player_colors:
+            self.player_colors[new_name] = self.player_colors.pop(old_name)
+
+        # Update game data
+        for round_num in self.game_data:
+            if old_name in self.game_data[round_num]:
+                self.game_data[round_num][new_name] = self.game_data[round_num].pop(old_name)
+
+        # Update running totals
+        self._running[new_name] = self._running.pop(old_name)
+
+        return True
+
+    # ----- Game lifecycle -----
+
+    def start(self):
+        """Common logic to start a new game."""
+        self.game_started = True
+        self.max_rounds = max_rounds_for(len(self.players))
+        self.init_round_data(1)
+
+    def clear(self):
+        """Clear round data and progress but keep players and seating."""
+        self.current_round = 1
+        self.game_data = {}
+        self.game_finished = False
+        self._rebuild_totals()
+
+    def reset(self):
+        """Reset the engine to an empty, unstarted game."""
+        self.clear()
+        self.players = []
+        self.player_colors = {}
+        self.starting_dealer_index = 0
+        self.game_started = False
+        self.max_rounds = 0
+        self._running = {}
+
+    def advance_round(self):
+        """Move to the next round and initialize its data."""
+        self.current_round += 1
+        self.init_round_data(self.current_round)
+
+    def previous_round(self):
+        """Step back one round (for corrections)."""
+        if self.current_round > 1:
+            self.current_round -= 1
+
+    def finish(self):
+        """Mark the game as finished so the final round counts towards totals."""
+        self.game_finished = True
+
+    # ----- Rounds -----
+
+    def init_round_data(self, round_num):
+        """Initialize game data for a round if it doesn't exist."""
+        if round_num not in self.game_data:
+            self.game_data[round_num] = {
+                player: EMPTY_ROUND_DATA.copy() for player in self.players
+            }
+        self._extend_totals(round_num)
+
+    def get_round(self, round_num, player):
+        """Return the {'bid', 'tricks'} entry of a player for a round."""
+        return self.game_data.get(round_num, {}).get(player, EMPTY_ROUND_DATA)
+
+    def set_bid(self, round_num, player, bid):
+        """Record a player's bid for a round."""
+        self._set_cell(round_num, player, 'bid', bid)
+
+    def set_tricks(self, round_num, player, tricks):
+        """Record the tricks a player won in a round."""
+        self._set_cell(round_num, player, 'tricks', tricks)
+
+    def _set_cell(self, round_num, player, field, value):
+        """Write one bid/tricks value and patch the running totals from that round on."""
+        self.init_round_data(round_num)
+        data = self.game_data[round_num][player]
+        if data[field] == value:
+            return
+        old_score = _cell_score(data)
+        data[field] = value
+        delta = _cell_score(data) - old_score
+        if delta:
+            running = self._running[player]
+            for r in range(round_num, len(running)):
+                running[r] += delta
+
+    def total_bids(self, round_num):
+        """Sum of all bids entered for a round."""
+        return sum(self.get_round(round_num, p)['bid'] or 0 for p in self.players)
+
+    def total_tricks(self, round_num):
+        """Sum of all tricks entered for a round."""
+        return sum(self.get_round(round_num, p)['tricks'] or 0 for p in self.players)
+
+    def is_round_complete(self, round_num):
+        """True when every player has both a bid and a tricks count for the round."""
+        return all(
+            self.get_round(round_num, p)['bid'] is not None and self.get_round(round_num, p)['tricks'] is not None
+            for p in self.players
+        )
+
+    def played_rounds(self):
+        """Number of leading rounds actually played: all before the current one, plus the
+        current round once every bid/tricks value is in and the tricks add up."""
+        played = self.current_round - 1
+        if self.is_round_complete(self.current_round) and self.total_tricks(self.current_round) == self.current_round:
+            played = self.current_round
+        return min(played, self.max_rounds)
+
+    def dealer_index(self, round_num=None):
+        """Index of the dealer for a round (defaults to the current round)."""
+        if round_num is None:
+            round_num = self.current_round
+        return dealer_index_for(self.starting_dealer_index, round_num, len(self.players))
+
+    def dealer(self, round_num=None):
+        """Name of the dealer for a round (defaults to the current round)."""
+        return self.players[self.dealer_index(round_num)]
+
+    # ----- Scoring -----
+
+    def _rebuild_totals(self):
+        """Recompute every player's running totals from game_data (load, reset, roster changes)."""
+        last_round = max(self.game_data, default=0)
+        self._running = {player: [0] for player in self.players}
+        for r in range(1, last_round + 1):
+            round_data = self.game_data.get(r, {})
+            for player, running in self._running.items():
+                data = round_data.get(player)
+                running.append(running[-1] + (_cell_score(data) if data else 0))
+
+    def _extend_totals(self, round_num):
+        """Make room for a new round at the end of the running totals."""
+        for player in self.players:
+            running = self._running.setdefault(player, [0])
+            while len(running) <= round_num:
+                running.append(running[-1])
+
+    def counted_rounds(self):
+        """Number of rounds that count towards totals (current round only once the game is finished)."""
+        if self.game_finished:
+            return max(self.game_data, default=0)
+        return self.current_round - 1
+
+    def round_history(self, upto=None):
+        """Hashable ((bid, tricks) per player) tuple per round for rounds 1..upto (defaults to the counted rounds)."""
+        if upto is None:
+            upto = self.counted_rounds()
+        return tuple(
+            tuple((self.get_round(r, p)['bid'], self.get_round(r, p)['tricks']) for p in self.players)
+            for r in range(1, upto + 1)
+        )
+
+    def running_totals(self, upto=None):
+        """Per-player running totals [0, after R1, ..., after R upto] (defaults to the counted rounds)."""
+        if upto is None:
+            upto = self.counted_rounds()
+        return {p: self._running[p][:upto + 1] for p in self.players}
+
+    def get_total_scores(self):
+        """Calculate total scores for all players (only completed rounds, not current round unless game is finished)."""
+        upto = self.counted_rounds()
+        totals = {}
+        for player in self.players:
+            running = self._running[player]
+            totals[player] = running[min(upto, len(running) - 1)]
+        return totals
+
+    def get_shot_players(self, round_num):
+        """Return list of players who need to take a shot (off by 2+ tricks)."""
+        shot_players = []
+        for player in self.players:
+            data = self.get_round(round_num, player)
+            bid, tricks = data.get('bid', 0) or 0, data.get('tricks', 0) or 0
+            if abs(bid - tricks) >= 2:
+                shot_players.append(player)
+        return shot_players
+
+    def score_matrix(self):
+        """Rounds x players matrix of per-round scores (0 where bid or tricks are missing)."""
+        running = [self._running[p] for p in self.players]
+        return [
+            [totals[r] - totals[r - 1] for totals in running]
+            for r in range(1, self.max_rounds + 1) if r in self.game_data
+        ]
+
+    def analyze_game_stats(self):
+        """Analyze the full game and return comprehensive statistics."""
+        return analyze_games([(self.players, self.score_matrix())])[0]
+
+    # ----- Serialization -----
+
+    def to_save_data(self):
+        """Return the engine state as the JSON-serializable dict stored in save files."""
+        return {
+            "players": self.players,
+            "player_colors": self.player_colors,
+            "starting_dealer_index": self.starting_dealer_index,
+            "current_round": self.current_round,
+            "game_data": {str(k): v for k, v in self.game_data.items()},
+            "max_rounds": self.max_rounds,
+            "game_started": self.game_started,
+            "game_finished": self.game_finished,
+        }
+
+    @classmethod
+    def from_save_data(cls, save_data):
+        """Build an engine from a save file's JSON payload."""
+        engine = cls(
+            save_data["players"],
+            save_data.get("player_colors", {}),
+            save_data.get("starting_dealer_index", 0),
+        )
+        engine.current_round = save_data["current_round"]
+        engine.game_data = {
+            int(k): v for k, v in save_data["game_data"].items()
+        }
+        engine.max_rounds = save_data["max_rounds"]
+        engine.game_started = save_data["game_started"]
+        engine.game_finished = save_data.get("game_finished", False)
+        engine._rebuild_totals()
+        return engine
+
+
+# ----- Game statistics -----
+
+def _longest_run(mask):
+    """Longest run of True along the rounds axis of a (games, rounds, players) mask."""
+    if mask.shape[1] == 0:
+        return np.zeros((mask.shape[0], mask.shape[2]), dtype=np.int64)
+    count = np.cumsum(mask, axis=1)
+    last_reset = np.maximum.accumulate(np.where(mask, 0, count), axis=1)
+    return (count - last_reset).max(axis=1)
+
+
+def _analyze_stack(scores):
+    """Compute the per-player statistics for a (games, rounds, players) stack of score matrices."""
+    num_games, num_rounds, num_players = scores.shape
+    zeros = np.zeros((num_games, num_players), dtype=np.int64)
+
+    # Running totals per round, starting at 0
+    totals = np.zeros((num_games, num_rounds + 1, num_players), dtype=np.int64)
+    np.cumsum(scores, axis=1, out=totals[:, 1:])
+
+    # Best and worst rounds (argmax/argmin return the first occurrence, like list.index)
+    if num_rounds:
+        best_score, best_round = scores.max(axis=1), scores.argmax(axis=1) + 1
+        worst_score, worst_round = scores.min(axis=1), scores.argmin(axis=1) + 1
+    else:
+        best_score = best_round = worst_score = worst_round = zeros
+
+    correct_bids = (scores > 0).sum(axis=1)
+
+    # Biggest 3-round jump and drop over a rolling window of the running totals
+    if num_rounds + 1 >= 4:
+        change = totals[:, 3:] - totals[:, :-3]
+        jump, jump_at = change.max(axis=1), change.argmax(axis=1)
+        drop, drop_at = change.min(axis=1), change.argmin(axis=1)
+        has_jump, has_drop = jump > 0, drop < 0
+        jump = np.where(has_jump, jump, 0)
+        jump_start, jump_end = np.where(has_jump, jump_at + 1, 0), np.where(has_jump, jump_at + 3, 0)
+        drop = np.where(has_drop, drop, 0)
+        drop_start, drop_end = np.where(has_drop, drop_at + 1, 0), np.where(has_drop, drop_at + 3, 0)
+    else:
+        jump = jump_start = jump_end = drop = drop_start = drop_end = zeros
+
+    # Standings after each round: stable descending sort keeps seat order on ties
+    order = np.argsort(-totals[:, 1:], axis=2, kind='stable')
+    ranks = np.argsort(order, axis=2) + 1
+
+    # Leader per round and how often each player gained or lost the lead
+    leading = order[:, :, :1] == np.arange(num_players)
+    was_leading = np.concatenate([np.zeros_like(leading[:, :1]), leading[:, :-1]], axis=1)
+    times_in_lead = leading.sum(axis=1)
+    lead_changes = (leading != was_leading).sum(axis=1)
+
+    # Comeback or choke stats
+    if num_rounds >= 2:
+        start_rank, end_rank = ranks[:, 0], ranks[:, -1]
+    else:
+        start_rank = end_rank = zeros
+
+    return {
+        'scores': scores, 'totals': totals, 'order': order,
+        'best_round': best_round, 'best_round_score': best_score,
+        'worst_round': worst_round, 'worst_round_score': worst_score,
+        'correct_bids': correct_bids,
+        'max_3round_jump': jump, 'jump_start': jump_start, 'jump_end': jump_end,
+        'max_3round_drop': drop, 'drop_start': drop_start, 'drop_end': drop_end,
+        'times_in_lead': times_in_lead, 'lead_changes': lead_changes,
+        'start_rank': start_rank, 'end_rank': end_rank,
+        'max_hot_streak': _longest_run(scores > 0),
+        'max_cold_streak': _longest_run(scores <= 0),
+    }
+
+
+def _stats_for_game(players, batch, g, per_round=True):
+    """Unpack one game of an _analyze_stack batch into the analyze_game_stats dict."""
+    totals = batch['totals'][g].T.tolist()
+    num_rounds = batch['scores'].shape[1]
+    field = {key: value[g].tolist() for key, value in batch.items() if value.ndim == 2}
+
+    stats = {'analysis': {}}
+    if per_round:
+        scores = batch['scores'][g].T.tolist()
+        per_round_totals = batch['totals'][g, 1:].tolist()
+        stats = {
+            'running_totals': {p: totals[j] for j, p in enumerate(players)},
+            'round_scores': {p: scores[j] for j, p in enumerate(players)},
+            'round_standings': [
+                [(players[j], per_round_totals[r][j]) for j in order]
+                for r, order in enumerate(batch['order'][g].tolist())
+            ],
+            'analysis': {}
+        }
+
+    for j, p in enumerate(players):
+        correct_bids = field['correct_bids'][j]
+        stats['analysis'][p] = {
+            'final_score': totals[j][-1],
+            'best_round': field['best_round'][j],
+            'best_round_score': field['best_round_score'][j],
+            'worst_round': field['worst_round'][j],
+            'worst_round_score': field['worst_round_score'][j],
+            'correct_bids': correct_bids,
+            'total_rounds': num_rounds,
+            'accuracy': round(correct_bids / num_rounds * 100, 1) if num_rounds else 0,
+            'max_3round_jump': field['max_3round_jump'][j],
+            'jump_rounds': (field['jump_start'][j], field['jump_end'][j]),
+            'max_3round_drop': field['max_3round_drop'][j],
+            'drop_rounds': (field['drop_start'][j], field['drop_end'][j]),
+            'times_in_lead': field['times_in_lead'][j],
+            'lead_changes': field['lead_changes'][j],
+            'start_rank': field['start_rank'][j],
+            'end_rank': field['end_rank'][j],
+            'rank_change': field['start_rank'][j] - field['end_rank'][j],  # Positive = improved
+            'max_hot_streak': field['max_hot_streak'][j],
+            'max_cold_streak': field['max_cold_streak'][j],
+        }
+
+    return stats
+
+
+def analyze_games(games, per_round=True):
+    """Analyze a batch of games in one call and return an analyze_game_stats dict per game.
+
+    Each game is a (players, scores) pair where scores is a rounds x players matrix of
+    per-round scores (see GameEngine.score_matrix). Games of the same shape are stacked
+    and analyzed together with array operations. With per_round=False only the
+    'analysis' section is built, which is much cheaper for archive-wide jobs.
+    """
+    results = [None] * len(games)
+    groups = {}
+    for i, (players, scores) in enumerate(games):
+        matrix = np.asarray(scores, dtype=np.int64).reshape(len(scores), len(players))
+        groups.setdefault(matrix.shape, []).append((i, players, matrix))
+
+    for members in groups.values():
+        batch = _analyze_stack(np.stack([matrix for _, _, matrix in members]))
+        for g, (i, players, _) in enumerate(members):
+            results[i] = _stats_for_game(players, batch, g, per_round)
+    return results
@@ -0,0 +1,197 @@
+"""Export every saved Wizard game as a tidy, columnar dataset.
+
+One row per (game, round, player) with the bid, tricks, round score,
+running total and the round's dealer, written as Parquet when pyarrow is
+installed and as CSV otherwise. Games are read and written one at a time, so
+memory stays bounded however large the history is.
+
+Exports are incremental: only games saved (or edited) since the last export
+are appended, as a new Parquet part file or as new rows of the CSV file. A
+game that was re-saved after it was exported is appended again, so readers
+should keep the rows with the latest saved_at of each game.
+
+    python wizard_export.py [SAVE_DIR] [--output DIR] [--format parquet|csv] [--full]
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from wizard_engine import GameEngine, calculate_score, dealer_index_for
+from wizard_storage import PACK_NAME, SAVE_DIR, SaveArchive, read_save, save_paths
+
+EXPORT_DIR = Path(__file__).parent / "exports"
+CSV_NAME = "wizard_history.csv"
+PARQUET_PREFIX = "wizard_history_"
+# Games already exported (name -> save mtime_ns), one state file per format
+EXPORT_STATE_NAME = ".export_state_{format}.json"
+
+COLUMNS = ("game", "title", "saved_at", "round", "player", "seat", "bid", "tricks", "score", "running_total", "dealer")
+# Games per Parquet row group: bounds memory while keeping row groups a useful size
+ROW_GROUP_GAMES = 1000
+
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+def game_rows(name, save_data):
+    """Yield the export rows (tuples in COLUMNS order) of a save's played rounds."""
+    engine = GameEngine.from_save_data(save_data)
+    players = engine.players
+    title = save_data.get("title", "Untitled Game")
+    saved_at = save_data.get("saved_at", "")
+    totals = dict.fromkeys(players, 0)
+    for r in range(1, engine.played_rounds() + 1):
+        dealer = players[dealer_index_for(engine.starting_dealer_index, r, len(players))]
+        for seat, p in enumerate(players):
+            data = engine.get_round(r, p)
+            if data['bid'] is None or data['tricks'] is None:
+                continue
+            score = calculate_score(data['bid'], data['tricks'])
+            totals[p] += score
+            yield (name, title, saved_at, r, p, seat, data['bid'], data['tricks'], score, totals[p], dealer)
+
+
+def saved_games(save_dir=SAVE_DIR):
+    """Yield (name, mtime_ns, load) for every save in save_dir, loose or packed.
+
+    The mtime changes whenever a game is saved or edited, and is kept when a
+    game is packed, so it tells which games changed since the last export.
+    """
+    paths = save_paths(save_dir)
+    for filepath in sorted(paths):
+        yield filepath.name, filepath.stat().st_mtime_ns, lambda filepath=filepath: read_save(filepath)
+    archive = SaveArchive(Path(save_dir) / PACK_NAME)
+    loose = {filepath.name for filepath in paths}
+    for name in sorted(set(archive.names()) - loose):
+        yield name, archive.version(name)[0], lambda name=name: archive.load(name)
+
+
+def _new_games(save_dir, exported, skipped):
+    """Yield (name, mtime_ns, rows) for games not exported in their current version.
+
+    Saves that can't be read (or were hand-edited into nonsense) are added to
+    skipped as (name, error) instead.
+    """
+    for name, mtime_ns, load in saved_games(save_dir):
+        if exported.get(name) == mtime_ns:
+            continue
+        try:
+            rows = list(game_rows(name, load()))
+        except Exception as e:
+            skipped.append((name, e))
+            continue
+        yield name, mtime_ns, rows
+
+
+def _write_csv(path, games):
+    """Append the rows of each game to a CSV file; returns {name: mtime_ns} of the games written."""
+    written = {}
+    is_new = not path.exists() or path.stat().st_size == 0
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(COLUMNS)
+        for name, mtime_ns, rows in games:
+            writer.writerows(rows)
+            written[name] = mtime_ns
+    return written
+
+
+def _write_parquet(path, games):
+    """Write the rows of each game to a new Parquet file, a row group per ROW_GROUP_GAMES games."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("game", pa.string()), ("title", pa.string()), ("saved_at", pa.string()),
+        ("round", pa.int16()), ("player", pa.string()), ("seat", pa.int8()),
+        ("bid", pa.int16()), ("tricks", pa.int16()), ("score", pa.int32()),
+        ("running_total", pa.int32()), ("dealer", pa.string()),
+    ])
+    written, batch, writer = {}, [], None
+
+    def flush():
+        nonlocal writer
+        if writer is None:
+            writer = pq.ParquetWriter(str(path), schema)
+        columns = list(zip(*batch)) or [()] * len(COLUMNS)
+        writer.write_table(pa.table(dict(zip(COLUMNS, columns)), schema=schema))
+        batch.clear()
+
+    try:
+        for i, (name, mtime_ns, rows) in enumerate(games, start=1):
+            batch.extend(rows)
+            written[name] = mtime_ns
+            if i % ROW_GROUP_GAMES == 0:
+                flush()
+        if batch or (written and writer is None):
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def export_history(save_dir=SAVE_DIR, output_dir=EXPORT_DIR, file_format=None, full=False):
+    """Append games saved since the last export to the dataset in output_dir.
+
+    Returns the number of games exported, the file written or None, and a
+    list of (filename, error) for saves that couldn't be read. full=True
+    forgets what was exported before (delete the old files first to avoid
+    duplicate rows).
+    """
+    file_format = file_format or ("parquet" if PARQUET_AVAILABLE else "csv")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state_path = output_dir / EXPORT_STATE_NAME.format(format=file_format)
+    exported = {}
+    if state_path.exists() and not full:
+        with open(state_path, 'r') as f:
+            exported = json.load(f)
+
+    skipped = []
+    games = _new_games(save_dir, exported, skipped)
+    if file_format == "csv":
+        path = output_dir / CSV_NAME
+        written = _write_csv(path, games)
+    else:
+        path = output_dir / f"{PARQUET_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.parquet"
+        written = _write_parquet(path, games)
+    if not written:
+        return 0, None, skipped
+
+    # Recorded only once the rows are safely written; a failed export is redone next time
+    exported.update(written)
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(exported, f)
+    os.replace(tmp_path, state_path)
+    return len(written), path, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export saved Wizard games as one row per round and player.")
+    parser.add_argument("save_dir", nargs="?", default=str(SAVE_DIR), help="Directory with wizard_game_* saves")
+    parser.add_argument("--output", default=str(EXPORT_DIR), help="Dataset directory (default: exports/)")
+    parser.add_argument("--format", choices=["parquet", "csv"], default=None,
+                        help="Default: parquet if pyarrow is installed, csv otherwise")
+    parser.add_argument("--full", action="store_true", help="Export every game, not just those saved since the last export")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and not PARQUET_AVAILABLE:
+        parser.error("Parquet export needs pyarrow (pip install pyarrow)")
+    count, path, skipped = export_history(args.save_dir, args.output, file_format=args.format, full=args.full)
+    for name, e in skipped:
+        print(f"Skipped {name}: {e}")
+    if path is None:
+        print(f"No games saved since the last export ({len(skipped)} skipped)")
+    else:
+        print(f"Exported {count} games to {path} ({len(skipped)} skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Prompt construction for the AI roasts and end-game summary.
+
+Builds the LLM prompts from a GameEngine (or its analysis dict) and parses the
+replies, without touching Streamlit or any API client, so the text work can be
+benchmarked and reused outside the app.
+"""
+
+import re
+
+from wizard_engine import EMPTY_ROUND_DATA, calculate_score
+
+
+def build_roast_prompt(engine, round_num):
+    """Build the roast prompt for a round from every player's full game history."""
+    # Build comprehensive game history for each player
+    player_histories = []
+    totals = engine.get_total_scores()
+    sorted_by_score = sorted(totals.items(), key=lambda x: x[1], reverse=True)
+    
+    for player in engine.players:
+        # Current standing
+        rank = [i+1 for i, (p, s) in enumerate(sorted_by_score) if p == player][0]
+        total_score = totals[player]
+        
+        # Round-by-round history
+        round_details = []
+        total_correct = 0
+        total_over = 0
+        total_under = 0
+        biggest_fail = 0
+        
+        for r in range(1, round_num + 1):
+            if r in engine.game_data and player in engine.game_data[r]:
+                data = engine.game_data[r].get(player, EMPTY_ROUND_DATA)
+                bid = data['bid']
+                tricks = data['tricks']
+                if bid is not None and tricks is not None:
+                    diff = tricks - bid
+                    score = calculate_score(bid, tricks)
+                    round_details.append(f"R{r}: bid {bid}, got {tricks}, {'✓' if diff == 0 else f'off by {abs(diff)}'} ({score:+d} pts)")
+                    
+                    if diff == 0:
+                        total_correct += 1
+                    elif diff > 0:
+                        total_over += 1
+                    else:
+                        total_under += 1
+                    
+                    if abs(diff) > biggest_fail:
+                        biggest_fail = abs(diff)
+        
+        # Build player summary
+        history = f"""{player} (Rank #{rank}, {total_score} pts total):
+  - Correct bids: {total_correct}/{round_num} rounds
+  - Overbid: {total_under}x, Underbid: {total_over}x
+  - Biggest miss: {biggest_fail} tricks off
+  - Round history: {'; '.join(round_details[-5:])}"""  # Last 5 rounds for context
+        
+        player_histories.append(history)
+    
+    # Current round performance
+    current_performances = []
+    for player in engine.players:
+        data = engine.game_data[round_num].get(player, EMPTY_ROUND_DATA)
+        bid = data['bid'] or 0
+        tricks = data['tricks'] or 0
+        diff = tricks - bid
+        
+        if diff == 0:
+            status = f"{player} nailed their bid of {bid} (smug success)"
+        elif diff > 0:
+            status = f"{player} bid {bid} but got {tricks} (overachiever by {diff})"
+        else:
+            status = f"{player} bid {bid} but only got {tricks} (failed by {abs(diff)})"
+        current_performances.append(status)
+    
+    # Standings summary
+    standings = ", ".join([f"#{i+1} {p} ({s} pts)" for i, (p, s) in enumerate(sorted_by_score)])
+    
+    prompt = f"""You are a witty, sarcastic commentator for a Wizard card game. Round {round_num} of {engine.max_rounds} just ended.
+
+CURRENT STANDINGS: {standings}
+
+FULL PLAYER HISTORIES:
+{chr(10).join(player_histories)}
+
+THIS ROUND'S PERFORMANCES:
+{chr(10).join(current_performances)}
+
+Write a brief, savage roast for EACH player individually (1-2 sentences each). Use their FULL GAME HISTORY to make it personal - reference their patterns, streaks, choking moments, or consistent failures. Format as:
+PLAYER_NAME: [roast]
+
+Be savage but friendly. Reference specific stats, patterns, or memorable moments from their history. Keep each roast short and punchy."""
+
+    return prompt
+
+
+def parse_roasts(players, raw_content):
+    """Split an LLM roast reply into {player: roast}."""
+    roasts = {}
+    for player in players:
+        # Look for "PLAYER_NAME:" pattern
+        pattern = rf"{re.escape(player)}[:\s]+(.+?)(?=\n[A-Z]|$)"
+        match = re.search(pattern, raw_content, re.IGNORECASE | re.DOTALL)
+        if match:
+            roast_text = match.group(1).strip()
+            # Clean up the roast text
+            roast_text = roast_text.strip('"').strip()
+            roasts[player] = roast_text
+        else:
+            roasts[player] = "Even the AI couldn't find words for this performance..."
+    
+    return roasts
+
+
+def build_summary_prompt(players, analysis):
+    """Build the end-game summary prompt from analyze_game_stats()['analysis']."""
+    # Build comprehensive stats summary for LLM
+    player_summaries = []
+    for p in players:
+        a = analysis[p]
+        summary = f"""{p}:
+- Final: #{a['end_rank']} with {a['final_score']} pts
+- Accuracy: {a['correct_bids']}/{a['total_rounds']} correct ({a['accuracy']}%)
+- Best round: R{a['best_round']} (+{a['best_round_score']} pts), Worst: R{a['worst_round']} ({a['worst_round_score']} pts)
+- Biggest 3-round jump: +{a['max_3round_jump']} (R{a['jump_rounds'][0]}-R{a['jump_rounds'][1]})
+- Biggest 3-round drop: {a['max_3round_drop']} (R{a['drop_rounds'][0]}-R{a['drop_rounds'][1]})
+- Times leading: {a['times_in_lead']} rounds, Lead changes: {a['lead_changes']}
+- Started #{a['start_rank']}, Finished #{a['end_rank']} (moved {'+' if a['rank_change'] > 0 else ''}{a['rank_change']} spots)
+- Hot streak: {a['max_hot_streak']} correct in a row, Cold streak: {a['max_cold_streak']} misses in a row"""
+        player_summaries.append(summary)
+    
+    # Find superlatives
+    superlatives = []
+    
+    # Best accuracy
+    best_accuracy = max(players, key=lambda p: analysis[p]['accuracy'])
+    superlatives.append(f"Most Accurate: {best_accuracy} ({analysis[best_accuracy]['accuracy']}%)")
+    
+    # Worst accuracy
+    worst_accuracy = min(players, key=lambda p: analysis[p]['accuracy'])
+    superlatives.append(f"Least Accurate: {worst_accuracy} ({analysis[worst_accuracy]['accuracy']}%)")
+    
+    # Biggest comeback
+    biggest_comeback = max(players, key=lambda p: analysis[p]['rank_change'])
+    if analysis[biggest_comeback]['rank_change'] > 0:
+        superlatives.append(f"Biggest Comeback: {biggest_comeback} (climbed {analysis[biggest_comeback]['rank_change']} spots)")
+    
+    # Biggest choke
+    biggest_choke = min(players, key=lambda p: analysis[p]['rank_change'])
+    if analysis[biggest_choke]['rank_change'] < 0:
+        superlatives.append(f"Biggest Choke: {biggest_choke} (dropped {abs(analysis[biggest_choke]['rank_change'])} spots)")
+    
+    # Hottest streak
+    hottest = max(players, key=lambda p: analysis[p]['max_hot_streak'])
+    superlatives.append(f"Hottest Streak: {hottest} ({analysis[hottest]['max_hot_streak']} correct in a row)")
+    
+    # Coldest streak
+    coldest = max(players, key=lambda p: analysis[p]['max_cold_streak'])
+    superlatives.append(f"Coldest Streak: {coldest} ({analysis[coldest]['max_cold_streak']} misses in a row)")
+    
+    # Best 3-round jump
+    best_jumper = max(players, key=lambda p: analysis[p]['max_3round_jump'])
+    superlatives.append(f"Best 3-Round Run: {best_jumper} (+{analysis[best_jumper]['max_3round_jump']} pts)")
+    
+    # Worst 3-round drop
+    worst_dropper = min(players, key=lambda p: analysis[p]['max_3round_drop'])
+    superlatives.append(f"Worst 3-Round Collapse: {worst_dropper} ({analysis[worst_dropper]['max_3round_drop']} pts)")
+    
+    prompt = f"""You are a sports commentator giving an exciting end-game summary for a Wizard card game tournament.
+
+FINAL STANDINGS AND PLAYER STATS:
+{chr(10).join(player_summaries)}
+
+NOTABLE ACHIEVEMENTS:
+{chr(10).join(superlatives)}
+
+Write an exciting, dramatic game summary (3-4 paragraphs) that:
+1. Celebrates the winner and their journey to victory
+2. Highlights the most dramatic moments (comebacks, chokes, close battles)
+3. Gives funny "awards" to each player based on their unique stats
+4. Ends with a memorable final statement
+
+Be entertaining, use their names, reference specific stats. Make it feel like a sports broadcast recap!"""
+
+    return prompt
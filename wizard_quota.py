@@ -0,0 +1,78 @@
+"""Local bookkeeping of the AI providers' request quotas.
+
+Each rate-limited model gets a token bucket holding its daily request limit,
+refilled evenly over the day and persisted in SQLite next to the saves, so
+the app knows a model's free tier is used up before it spends a round trip
+finding out. The provider remains the authority: a quota error it reports
+empties the bucket.
+"""
+
+import sqlite3
+import threading
+import time
+
+from wizard_storage import SAVE_DIR
+
+AI_QUOTA_FILE = SAVE_DIR / ".ai_quota.sqlite3"
+# Seconds over which a bucket refills from empty to its limit
+QUOTA_PERIOD = 24 * 3600
+
+
+class QuotaTracker:
+    """Persisted per-model token buckets of requests left, for models with a limit in limits."""
+
+    def __init__(self, limits, path=AI_QUOTA_FILE, period=QUOTA_PERIOD):
+        self.limits = dict(limits)
+        self.period = period
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                model TEXT PRIMARY KEY, level REAL, updated REAL)
+        """)
+        # model -> (requests left, time it was measured at); missing buckets are full
+        self._buckets = {
+            model: (level, updated)
+            for model, level, updated in self._db.execute("SELECT * FROM buckets")
+        }
+
+    def close(self):
+        self._db.close()
+
+    def _level(self, model, now):
+        """Requests left for a tracked model at time now, after refilling."""
+        limit = self.limits[model]
+        level, updated = self._buckets.get(model, (limit, now))
+        return min(limit, level + (now - updated) * limit / self.period)
+
+    def _set(self, model, level, now):
+        self._buckets[model] = (level, now)
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)", (model, level, now))
+
+    def left(self, model):
+        """Whole requests left for a model, or None if it isn't rate limited."""
+        if model not in self.limits:
+            return None
+        with self._lock:
+            return int(self._level(model, time.time()))
+
+    def has_budget(self, model, reserve=0):
+        """Whether a model has a request left beyond the reserve kept for more important calls."""
+        left = self.left(model)
+        return left is None or left >= 1 + reserve
+
+    def take(self, model):
+        """Count one request to a model against its budget."""
+        if model not in self.limits:
+            return
+        with self._lock:
+            now = time.time()
+            self._set(model, max(0.0, self._level(model, now) - 1), now)
+
+    def exhaust(self, model):
+        """Empty a model's bucket after the provider reported its quota used up."""
+        if model not in self.limits:
+            return
+        with self._lock:
+            self._set(model, 0.0, time.time())
@@ -0,0 +1,1496 @@
+"""Reading and writing Wizard save files.
+
+A save payload is the dict produced by GameEngine.to_save_data() plus
+title/saved_at/total_scores. It is stored in one of two formats, told apart
+by the first line:
+
+- legacy snapshot: a short human-readable header followed by the
+  pretty-printed JSON payload, rewritten in full on every save;
+- journal: one JSON record per line, a snapshot followed by appended patches
+  (changed rounds and fields, player renames). Saving appends one line, and
+  the journal is compacted back to a single snapshot when the game finishes.
+  A fixed-width listing line after the header holds the sidebar fields and is
+  rewritten in place on every save, so listings read one line per journal.
+
+Saves named *.wzb instead use a compact, versioned binary snapshot: a player
+table plus packed bid/tricks bytes per round (see encode_binary_save).
+read_save detects every format from the file contents.
+
+Finished games can be rolled into one append-only, memory-mapped archive
+(SaveArchive) that is read one game at a time; FileStorage, SaveIndex and
+the analytics read loose saves and the archive alike.
+
+Games can instead live in one SQLite database (SqliteStorage). The app goes
+through open_storage(), which returns either backend behind the same
+interface; set WIZARD_STORAGE=sqlite to use the database.
+
+Run as a script to convert existing text saves to the binary format, or to
+import every save file into the SQLite database:
+
+    python wizard_storage.py convert [SAVE_DIR] [--keep]
+    python wizard_storage.py pack [SAVE_DIR]
+    python wizard_storage.py import-sqlite [SAVE_DIR] [--db PATH]
+
+Nothing in here depends on Streamlit, so batch jobs can share it with the app.
+"""
+
+import argparse
+import atexit
+import heapq
+import io
+import itertools
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from wizard_engine import GameEngine
+
+logger = logging.getLogger(__name__)
+
+# Save directory for game files
+SAVE_DIR = Path(__file__).parent / "saved_games"
+SAVE_PREFIX = "wizard_game_"
+TEXT_SUFFIX = ".txt"
+BINARY_SUFFIX = ".wzb"
+# Listing index kept next to the saves by SaveIndex
+SAVE_INDEX_NAME = ".save_index.sqlite3"
+# Database of the SQLite storage backend, and the environment variable picking a backend
+GAMES_DB_NAME = "games.sqlite3"
+STORAGE_ENV = "WIZARD_STORAGE"
+
+SAVE_HEADER = "=== WIZARD CARD GAME SAVE FILE ==="
+JSON_MARKER = "--- JSON DATA (DO NOT EDIT BELOW) ---\n"
+JOURNAL_HEADER = "=== WIZARD CARD GAME JOURNAL ==="
+
+# Binary save: magic + schema version, then the fixed header, length-prefixed
+# UTF-8 strings, round numbers, packed (bid, tricks) bytes and final totals
+BINARY_MAGIC = b"WZB"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<3sBBBBBBH")  # magic, version, players, max_rounds, current_round, dealer, flags, rounds
+BINARY_NONE = 0xFF  # bid/tricks not entered yet
+FLAG_STARTED, FLAG_FINISHED = 1, 2
+# Archive of finished games: binary save records, then an offset table
+# (offset, length, mtime_ns, name per game) and a footer pointing at it
+PACK_NAME = "archive.wzp"
+PACK_MAGIC = b"WZP"
+PACK_VERSION = 1
+PACK_ENTRY = struct.Struct("<QIq")  # offset, length, mtime_ns; followed by the length-prefixed name
+PACK_FOOTER = struct.Struct("<QII3sB")  # table offset, games, table crc32, magic, version
+# Edit log of retitles, renames and deletes of packed games, next to the pack
+PACK_EDITS_SUFFIX = ".edits"
+# Edit log size at which pack_saves folds it into the pack
+PACK_EDITS_COMPACT = 1 << 20
+# Appended records after which a journal is compacted even if the game isn't finished
+MAX_JOURNAL_RECORDS = 200
+# Journal line 2 holds these payload fields for listings, with spare bytes so
+# later saves can rewrite it in place
+LISTING_FIELDS = ("title", "saved_at", "players", "current_round", "max_rounds")
+LISTING_PREFIX = '{"op":"listing"'
+JOURNAL_LISTING_SPARE = 256
+
+# Seconds SaveWriter waits for further saves of the same file before writing
+AUTOSAVE_DELAY = 0.5
+
+# Journal path -> ((mtime_ns, size), save_data, record count) as last written or replayed
+_journal_cache = {}
+_journal_lock = threading.Lock()
+
+
+def new_save_filename(players, binary=False):
+    """Build a fresh save filename from the first three players and the current time."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    players_str = "_".join(players[:3])
+    return f"{SAVE_PREFIX}{players_str}_{timestamp}{BINARY_SUFFIX if binary else TEXT_SUFFIX}"
+
+
+def is_save_name(name):
+    """Whether a filename is a Wizard save (text or binary)."""
+    return name.startswith(SAVE_PREFIX) and name.endswith((TEXT_SUFFIX, BINARY_SUFFIX))
+
+
+def save_paths(save_dir=SAVE_DIR):
+    """Paths of every save in a directory."""
+    with os.scandir(save_dir) as it:
+        return [Path(entry.path) for entry in it if is_save_name(entry.name)]
+
+
+def parse_save_text(content):
+    """Return the JSON payload of a save file's text."""
+    json_start = content.find(JSON_MARKER) + len(JSON_MARKER)
+    return json.loads(content[json_start:])
+
+
+def read_save(filepath):
+    """Load the payload of a save file in any format."""
+    with open(filepath, 'rb') as f:
+        head = f.read(len(BINARY_MAGIC))
+        if head == BINARY_MAGIC:
+            return decode_binary_save(head + f.read())
+    filepath = Path(filepath)
+    with _journal_lock:
+        cached = _journal_cache.get(filepath)
+        state = _journal_state(filepath, remember=False)
+    if state is not None:
+        # Only the cached state is shared; a fresh replay can be handed out as is
+        return _copy_payload(state[0]) if cached is not None and state[0] is cached[1] else state[0]
+    with open(filepath, 'r') as f:
+        return parse_save_text(f.read())
+
+
+def format_save_text(save_data):
+    """Render a save payload as header + pretty-printed JSON."""
+    return "".join([
+        SAVE_HEADER + "\n",
+        f"Title: {save_data['title']}\n",
+        f"Saved: {save_data['saved_at'].replace('T', ' ')[:19]}\n",
+        f"Players: {', '.join(save_data['players'])}\n",
+        f"Round: {save_data['current_round']} / {save_data['max_rounds']}\n",
+        f"Scores: {save_data['total_scores']}\n",
+        "=" * 35 + "\n\n",
+        JSON_MARKER,
+        json.dumps(save_data, indent=2),
+    ])
+
+
+def write_save(filepath, save_data):
+    """Write a save payload to a file via a temp file and rename (bumps the directory mtime)."""
+    filepath = Path(filepath)
+    tmp_path = filepath.with_name(filepath.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(format_save_text(save_data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+
+def _copy_payload(save_data):
+    """Deep copy of a JSON-compatible payload (faster than copy.deepcopy for plain data)."""
+    return json.loads(json.dumps(save_data))
+
+
+def _pack_str(text):
+    """u16 length + UTF-8 bytes."""
+    data = text.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
+
+
+def encode_binary_save(save_data):
+    """Encode a save payload in the compact binary format."""
+    players = save_data["players"]
+    colors = save_data.get("player_colors", {})
+    rounds = sorted(int(r) for r in save_data["game_data"])
+    flags = (FLAG_STARTED if save_data.get("game_started") else 0) | (FLAG_FINISHED if save_data.get("game_finished") else 0)
+    cells = bytearray()
+    for r in rounds:
+        round_data = save_data["game_data"][str(r)]
+        for p in players:
+            data = round_data.get(p, {})
+            for field in ("bid", "tricks"):
+                value = data.get(field)
+                cells.append(BINARY_NONE if value is None else value)
+    totals = save_data.get("total_scores", {})
+    return b"".join([
+        BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(players), save_data["max_rounds"],
+                           save_data["current_round"], save_data.get("starting_dealer_index", 0), flags, len(rounds)),
+        _pack_str(save_data.get("title", "")),
+        _pack_str(save_data.get("saved_at", "")),
+        *(_pack_str(p) + _pack_str(colors.get(p, "")) for p in players),
+        bytes(rounds),
+        bytes(cells),
+        struct.pack(f"<{len(players)}i", *(totals.get(p, 0) for p in players)),
+    ])
+
+
+def _decode_binary_head(f):
+    """(payload without rounds and totals, number of rounds) of a binary save, reading file object f up to its rounds."""
+    magic, version, num_players, max_rounds, current_round, dealer, flags, num_rounds = BINARY_HEADER.unpack(
+        f.read(BINARY_HEADER.size))
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary save version {version}")
+
+    def unpack_str():
+        (length,) = struct.unpack("<H", f.read(2))
+        return f.read(length).decode("utf-8")
+
+    title, saved_at = unpack_str(), unpack_str()
+    players, colors = [], {}
+    for _ in range(num_players):
+        player = unpack_str()
+        players.append(player)
+        color = unpack_str()
+        if color:
+            colors[player] = color
+    return {
+        "title": title,
+        "players": players,
+        "player_colors": colors,
+        "starting_dealer_index": dealer,
+        "current_round": current_round,
+        "max_rounds": max_rounds,
+        "game_started": bool(flags & FLAG_STARTED),
+        "game_finished": bool(flags & FLAG_FINISHED),
+        "saved_at": saved_at,
+    }, num_rounds
+
+
+def decode_binary_save(blob):
+    """Decode a binary save back into the payload dict read_save returns for text saves."""
+    f = io.BytesIO(blob)
+    save_data, num_rounds = _decode_binary_head(f)
+    players, num_players = save_data["players"], len(save_data["players"])
+    pos = f.tell()
+    rounds = blob[pos:pos + num_rounds]
+    pos += num_rounds
+    cells = blob[pos:pos + num_rounds * num_players * 2]
+    pos += len(cells)
+    totals = struct.unpack_from(f"<{num_players}i", blob, pos)
+
+    game_data = {}
+    i = 0
+    for r in rounds:
+        round_data = {}
+        for p in players:
+            bid, tricks = cells[i], cells[i + 1]
+            round_data[p] = {'bid': None if bid == BINARY_NONE else bid, 'tricks': None if tricks == BINARY_NONE else tricks}
+            i += 2
+        game_data[str(r)] = round_data
+    save_data["game_data"] = game_data
+    save_data["total_scores"] = dict(zip(players, totals))
+    return save_data
+
+
+def write_binary_save(filepath, save_data):
+    """Write a binary save via a fsync'd temp file and rename."""
+    filepath = Path(filepath)
+    tmp_path = filepath.with_name(filepath.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(encode_binary_save(save_data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+
+def store_save(filepath, save_data):
+    """Save a payload in the format its filename calls for: binary for .wzb, a journal otherwise."""
+    if Path(filepath).suffix == BINARY_SUFFIX:
+        write_binary_save(filepath, save_data)
+    else:
+        append_save(filepath, save_data)
+
+
+def convert_to_binary(filepath, keep=False):
+    """Rewrite a text save as a .wzb binary save next to it; returns the new path."""
+    filepath = Path(filepath)
+    target = filepath.with_suffix(BINARY_SUFFIX)
+    write_binary_save(target, read_save(filepath))
+    if not keep:
+        filepath.unlink()
+    return target
+
+
+def _journal_line(record):
+    """One compact JSON line of a journal."""
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _apply_record(save_data, record):
+    """Apply one journal record to a save payload (in place) and return it."""
+    op = record["op"]
+    if op == "snapshot":
+        return record["data"]
+    if op == "rename":
+        old, new = record["old"], record["new"]
+        save_data["players"] = [new if p == old else p for p in save_data["players"]]
+        for field in ("player_colors", "total_scores"):
+            if old in save_data.get(field, {}):
+                save_data[field][new] = save_data[field].pop(old)
+        for round_data in save_data["game_data"].values():
+            if old in round_data:
+                round_data[new] = round_data.pop(old)
+    elif op == "patch":
+        save_data["game_data"].update(record.get("rounds", {}))
+        for r in record.get("dropped_rounds", []):
+            save_data["game_data"].pop(r, None)
+        save_data.update(record.get("fields", {}))
+    return save_data
+
+
+def replay_journal(content):
+    """Rebuild a save payload from journal text: (save_data, records, clean).
+
+    A record that fails to parse can only be a torn final append from a crash;
+    replay stops there and reports the journal as not clean. The listing line
+    is skipped unparsed (it may be torn by an in-place rewrite).
+    """
+    save_data, count = None, 0
+    for line in content.split("\n")[1:]:
+        if not line or line.startswith(LISTING_PREFIX):
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return save_data, count, False
+        save_data = _apply_record(save_data, record)
+        count += 1
+    return save_data, count, save_data is not None
+
+
+def _journal_records(old, new):
+    """Records that turn save payload old into new (old is not modified)."""
+    records = []
+    renamed = [(a, b) for a, b in zip(old["players"], new["players"]) if a != b]
+    if len(old["players"]) == len(new["players"]) and len(renamed) == 1 and renamed[0][1] not in old["players"]:
+        records.append({"op": "rename", "old": renamed[0][0], "new": renamed[0][1]})
+        old = _apply_record(_copy_payload(old), records[-1])
+
+    patch = {"op": "patch"}
+    rounds = {r: data for r, data in new["game_data"].items() if old["game_data"].get(r) != data}
+    dropped = [r for r in old["game_data"] if r not in new["game_data"]]
+    fields = {k: v for k, v in new.items() if k != "game_data" and old.get(k) != v}
+    if rounds:
+        patch["rounds"] = rounds
+    if dropped:
+        patch["dropped_rounds"] = dropped
+    if fields:
+        patch["fields"] = fields
+    if len(patch) > 1:
+        records.append(patch)
+    return records
+
+
+def _journal_state(filepath, remember=True):
+    """(save_data, record count, clean) of a journal, or None for legacy or missing files.
+
+    Served from memory while the file's mtime and size match what this process
+    last wrote or replayed. Callers hold _journal_lock.
+    """
+    try:
+        stat = filepath.stat()
+    except FileNotFoundError:
+        return None
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _journal_cache.get(filepath)
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2], True
+    with open(filepath, 'r') as f:
+        first = f.readline()
+        if not first.startswith(JOURNAL_HEADER):
+            return None
+        save_data, count, clean = replay_journal(first + f.read())
+    if remember and clean:
+        _journal_cache[filepath] = (version, save_data, count)
+    return save_data, count, clean
+
+
+def _remember_journal(filepath, save_data, count):
+    """Cache the state just written to a journal."""
+    stat = filepath.stat()
+    _journal_cache[filepath] = ((stat.st_mtime_ns, stat.st_size), _copy_payload(save_data), count)
+
+
+def _listing_line(listing, size, width=None):
+    """Journal listing line of a payload (or listing record) for a journal of size bytes.
+
+    Padded to width bytes, or to JOURNAL_LISTING_SPARE bytes more than it
+    needs when width is None; None if it doesn't fit in width.
+    """
+    fields = {key: listing[key] for key in LISTING_FIELDS if key in listing}
+    record = json.dumps({"op": "listing", "size": size, **fields}, separators=(",", ":"))
+    if width is None:
+        width = len(record) + 1 + JOURNAL_LISTING_SPARE
+    elif len(record) + 1 > width:
+        return None
+    return record.ljust(width - 1) + "\n"
+
+
+def _read_listing(f, size):
+    """Listing record of a journal open in binary mode just past its header, or None if it has none or it is stale."""
+    line = f.readline()
+    if not line.startswith(LISTING_PREFIX.encode()):
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None  # Torn by a crash mid-rewrite
+    return record if record.get("size") == size else None
+
+
+def _write_listing(filepath, listing):
+    """Rewrite a journal's listing line in place; False if the journal has none or the listing no longer fits.
+
+    Not fsync'd: a lost or torn rewrite leaves a line whose size doesn't match
+    the journal, and readers replay the journal instead.
+    """
+    with open(filepath, 'r+b') as f:
+        f.readline()
+        start = f.tell()
+        line = f.readline()
+        if not line.startswith(LISTING_PREFIX.encode()):
+            return False
+        new_line = _listing_line(listing, f.seek(0, os.SEEK_END), len(line))
+        if new_line is None:
+            return False
+        f.seek(start)
+        f.write(new_line.encode())
+    return True
+
+
+def write_journal(filepath, save_data):
+    """Write a compacted journal (listing line and a single snapshot) via a temp file and rename."""
+    filepath = Path(filepath)
+    tmp_path = filepath.with_name(filepath.name + ".tmp")
+    head = JOURNAL_HEADER + "\n"
+    snapshot = _journal_line({"op": "snapshot", "data": save_data})
+    width = len(_listing_line(save_data, 0))
+    with open(tmp_path, 'w') as f:
+        f.write(head + _listing_line(save_data, len(head) + width + len(snapshot), width) + snapshot)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+    _remember_journal(filepath, save_data, 1)
+
+
+def append_save(filepath, save_data):
+    """Save a payload to a journal, appending only what changed since the last write.
+
+    Missing, legacy and torn files are (re)written as a fresh snapshot, as are
+    journals of a game that just finished or that grew past MAX_JOURNAL_RECORDS.
+    """
+    filepath = Path(filepath)
+    with _journal_lock:
+        state = _journal_state(filepath)
+        if state is None or not state[2]:
+            write_journal(filepath, save_data)
+            return
+        old, count, _ = state
+        finishing = save_data.get("game_finished") and not old.get("game_finished")
+        if finishing or count >= MAX_JOURNAL_RECORDS:
+            write_journal(filepath, save_data)
+            return
+        records = _journal_records(old, save_data)
+        if not records:
+            return
+        with open(filepath, 'a') as f:
+            f.write("".join(_journal_line(r) for r in records))
+            f.flush()
+            os.fsync(f.fileno())
+        if not _write_listing(filepath, save_data):
+            # A journal from before listing lines, or a title that outgrew its line
+            write_journal(filepath, save_data)
+            return
+        # Appends edit the file in place; touch the directory so SaveIndex rescans it
+        os.utime(filepath.parent)
+        _remember_journal(filepath, save_data, count + len(records))
+
+
+def is_finished_save(save_data):
+    """Whether a save is of a game played to the end (older saves predate the game_finished flag).
+
+    Without the flag, every round must have been played as the engine counts
+    it: all bids and tricks in, and the tricks adding up.
+    """
+    if save_data.get("game_finished"):
+        return True
+    return GameEngine.from_save_data(save_data).played_rounds() == save_data["max_rounds"]
+
+
+def _stat_version(path):
+    """(mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_pack_table(mm):
+    """({name: (offset, length, mtime_ns)}, end of the footer) of the newest intact table in a pack.
+
+    A torn append leaves junk after the last good footer; footers are found
+    from the end and checked against their table's CRC.
+    """
+    end = len(mm)
+    while end >= PACK_FOOTER.size:
+        table_offset, count, crc, magic, version = PACK_FOOTER.unpack_from(mm, end - PACK_FOOTER.size)
+        table_end = end - PACK_FOOTER.size
+        if magic == PACK_MAGIC and version == PACK_VERSION and table_offset <= table_end \
+                and zlib.crc32(mm[table_offset:table_end]) == crc:
+            table, pos = {}, table_offset
+            for _ in range(count):
+                offset, length, mtime_ns = PACK_ENTRY.unpack_from(mm, pos)
+                (name_length,) = struct.unpack_from("<H", mm, pos + PACK_ENTRY.size)
+                pos += PACK_ENTRY.size + 2 + name_length
+                table[mm[pos - name_length:pos].decode("utf-8")] = (offset, length, mtime_ns)
+            return table, end
+        # Not a footer: try the previous occurrence of the magic
+        found = mm.rfind(PACK_MAGIC, 0, end - 2)
+        if found < 0:
+            break
+        end = found + len(PACK_MAGIC) + 1
+    return {}, 0
+
+
+class SaveArchive:
+    """Append-only pack of finished games, memory-mapped and decoded one game at a time.
+
+    The file is a run of binary save records (see encode_binary_save) and
+    offset tables, ending in a footer that points at the current table. Adding
+    or replacing games appends records and a new table, so a torn append only
+    loses that append. The pack is re-mapped when it changes on disk.
+
+    Retitles, renames and deletes don't touch the pack: they are appended to a
+    small edit log next to it (PACK_EDITS_SUFFIX), one JSON line per edit,
+    tied to the record's offset so a re-added game starts clean. Readers apply
+    the log on load; compact() folds it into the records. An edit moves the
+    game's mtime by only a microsecond, so it keeps its place in listings by
+    recency.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.edits_path = self.path.with_name(self.path.name + PACK_EDITS_SUFFIX)
+        self._lock = threading.Lock()
+        self._mm = None
+        # (mtime_ns, size) of the pack and of the edit log when they were last read
+        self._version = self._edits_version = None
+        # name -> (offset, length, mtime_ns) from the current table
+        self._table = {}
+        self._end = 0
+        # name -> [offset, edit lines, bytes of them, journal records, deleted] of the edits to its current record
+        self._edits = {}
+        # The table without deleted games
+        self._live = {}
+
+    def _open(self):
+        """Map the pack and read its table and edit log if they changed since they were read. Callers hold _lock."""
+        version, edits_version = (_stat_version(path) for path in (self.path, self.edits_path))
+        if version == self._version and edits_version == self._edits_version:
+            return
+        if version != self._version:
+            if self._mm is not None:
+                self._mm.close()
+            self._mm, self._table, self._end = None, {}, 0
+            if version and version[1]:
+                with open(self.path, 'rb') as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._table, self._end = _read_pack_table(self._mm)
+        self._edits = self._read_edits() if edits_version else {}
+        self._live = {name: entry for name, entry in self._table.items()
+                      if name not in self._edits or not self._edits[name][4]}
+        self._version, self._edits_version = version, edits_version
+
+    def _read_edits(self):
+        """Edits of the log that apply to the games' current records."""
+        edits = {}
+        with open(self.edits_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    edit = json.loads(line)
+                except ValueError:
+                    continue  # A torn append; later lines are still good
+                entry = self._table.get(edit["name"])
+                if entry is None or entry[0] != edit["offset"]:
+                    continue  # The game was replaced since
+                current = edits.setdefault(edit["name"], [edit["offset"], 0, 0, [], False])
+                current[1] += 1
+                current[2] += len(line)
+                current[3].extend(edit.get("records", []))
+                current[4] = current[4] or edit.get("deleted", False)
+        return edits
+
+    def _append_edit(self, name, **fields):
+        """Append one line to the edit log for a game's current record."""
+        with self._lock:
+            self._open()
+            if name not in self._live:
+                raise KeyError(f"{name} is not in {self.path.name}")
+            line = json.dumps({"name": name, "offset": self._table[name][0], **fields}, separators=(",", ":"))
+            with open(self.edits_path, 'a+b') as f:
+                # After a torn append, start on a line of our own
+                if f.tell() and (f.seek(-1, os.SEEK_END), f.read(1))[1] != b"\n":
+                    line = "\n" + line
+                f.write((line + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            self._edits_version = None
+        # Edits change listings; touch the directory so SaveIndex rescans it
+        os.utime(self.path.parent)
+
+    def __len__(self):
+        with self._lock:
+            self._open()
+            return len(self._live)
+
+    def __contains__(self, name):
+        with self._lock:
+            self._open()
+            return name in self._live
+
+    def names(self):
+        with self._lock:
+            self._open()
+            return list(self._live)
+
+    def _game_version(self, name, length, mtime_ns):
+        """(mtime_ns, size) of a game from its record, with each edit adding a microsecond and its line's bytes.
+
+        Like an edited loose save, the game keeps its place by mtime while its
+        version still changes.
+        """
+        edits = self._edits.get(name, (None, 0, 0))
+        return mtime_ns + 1000 * edits[1], length + edits[2]
+
+    def entries(self):
+        """(mtime_ns, size, name) of every game, like SaveIndex's directory scan."""
+        with self._lock:
+            self._open()
+            return [(*self._game_version(name, length, mtime_ns), name)
+                    for name, (_, length, mtime_ns) in self._live.items()]
+
+    def version(self, name):
+        """(mtime_ns, size) of a packed game, or None if it isn't in the pack."""
+        with self._lock:
+            self._open()
+            entry = self._live.get(name)
+            return None if entry is None else self._game_version(name, entry[1], entry[2])
+
+    def _load(self, name):
+        """Decode one game with its edits applied. Callers hold _lock and have called _open."""
+        if name not in self._live:
+            raise KeyError(f"{name} is not in {self.path.name}")
+        offset, length, _ = self._live[name]
+        save_data = decode_binary_save(self._mm[offset:offset + length])
+        for record in self._edits.get(name, (None, 0, 0, []))[3]:
+            save_data = _apply_record(save_data, record)
+        return save_data
+
+    def load(self, name):
+        """Decode one game's save payload, touching only its bytes of the mapping."""
+        with self._lock:
+            self._open()
+            return self._load(name)
+
+    def dead_bytes(self):
+        """Bytes taken by replaced or deleted records and old tables."""
+        with self._lock:
+            self._open()
+            live = sum(length + PACK_ENTRY.size + 2 + len(name.encode("utf-8"))
+                       for name, (_, length, _) in self._live.items())
+            return self._end - live - PACK_FOOTER.size if self._end else 0
+
+    def update(self, games):
+        """Append {name: (save_data, mtime_ns)} games (save_data None removes one) and a new table."""
+        with self._lock:
+            self._open()
+            table = dict(self._table)
+            with open(self.path, 'r+b' if self._version else 'wb') as f:
+                # Drop a torn tail left after the last good footer
+                f.seek(self._end)
+                f.truncate()
+                for name, (save_data, mtime_ns) in games.items():
+                    if save_data is None:
+                        table.pop(name, None)
+                        continue
+                    blob = encode_binary_save(save_data)
+                    table[name] = (f.tell(), len(blob), mtime_ns)
+                    f.write(blob)
+                table_bytes = b"".join(PACK_ENTRY.pack(offset, length, mtime_ns) + _pack_str(name)
+                                       for name, (offset, length, mtime_ns) in table.items())
+                table_offset = f.tell()
+                f.write(table_bytes)
+                f.write(PACK_FOOTER.pack(table_offset, len(table), zlib.crc32(table_bytes), PACK_MAGIC, PACK_VERSION))
+                f.flush()
+                os.fsync(f.fileno())
+            self._version = None
+        # The pack is edited in place; touch the directory so SaveIndex rescans it
+        os.utime(self.path.parent)
+
+    def put(self, name, save_data, mtime_ns=None):
+        """Add or replace one game."""
+        self.update({name: (save_data, mtime_ns or time.time_ns())})
+
+    def edit(self, name, records):
+        """Apply journal records (renames, title patches) to a game via the edit log."""
+        self._append_edit(name, records=records)
+
+    def remove(self, name):
+        """Delete one game via the edit log."""
+        self._append_edit(name, deleted=True)
+
+    def compact(self):
+        """Rewrite the pack with only its live games, edits folded in, via a temp file and rename."""
+        with self._lock:
+            self._open()
+            games = {name: (self._load(name), self._game_version(name, length, mtime_ns)[0])
+                     for name, (_, length, mtime_ns) in self._live.items()}
+        tmp = SaveArchive(self.path.with_name(self.path.name + ".tmp"))
+        tmp.path.unlink(missing_ok=True)
+        tmp.update(games)
+        os.replace(tmp.path, self.path)
+        # Stale lines would no longer match any record, but there's no reason to keep them
+        self.edits_path.unlink(missing_ok=True)
+
+
+def pack_saves(save_dir=SAVE_DIR, archive=None):
+    """Move every finished loose save in save_dir into the archive.
+
+    Returns the number of games packed and a list of (filename, error) for
+    saves that couldn't be read. The archive is compacted when replaced records outweigh live ones.
+    """
+    archive = archive or SaveArchive(Path(save_dir) / PACK_NAME)
+    games, skipped = {}, []
+    for filepath in sorted(save_paths(save_dir)):
+        try:
+            save_data = read_save(filepath)
+            if is_finished_save(save_data):
+                games[filepath] = (save_data, filepath.stat().st_mtime_ns)
+        except Exception as e:
+            skipped.append((filepath.name, e))
+    if games:
+        archive.update({filepath.name: game for filepath, game in games.items()})
+        for filepath in games:
+            filepath.unlink()
+    if archive.path.exists() and (archive.dead_bytes() > archive.path.stat().st_size // 2
+                                  or archive.edits_path.exists() and archive.edits_path.stat().st_size > PACK_EDITS_COMPACT):
+        archive.compact()
+    return len(games), skipped
+
+
+class SaveWriter:
+    """Background thread that writes saves off the UI thread.
+
+    Saves are keyed by whatever the write function takes (a path for
+    store_save, the default). Saves submitted for the same key within
+    AUTOSAVE_DELAY of each other are coalesced into one write of the newest
+    payload. status() reports whether a save has a write pending and when it
+    was last written.
+    """
+
+    def __init__(self, write=store_save, delay=AUTOSAVE_DELAY):
+        self.write = write
+        self.delay = delay
+        self._cond = threading.Condition()
+        # key -> (save_data, on_saved callback, monotonic time the write is due)
+        self._pending = {}
+        self._writing = None
+        # key -> {'saved_at': datetime or None, 'error': str or None}
+        self._status = {}
+        self._thread = threading.Thread(target=self._run, name="wizard-save-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, key, save_data, on_saved=None):
+        """Queue a save; a newer payload for the same key replaces a queued one."""
+        with self._cond:
+            self._pending[key] = (_copy_payload(save_data), on_saved, time.monotonic() + self.delay)
+            self._cond.notify_all()
+
+    def discard(self, key):
+        """Drop a queued save (e.g. before deleting it) and wait out one in progress."""
+        with self._cond:
+            self._pending.pop(key, None)
+            self._cond.wait_for(lambda: self._writing != key)
+
+    def flush(self, key=None, timeout=None):
+        """Write queued saves (of one key, or all) now and wait until they are stored."""
+        def done():
+            if key is None:
+                return not self._pending and self._writing is None
+            return key not in self._pending and self._writing != key
+
+        with self._cond:
+            for pending_key, (save_data, on_saved, _) in self._pending.items():
+                if key is None or pending_key == key:
+                    self._pending[pending_key] = (save_data, on_saved, 0)
+            self._cond.notify_all()
+            return self._cond.wait_for(done, timeout)
+
+    def status(self, key):
+        """{'pending': bool, 'saved_at': datetime or None, 'error': str or None} for a save."""
+        with self._cond:
+            status = self._status.get(key, {'saved_at': None, 'error': None})
+            return {'pending': key in self._pending or self._writing == key, **status}
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                key, (save_data, on_saved, due) = min(self._pending.items(), key=lambda item: item[1][2])
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                del self._pending[key]
+                self._writing = key
+            try:
+                self.write(key, save_data)
+                status = {'saved_at': datetime.now(), 'error': None}
+            except Exception as e:
+                status = {'saved_at': self._status.get(key, {}).get('saved_at'), 'error': str(e)[:100]}
+            else:
+                # The save itself is stored; a failing follow-up (e.g. indexing) is logged, not reported as a failed save
+                if on_saved is not None:
+                    try:
+                        on_saved()
+                    except Exception:
+                        logger.exception("After-save callback for %s failed", key)
+            with self._cond:
+                self._status[key] = status
+                self._writing = None
+                self._cond.notify_all()
+
+
+def _listing_from_data(filename, save_data):
+    """Sidebar listing fields of a save payload, formatted like the legacy header."""
+    return {
+        "filename": filename,
+        "title": save_data.get("title", "Untitled Game"),
+        "saved_at": save_data.get("saved_at", "Unknown").replace('T', ' ')[:19],
+        "players": ", ".join(save_data.get("players", [])),
+        "round": f"{save_data.get('current_round')} / {save_data.get('max_rounds')}"
+    }
+
+
+def _listing_entry(filename, content):
+    """Sidebar listing fields (title, saved_at, players, round) of a save's text."""
+    if content.startswith(JOURNAL_HEADER):
+        return _listing_from_data(filename, replay_journal(content)[0])
+
+    # Parse JSON data for title
+    save_data = parse_save_text(content)
+    title = save_data.get("title", "Untitled Game")
+
+    # Parse header lines
+    lines = content.split("\n")
+    saved_at = lines[2].replace("Saved: ", "").strip() if len(lines) > 2 else "Unknown"
+    players = lines[3].replace("Players: ", "").strip() if len(lines) > 3 else "Unknown"
+    round_info = lines[4].replace("Round: ", "").strip() if len(lines) > 4 else "Unknown"
+
+    return {
+        "filename": filename,
+        "title": title,
+        "saved_at": saved_at,
+        "players": players,
+        "round": round_info
+    }
+
+
+def list_saved_games(save_dir=SAVE_DIR):
+    """Get list of saved game files, most recent first, parsing every save."""
+    saved_games = []
+    for filepath in save_paths(save_dir):
+        try:
+            if filepath.suffix == BINARY_SUFFIX:
+                saved_games.append(_listing_from_data(filepath.name, read_save(filepath)))
+                continue
+            with open(filepath, 'r') as f:
+                saved_games.append(_listing_entry(filepath.name, f.read()))
+        except Exception:
+            pass
+    saved_games.sort(key=lambda x: x["saved_at"], reverse=True)
+    return saved_games
+
+
+def read_save_header(filepath, filename=None):
+    """Sidebar listing fields from a save's header only, without its rounds.
+
+    That is the header lines of a legacy save, the listing line of a journal
+    and the fixed header and player table of a binary save. Journals whose
+    listing line is missing or stale are replayed instead.
+    """
+    filename = filename or Path(filepath).name
+    fields = {}
+    with open(filepath, 'rb') as f:
+        if Path(filepath).suffix == BINARY_SUFFIX:
+            return _listing_from_data(filename, _decode_binary_head(f)[0])
+        first = f.readline()
+        if first.startswith(JOURNAL_HEADER.encode()):
+            listing = _read_listing(f, os.fstat(f.fileno()).st_size)
+            if listing is None:
+                # Written before listing lines, or a crash left the line stale
+                f.seek(0)
+                listing = replay_journal(f.read().decode("utf-8"))[0]
+            return _listing_from_data(filename, listing)
+        for line in itertools.chain([first], f):
+            line = line.decode("utf-8")
+            if line.startswith("="):
+                if fields:
+                    break
+                continue
+            key, _, value = line.partition(": ")
+            fields[key] = value.rstrip("\r\n")
+    return {
+        "filename": filename,
+        "title": fields.get("Title", "Untitled Game"),
+        "saved_at": fields.get("Saved", "Unknown"),
+        "players": fields.get("Players", "Unknown"),
+        "round": fields.get("Round", "Unknown")
+    }
+
+
+class SaveIndex:
+    """Persistent listing of the saves in a directory, invalidated per file by mtime.
+
+    Listing entries live in memory and in SQLite next to the saves, and are
+    built from save headers only. Saves are only re-read when their mtime or
+    size changed; recent() ranks the directory by mtime from os.scandir and
+    only reads the headers of the page it returns. The scan itself is reused
+    while the directory's own mtime is unchanged, which holds as long as saves
+    are created, replaced (write_save renames into place) or deleted rather
+    than edited in place. Title and player edits keep a save's mtime (see
+    edit_save_metadata), so the ranking follows when games were last saved.
+    """
+
+    def __init__(self, save_dir=SAVE_DIR, path=None):
+        self.save_dir = Path(save_dir)
+        self.archive = SaveArchive(self.save_dir / PACK_NAME)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path or self.save_dir / SAVE_INDEX_NAME), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS saves (
+                filename TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER,
+                title TEXT, saved_at TEXT, players TEXT, round TEXT)
+        """)
+        # Last directory scan and the directory mtime it was taken at
+        self._found = []
+        self._found_at = None
+        # filename -> ((mtime_ns, size), listing entry)
+        self._entries = {
+            filename: ((mtime_ns, size), {
+                "filename": filename, "title": title, "saved_at": saved_at, "players": players, "round": round_info
+            })
+            for filename, mtime_ns, size, title, saved_at, players, round_info in self._db.execute("SELECT * FROM saves")
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        self._db.close()
+
+    def _scan(self):
+        """(mtime_ns, size, filename) of every save, from directory and archive metadata only."""
+        dir_mtime = os.stat(self.save_dir).st_mtime_ns
+        if dir_mtime == self._found_at:
+            return self._found
+        found = []
+        with os.scandir(self.save_dir) as it:
+            for dir_entry in it:
+                if is_save_name(dir_entry.name):
+                    stat = dir_entry.stat()
+                    found.append((stat.st_mtime_ns, stat.st_size, dir_entry.name))
+        # A loose save shadows a packed game of the same name
+        loose = {name for _, _, name in found}
+        found += [entry for entry in self.archive.entries() if entry[2] not in loose]
+        self._found, self._found_at = found, dir_mtime
+        self._prune(found)
+        return found
+
+    def _entry(self, filename, version):
+        """Listing entry of a save, reading its header only if it changed since it was indexed."""
+        cached = self._entries.get(filename)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            entry = read_save_header(self.save_dir / filename, filename)
+        except FileNotFoundError:
+            if filename not in self.archive:
+                return None
+            entry = _listing_from_data(filename, self.archive.load(filename))
+        except (OSError, UnicodeDecodeError):
+            return None
+        self._entries[filename] = (version, entry)
+        self._db.execute(
+            "INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (filename, *version, entry["title"], entry["saved_at"], entry["players"], entry["round"]),
+        )
+        return entry
+
+    def _prune(self, found):
+        """Forget saves that are no longer on disk."""
+        for filename in self._entries.keys() - {name for _, _, name in found}:
+            del self._entries[filename]
+            self._db.execute("DELETE FROM saves WHERE filename = ?", (filename,))
+
+    def refresh(self):
+        """Re-read saves that are new or changed since they were indexed and drop deleted ones."""
+        with self._lock, self._db:
+            found = self._scan()
+            for mtime_ns, size, filename in found:
+                self._entry(filename, (mtime_ns, size))
+
+    def list(self):
+        """Get list of saved games, most recent first."""
+        self.refresh()
+        saved_games = [entry for _, entry in self._entries.values()]
+        saved_games.sort(key=lambda x: x["saved_at"], reverse=True)
+        return saved_games
+
+    def recent(self, limit, offset=0):
+        """Return (saves offset..offset+limit by last save, newest first; total saves)."""
+        with self._lock, self._db:
+            found = self._scan()
+            page = heapq.nlargest(offset + limit, found)[offset:]
+            entries = [self._entry(filename, (mtime_ns, size)) for mtime_ns, size, filename in page]
+        return [e for e in entries if e is not None], len(found)
+
+    def get(self, filename):
+        """Listing entry of one save, or None if it doesn't exist."""
+        version = self._version(filename)
+        if version is None:
+            return None
+        with self._lock, self._db:
+            return self._entry(filename, version)
+
+    def _version(self, filename):
+        """(mtime_ns, size) of a loose save or a packed game, or None if neither exists."""
+        try:
+            stat = (self.save_dir / filename).stat()
+        except OSError:
+            return self.archive.version(filename)
+        return stat.st_mtime_ns, stat.st_size
+
+    def edit(self, filename, title=None, renames=None):
+        """Edit a save's title or player names (see edit_save_metadata) and its listing entry in place.
+
+        Packed games get the edit appended to the archive's edit log.
+        """
+        filepath = self.save_dir / filename
+        if not filepath.exists() and filename in self.archive:
+            self.archive.edit(filename, _metadata_records(title, renames))
+        else:
+            edit_save_metadata(filepath, title=title, renames=renames)
+        version = self._version(filename)
+        with self._lock, self._db:
+            cached = self._entries.get(filename)
+            if cached is None:
+                return
+            entry = dict(cached[1])
+            if title is not None:
+                entry["title"] = title
+            if renames:
+                entry["players"] = ", ".join(renames.get(p, p) for p in entry["players"].split(", "))
+            self._entries[filename] = (version, entry)
+            self._db.execute(
+                "INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (filename, *version, entry["title"], entry["saved_at"], entry["players"], entry["round"]),
+            )
+            # The next scan still rescans the directory (its mtime changed), but won't re-read this save
+            self._found = [(*version, filename) if item[2] == filename else item for item in self._found]
+
+
+def _keep_mtime(filepath, stat):
+    """Give an edited save back its mtime from stat, plus a microsecond so its (mtime, size) version still changes."""
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+
+def _metadata_records(title=None, renames=None):
+    """Journal records of a retitle and/or player renames ({old: new})."""
+    records = [{"op": "rename", "old": old, "new": new} for old, new in (renames or {}).items()]
+    if title is not None:
+        records.append({"op": "patch", "fields": {"title": title}})
+    return records
+
+
+def edit_save_metadata(filepath, title=None, renames=None):
+    """Retitle a save and/or rename players in it ({old: new}) without rewriting its rounds.
+
+    Journals get the edit appended as records and their listing line updated,
+    without being read or replayed. Legacy text saves become a journal on their
+    first edit, and torn journals, journals without a current listing line and
+    binary saves (a few hundred bytes) are rewritten. Either way the save
+    keeps its mtime, so an edit doesn't move it in listings by recency.
+    """
+    filepath = Path(filepath)
+    records = _metadata_records(title, renames)
+    if not records:
+        return
+    with _journal_lock:
+        stat = filepath.stat()
+        with open(filepath, 'rb') as f:
+            is_journal = f.readline().startswith(JOURNAL_HEADER.encode())
+            listing = _read_listing(f, stat.st_size) if is_journal else None
+            f.seek(-1, os.SEEK_END)
+            clean = f.read(1) == b"\n"
+        if listing is not None and clean:
+            cached = _journal_cache.pop(filepath, None)
+            with open(filepath, 'a') as f:
+                f.write("".join(_journal_line(r) for r in records))
+                f.flush()
+                os.fsync(f.fileno())
+            if title is not None:
+                listing["title"] = title
+            if renames:
+                listing["players"] = [renames.get(p, p) for p in listing["players"]]
+            save_data = None
+            if not _write_listing(filepath, listing):
+                # The new title outgrew the listing line
+                save_data, count, _ = _journal_state(filepath, remember=False)
+                write_journal(filepath, save_data)
+                count = 1
+            elif cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+                save_data = cached[1]
+                for record in records:
+                    save_data = _apply_record(save_data, record)
+                count = cached[2] + len(records)
+            _keep_mtime(filepath, stat)
+            os.utime(filepath.parent)
+            if save_data is not None:
+                _remember_journal(filepath, save_data, count)
+            return
+    save_data = read_save(filepath)
+    for record in records:
+        save_data = _apply_record(save_data, record)
+    store_save(filepath, save_data)
+    with _journal_lock:
+        _keep_mtime(filepath, stat)
+        cached = _journal_cache.get(filepath)
+        if cached is not None:
+            # Re-stamp what store_save cached with the restored mtime
+            _remember_journal(filepath, cached[1], cached[2])
+
+
+def update_save_title(filepath, new_title):
+    """Update the title of a saved game (one appended record for journals)."""
+    edit_save_metadata(filepath, title=new_title)
+
+
+class FileStorage:
+    """One save file per game in a directory, listed through SaveIndex.
+
+    Games are keyed by filename. Writes go through a SaveWriter, so with
+    wait=False a save returns immediately and rapid saves are coalesced.
+    """
+
+    def __init__(self, save_dir=SAVE_DIR):
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(exist_ok=True)
+        self.index = SaveIndex(self.save_dir)
+        self.writer = SaveWriter()
+
+    def new_key(self, players, binary=False):
+        """Key for a new game of these players."""
+        return new_save_filename(players, binary=binary)
+
+    def save(self, key, save_data, on_saved=None, wait=True):
+        """Store a save payload, waiting until it is written unless wait=False."""
+        self.writer.submit(self.save_dir / key, save_data, on_saved=on_saved)
+        if wait:
+            self.writer.flush(self.save_dir / key)
+
+    def status(self, key):
+        """Background write status of a game (see SaveWriter.status)."""
+        return self.writer.status(self.save_dir / key)
+
+    def load(self, key):
+        """Save payload of a game, including writes still queued."""
+        self.writer.flush(self.save_dir / key)
+        if not (self.save_dir / key).exists() and key in self.index.archive:
+            return self.index.archive.load(key)
+        return read_save(self.save_dir / key)
+
+    def recent(self, limit, offset=0):
+        """Return (listing entries offset..offset+limit, newest first; total games)."""
+        return self.index.recent(limit, offset)
+
+    def get(self, key):
+        """Listing entry of one game, or None if it doesn't exist."""
+        return self.index.get(key)
+
+    def update_title(self, key, new_title):
+        """Change the title of a saved game."""
+        self.writer.flush(self.save_dir / key)
+        self.index.edit(key, title=new_title)
+
+    def rename_player(self, key, old_name, new_name):
+        """Rename a player in a saved game."""
+        self.writer.flush(self.save_dir / key)
+        self.index.edit(key, renames={old_name: new_name})
+
+    def delete(self, key):
+        """Delete a game, dropping any queued write of it."""
+        self.writer.discard(self.save_dir / key)
+        (self.save_dir / key).unlink(missing_ok=True)
+        if key in self.index.archive:
+            self.index.archive.remove(key)
+
+    def keys(self):
+        """Keys of every stored game."""
+        loose = [filepath.name for filepath in save_paths(self.save_dir)]
+        return loose + sorted(set(self.index.archive.names()) - set(loose))
+
+
+GAMES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, title TEXT, saved_at TEXT,
+    current_round INTEGER, max_rounds INTEGER, starting_dealer_index INTEGER,
+    game_started INTEGER, game_finished INTEGER);
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER REFERENCES games ON DELETE CASCADE, seat INTEGER, player TEXT,
+    color TEXT, total_score INTEGER, PRIMARY KEY (game_id, seat));
+CREATE TABLE IF NOT EXISTS rounds (
+    game_id INTEGER REFERENCES games ON DELETE CASCADE, round INTEGER, player TEXT,
+    bid INTEGER, tricks INTEGER, PRIMARY KEY (game_id, round, player));
+CREATE INDEX IF NOT EXISTS games_saved_at ON games (saved_at);
+CREATE INDEX IF NOT EXISTS players_player ON players (player);
+CREATE INDEX IF NOT EXISTS rounds_player ON rounds (player);
+"""
+
+
+class SqliteStorage:
+    """Every game in one SQLite database: games, their players and round results.
+
+    Games are keyed by name (a save filename without suffix). Listing and
+    per-player history are indexed queries instead of directory scans.
+    Writes still go through a SaveWriter, like FileStorage.
+    """
+
+    def __init__(self, save_dir=SAVE_DIR, path=None):
+        self.path = Path(path or Path(save_dir) / GAMES_DB_NAME)
+        self.path.parent.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(GAMES_SCHEMA)
+        self.writer = SaveWriter(write=self._write)
+
+    def close(self):
+        self.writer.flush()
+        self._db.close()
+
+    def _write(self, key, save_data):
+        players = save_data["players"]
+        colors = save_data.get("player_colors", {})
+        totals = save_data.get("total_scores", {})
+        fields = (
+            save_data.get("title", "Untitled Game"), save_data.get("saved_at", ""),
+            save_data["current_round"], save_data["max_rounds"], save_data.get("starting_dealer_index", 0),
+            bool(save_data.get("game_started")), bool(save_data.get("game_finished")),
+        )
+        with self._lock, self._db:
+            row = self._db.execute("SELECT game_id FROM games WHERE name = ?", (key,)).fetchone()
+            if row is None:
+                game_id = self._db.execute(
+                    "INSERT INTO games (name, title, saved_at, current_round, max_rounds, starting_dealer_index,"
+                    " game_started, game_finished) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (key, *fields)
+                ).lastrowid
+            else:
+                game_id = row[0]
+                self._db.execute(
+                    "UPDATE games SET title = ?, saved_at = ?, current_round = ?, max_rounds = ?,"
+                    " starting_dealer_index = ?, game_started = ?, game_finished = ? WHERE game_id = ?",
+                    (*fields, game_id),
+                )
+                self._db.execute("DELETE FROM players WHERE game_id = ?", (game_id,))
+                self._db.execute("DELETE FROM rounds WHERE game_id = ?", (game_id,))
+            self._db.executemany(
+                "INSERT INTO players VALUES (?, ?, ?, ?, ?)",
+                [(game_id, seat, p, colors.get(p), totals.get(p, 0)) for seat, p in enumerate(players)],
+            )
+            self._db.executemany(
+                "INSERT INTO rounds VALUES (?, ?, ?, ?, ?)",
+                [
+                    (game_id, int(r), p, data.get("bid"), data.get("tricks"))
+                    for r, round_data in save_data["game_data"].items()
+                    for p, data in round_data.items()
+                ],
+            )
+
+    def new_key(self, players, binary=False):
+        return new_save_filename(players)[:-len(TEXT_SUFFIX)]
+
+    def save(self, key, save_data, on_saved=None, wait=True):
+        self.writer.submit(key, save_data, on_saved=on_saved)
+        if wait:
+            self.writer.flush(key)
+
+    def status(self, key):
+        return self.writer.status(key)
+
+    def load(self, key):
+        self.writer.flush(key)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT game_id, title, saved_at, current_round, max_rounds, starting_dealer_index,"
+                " game_started, game_finished FROM games WHERE name = ?", (key,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"No saved game named {key}")
+            game_id, title, saved_at, current_round, max_rounds, dealer, started, finished = row
+            player_rows = self._db.execute(
+                "SELECT player, color, total_score FROM players WHERE game_id = ? ORDER BY seat", (game_id,)
+            ).fetchall()
+            round_rows = self._db.execute(
+                "SELECT round, player, bid, tricks FROM rounds WHERE game_id = ? ORDER BY round", (game_id,)
+            ).fetchall()
+        game_data = {}
+        for r, p, bid, tricks in round_rows:
+            game_data.setdefault(str(r), {})[p] = {'bid': bid, 'tricks': tricks}
+        return {
+            "title": title,
+            "players": [p for p, _, _ in player_rows],
+            "player_colors": {p: color for p, color, _ in player_rows if color},
+            "starting_dealer_index": dealer,
+            "current_round": current_round,
+            "game_data": game_data,
+            "max_rounds": max_rounds,
+            "game_started": bool(started),
+            "game_finished": bool(finished),
+            "saved_at": saved_at,
+            "total_scores": {p: total for p, _, total in player_rows},
+        }
+
+    _LISTING_SQL = """
+        SELECT name, title, saved_at, current_round, max_rounds,
+               (SELECT group_concat(player, ', ') FROM
+                   (SELECT player FROM players WHERE players.game_id = games.game_id ORDER BY seat))
+        FROM games
+    """
+
+    @staticmethod
+    def _listing(row):
+        name, title, saved_at, current_round, max_rounds, players = row
+        return {
+            "filename": name,
+            "title": title,
+            "saved_at": saved_at.replace('T', ' ')[:19],
+            "players": players or "",
+            "round": f"{current_round} / {max_rounds}"
+        }
+
+    def recent(self, limit, offset=0):
+        with self._lock:
+            rows = self._db.execute(
+                self._LISTING_SQL + " ORDER BY saved_at DESC LIMIT ? OFFSET ?", (limit, offset)
+            ).fetchall()
+            (total,) = self._db.execute("SELECT COUNT(*) FROM games").fetchone()
+        return [self._listing(row) for row in rows], total
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(self._LISTING_SQL + " WHERE name = ?", (key,)).fetchone()
+        return None if row is None else self._listing(row)
+
+    def update_title(self, key, new_title):
+        self.writer.flush(key)
+        with self._lock, self._db:
+            self._db.execute("UPDATE games SET title = ? WHERE name = ?", (new_title, key))
+
+    def rename_player(self, key, old_name, new_name):
+        self.writer.flush(key)
+        with self._lock, self._db:
+            row = self._db.execute("SELECT game_id FROM games WHERE name = ?", (key,)).fetchone()
+            if row is None:
+                return
+            for table in ("players", "rounds"):
+                self._db.execute(f"UPDATE {table} SET player = ? WHERE game_id = ? AND player = ?", (new_name, row[0], old_name))
+
+    def delete(self, key):
+        self.writer.discard(key)
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM games WHERE name = ?", (key,))
+
+    def keys(self):
+        with self._lock:
+            return [name for (name,) in self._db.execute("SELECT name FROM games")]
+
+    def player_history(self, player):
+        """(game name, round, bid, tricks) of every round a player was in, oldest game first."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT games.name, rounds.round, rounds.bid, rounds.tricks FROM rounds"
+                " JOIN games USING (game_id) WHERE rounds.player = ?"
+                " ORDER BY games.saved_at, rounds.round", (player,)
+            ).fetchall()
+
+    def import_saves(self, save_dir=SAVE_DIR):
+        """One-shot import of every save in save_dir (loose or packed).
+
+        Returns the number of games imported and a list of (filename, error)
+        for saves that couldn't be read. Games already in the database (by filename stem) are left alone, so
+        running it twice is harmless.
+        """
+        known = set(self.keys())
+        loose = {filepath.name: filepath for filepath in save_paths(save_dir)}
+        archive = SaveArchive(Path(save_dir) / PACK_NAME)
+        imported, skipped = 0, []
+        for name in sorted(loose.keys() | set(archive.names())):
+            key = Path(name).stem
+            if key in known:
+                continue
+            try:
+                self._write(key, read_save(loose[name]) if name in loose else archive.load(name))
+            except Exception as e:
+                skipped.append((name, e))
+                continue
+            imported += 1
+        return imported, skipped
+
+
+STORAGE_BACKENDS = {"files": FileStorage, "sqlite": SqliteStorage}
+
+
+def open_storage(backend=None, save_dir=SAVE_DIR):
+    """Storage backend by name ("files" or "sqlite"), defaulting to $WIZARD_STORAGE or files."""
+    backend = backend or os.environ.get(STORAGE_ENV, "files")
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend {backend!r}; expected one of {', '.join(STORAGE_BACKENDS)}")
+    return STORAGE_BACKENDS[backend](save_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wizard save file tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="Convert text saves (legacy or journal) to the binary format")
+    convert.add_argument("save_dir", nargs="?", default=str(SAVE_DIR), help="Directory with wizard_game_*.txt saves")
+    convert.add_argument("--keep", action="store_true", help="Keep the original .txt files")
+    pack = sub.add_parser("pack", help=f"Move finished saves into the {PACK_NAME} archive")
+    pack.add_argument("save_dir", nargs="?", default=str(SAVE_DIR), help="Directory with wizard_game_* saves")
+    import_sqlite = sub.add_parser("import-sqlite", help="Import every save file into the SQLite game database")
+    import_sqlite.add_argument("save_dir", nargs="?", default=str(SAVE_DIR), help="Directory with wizard_game_* saves")
+    import_sqlite.add_argument("--db", help=f"Database file (default: SAVE_DIR/{GAMES_DB_NAME})")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        archive = SaveArchive(Path(args.save_dir) / PACK_NAME)
+        packed, skipped = pack_saves(args.save_dir, archive)
+        for name, e in skipped:
+            print(f"Skipped {name}: {e}")
+        print(f"Packed {packed} finished saves into {archive.path} ({len(archive)} games, {len(skipped)} skipped)")
+        return
+
+    if args.command == "import-sqlite":
+        storage = SqliteStorage(args.save_dir, path=args.db)
+        imported, skipped = storage.import_saves(args.save_dir)
+        storage.close()
+        for name, e in skipped:
+            print(f"Skipped {name}: {e}")
+        print(f"Imported {imported} saves into {storage.path} ({len(skipped)} skipped)")
+        return
+
+    text_size = binary_size = converted = 0
+    for filepath in sorted(save_paths(args.save_dir)):
+        if filepath.suffix != TEXT_SUFFIX:
+            continue
+        size = filepath.stat().st_size
+        try:
+            target = convert_to_binary(filepath, keep=args.keep)
+        except Exception as e:
+            print(f"Skipped {filepath.name}: {e}")
+            continue
+        text_size += size
+        binary_size += target.stat().st_size
+        converted += 1
+    print(f"Converted {converted} saves: {text_size:,} -> {binary_size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()